@@ -0,0 +1,33 @@
+import argparse
+
+from . import cache, sync
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m nbb_api')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p = comandos.add_parser('sync', help='Baixa o histórico completo num dataset Parquet particionado')
+    p.add_argument('destino', help='Pasta do dataset (league=/dataset=/season=)')
+    p.add_argument('--leagues', nargs='+', choices=list(sync.ligas), help='Ligas (padrão: todas)')
+    p.add_argument('--datasets', nargs='+', choices=['stats', 'placares', 'classificacao'],
+                   help='Conjuntos de dados (padrão: todos)')
+    p.add_argument('--seasons', nargs='+', help='Temporadas (padrão: todas)')
+    p.add_argument('--workers', type=int, help='Downloads simultâneos (padrão: %d)' % sync.bulk.max_workers)
+    p.add_argument('--rate', type=float, help='Máximo de páginas por segundo (padrão: sem limite)')
+    p.add_argument('--cache-dir', help='Guarda o HTML baixado nesta pasta (veja nbb_api.cache)')
+
+    args = parser.parse_args(argv)
+    if args.comando == 'sync':
+        if args.cache_dir:
+            cache.configure(args.cache_dir)
+        try:
+            resumo = sync.sync(args.destino, leagues=args.leagues, datasets=args.datasets, seasons=args.seasons,
+                               max_workers=args.workers, rate=args.rate)
+        except ImportError as e:
+            parser.exit(2, f'{e}\n')
+        return 1 if resumo['falha'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1 @@
+from . import ldb, liga_ouro, nbb
@@ -0,0 +1,37 @@
+import asyncio
+import contextvars
+import functools
+import time
+
+from .. import cache, instrument, scheduler
+from . import transport
+
+
+async def _baixar(url, finished):
+    async with scheduler.slot_async(url):
+        resposta = await transport.get(url)
+    html = resposta.text
+    cache.put(url, html, permanente=finished)
+    return html, len(resposta.content)
+
+
+async def get_html(url, finished=False):
+    medir = instrument.enabled()
+    inicio = time.perf_counter() if medir else 0.0
+    html = cache.get(url)
+    resultado, tamanho = 'hit', 0
+    if html is None:
+        # Pedidos simultâneos da mesma URL dividem um só download
+        (html, tamanho), dono = await scheduler.shared_async(('html', url), lambda: _baixar(url, finished))
+        resultado = 'miss' if dono else 'shared'
+    if medir:
+        instrument.fetched(url, inicio, resultado, tamanho)
+    return html
+
+
+async def process(func, *args):
+    # O parse e o pós-processamento usam CPU: rodam fora do event loop para
+    # não atrasar as outras transferências em andamento. O contexto vai junto
+    # para que o parse conte no span da chamada
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(contextvars.copy_context().run, func, *args))
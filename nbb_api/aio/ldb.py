@@ -0,0 +1,28 @@
+from .. import ldb as _ldb
+from ..ldb import season_dict, fase_dict, sofrido_dict, seasons, fases, categs, tipos, quems, sofridos
+from .. import frames
+from . import fetch
+
+
+@frames.finalize('ldb', 'classificacao')
+async def get_classificacao(season):
+    pedido = _ldb._classificacao_request(season)
+    if pedido is None:
+        return None
+    url, finished = pedido
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_ldb._classificacao_from_html, html, season)
+
+
+@frames.finalize('ldb', 'stats')
+async def get_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
+    url, finished = _ldb._stats_request(season, fase, categ, tipo, quem, sofrido)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_ldb._stats_from_html, html, season, quem)
+
+
+@frames.finalize('ldb', 'placares')
+async def get_placares(season, fase):
+    url, finished = _ldb._placares_request(season, fase)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_ldb._placares_from_html, html, season)
@@ -0,0 +1,18 @@
+from .. import liga_ouro as _liga_ouro
+from ..liga_ouro import season_dict, fase_dict, seasons, fases
+from .. import frames
+from . import fetch
+
+
+@frames.finalize('liga_ouro', 'classificacao')
+async def get_classificacao(season):
+    url, finished = _liga_ouro._classificacao_request(season)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_liga_ouro._classificacao_from_html, html, season)
+
+
+@frames.finalize('liga_ouro', 'placares')
+async def get_placares(season, fase):
+    url, finished = _liga_ouro._placares_request(season, fase)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_liga_ouro._placares_from_html, html, season)
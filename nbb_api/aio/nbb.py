@@ -0,0 +1,26 @@
+from .. import nbb as _nbb
+from ..nbb import (season_dict, fase_dict, sofrido_dict, mandante_dict, seasons, seasons_classification,
+                   fases, categs, tipos, quems, sofridos, mandantes)
+from .. import frames
+from . import fetch
+
+
+@frames.finalize('nbb', 'stats')
+async def get_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False):
+    url, finished = _nbb._stats_request(season, fase, categ, tipo, quem, mandante, sofrido)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_nbb._stats_from_html, html, season, quem)
+
+
+@frames.finalize('nbb', 'classificacao')
+async def get_classificacao(season):
+    url, finished = _nbb._classificacao_request(season)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_nbb._classificacao_from_html, html, season)
+
+
+@frames.finalize('nbb', 'placares')
+async def get_placares(season, fase):
+    url, finished = _nbb._placares_request(season, fase)
+    html = await fetch.get_html(url, finished)
+    return await fetch.process(_nbb._placares_from_html, html, season)
@@ -0,0 +1,254 @@
+import asyncio
+import ssl
+import time
+import weakref
+from urllib.parse import urljoin, urlsplit
+
+from .. import transport
+from ..transport import HTTPStatusError, Response, TransportError, TransportTimeout
+
+# Versão assíncrona do transporte: mesmas opções (prazos, novas tentativas,
+# hedge) e exceções de nbb_api.transport, mas com I/O não bloqueante sobre
+# asyncio. Como no síncrono, conectar e cada leitura esperam no máximo o que
+# resta do prazo total, e os hedges dividem o mesmo limite (hedge_max).
+# Cancelar a tarefa fecha a conexão e interrompe a transferência.
+# As conexões ficam presas ao event loop em que foram abertas e são fechadas
+# quando ele termina.
+_por_loop = weakref.WeakKeyDictionary()  # loop -> {'pools': {(scheme, netloc): _Pool}, 'guarda': ...}
+_ssl_context = None
+
+
+class _Conexao:
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class _Pool:
+    def __init__(self, scheme, netloc):
+        self.scheme = scheme
+        self.netloc = netloc
+        self._ociosas = []
+
+    async def acquire(self, limite):
+        while self._ociosas:
+            conn = self._ociosas.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+
+        global _ssl_context
+        partes = urlsplit(f'{self.scheme}://{self.netloc}')
+        contexto = None
+        if self.scheme == 'https':
+            if _ssl_context is None:
+                _ssl_context = ssl.create_default_context()
+            contexto = _ssl_context
+        porta = partes.port or (443 if self.scheme == 'https' else 80)
+        espera = min(transport.connect_timeout, transport._restante(limite, self.netloc))
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(partes.hostname, porta, ssl=contexto), espera)
+        except asyncio.TimeoutError:
+            raise TransportTimeout(f'Tempo esgotado ao conectar em {self.netloc}') from None
+        except OSError as e:
+            raise TransportError(f'Falha ao conectar em {self.netloc}: {e}') from e
+        return _Conexao(reader, writer), False
+
+    def release(self, conn):
+        if len(self._ociosas) < transport.max_conexoes_ociosas:
+            self._ociosas.append(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        ociosas, self._ociosas = self._ociosas, []
+        for conn in ociosas:
+            conn.close()
+
+
+async def _guardar(loop, pools):
+    # Gerador que só termina junto com o event loop: asyncio.run() fecha os
+    # geradores pendentes (shutdown_asyncgens) antes de fechar o loop, e é aí
+    # que as conexões ociosas são fechadas e o loop sai do registro
+    try:
+        yield
+    finally:
+        _por_loop.pop(loop, None)
+        for pool in list(pools.values()):
+            pool.close()
+        pools.clear()
+
+
+async def _pool(scheme, netloc):
+    loop = asyncio.get_running_loop()
+    estado = _por_loop.get(loop)
+    if estado is None:
+        pools = {}
+        guarda = _guardar(loop, pools)
+        await guarda.__anext__()
+        estado = _por_loop[loop] = {'pools': pools, 'guarda': guarda}
+    pool = estado['pools'].get((scheme, netloc))
+    if pool is None:
+        pool = estado['pools'][(scheme, netloc)] = _Pool(scheme, netloc)
+    return pool
+
+
+def close():
+    for estado in list(_por_loop.values()):
+        for pool in list(estado['pools'].values()):
+            pool.close()
+        estado['pools'].clear()
+
+
+async def _ler(corrotina, limite):
+    # Cada leitura espera no máximo read_timeout, e nunca além do prazo total de get()
+    try:
+        espera = min(transport.read_timeout, transport._restante(limite, 'a resposta'))
+    except TransportTimeout:
+        corrotina.close()
+        raise
+    return await asyncio.wait_for(corrotina, espera)
+
+
+async def _ler_corpo(reader, headers, status, limite):
+    if status in (204, 304) or 100 <= status < 200:
+        return b'', True
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        partes = []
+        while True:
+            tamanho = int((await _ler(reader.readline(), limite)).split(b';')[0].strip(), 16)
+            if tamanho == 0:
+                break
+            partes.append(await _ler(reader.readexactly(tamanho), limite))
+            await _ler(reader.readline(), limite)
+        while (await _ler(reader.readline(), limite)).strip():
+            pass
+        return b''.join(partes), True
+    if 'content-length' in headers:
+        return await _ler(reader.readexactly(int(headers['content-length'])), limite), True
+    # Sem tamanho conhecido: o corpo vai até o servidor fechar a conexão
+    return await _ler(reader.read(), limite), False
+
+
+async def _request(url, limite):
+    partes = urlsplit(url)
+    caminho = (partes.path or '/') + (f'?{partes.query}' if partes.query else '')
+    pedido = (
+        f'GET {caminho} HTTP/1.1\r\n'
+        f'Host: {partes.netloc}\r\n'
+        'Accept: text/html,application/xhtml+xml\r\n'
+        'Accept-Encoding: gzip, deflate\r\n'
+        'Connection: keep-alive\r\n'
+        f'User-Agent: {transport.user_agent}\r\n\r\n'
+    ).encode('latin-1')
+    pool = await _pool(partes.scheme, partes.netloc)
+
+    while True:
+        conn, reutilizada = await pool.acquire(limite)
+        try:
+            conn.writer.write(pedido)
+            await _ler(conn.writer.drain(), limite)
+            linha = await _ler(conn.reader.readline(), limite)
+            if not linha and reutilizada:
+                # Conexão ociosa fechada pelo servidor: tenta numa nova
+                conn.close()
+                continue
+            # "HTTP/1.1 200 OK"; a frase depois do código pode faltar
+            versao, _, resto = linha.decode('latin-1').rstrip('\r\n').partition(' ')
+            status = int(resto.partition(' ')[0])
+            headers = {}
+            while True:
+                linha = await _ler(conn.reader.readline(), limite)
+                if linha in (b'\r\n', b'\n', b''):
+                    break
+                nome, _, valor = linha.decode('latin-1').partition(':')
+                headers[nome.strip().lower()] = valor.strip()
+            content, reaproveitavel = await _ler_corpo(conn.reader, headers, status, limite)
+        except asyncio.TimeoutError:
+            conn.close()
+            raise TransportTimeout(f'Tempo esgotado aguardando {url}') from None
+        except TransportError:
+            conn.close()
+            raise
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            conn.close()
+            if reutilizada and isinstance(e, (ConnectionError, asyncio.IncompleteReadError)):
+                continue
+            raise TransportError(f'Falha ao acessar {url}: {e}') from e
+        except BaseException:
+            # Inclui CancelledError: a transferência é abandonada junto com a conexão
+            conn.close()
+            raise
+
+        if (reaproveitavel and versao == 'HTTP/1.1'
+                and headers.get('connection', '').lower() != 'close'):
+            pool.release(conn)
+        else:
+            conn.close()
+        return status, headers, transport._decode(content, headers.get('content-encoding'))
+
+
+async def _get_once(url, limite):
+    inicio = time.monotonic()
+    for _ in range(transport.max_redirecionamentos + 1):
+        status, headers, content = await _request(url, limite)
+        if status in (301, 302, 303, 307, 308) and 'location' in headers:
+            url = urljoin(url, headers['location'])
+            continue
+        if status >= 400:
+            raise HTTPStatusError(url, status, headers.get('retry-after'))
+        transport._registrar_latencia(urlsplit(url).netloc, time.monotonic() - inicio)
+        return Response(url, status, headers, content)
+    raise TransportError(f'Redirecionamentos demais a partir de {url}')
+
+
+async def _get_hedged(url, limite):
+    atraso = transport._hedge_delay(urlsplit(url).netloc)
+    if atraso is None:
+        return await _get_once(url, limite)
+
+    pendentes = {asyncio.ensure_future(_get_once(url, limite))}
+    try:
+        feitos, _ = await asyncio.wait(pendentes, timeout=atraso)
+        # O limite de hedges em andamento (hedge_max) é o mesmo do transporte síncrono
+        hedges = transport._hedges
+        if not feitos and hedges.acquire(blocking=False):
+            # Liberado quando a tarefa termina, inclusive se for cancelada antes de começar
+            hedge = asyncio.ensure_future(_get_once(url, limite))
+            hedge.add_done_callback(lambda _: hedges.release())
+            pendentes.add(hedge)
+
+        erro = None
+        while pendentes:
+            feitos, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in feitos:
+                if tarefa.exception() is None:
+                    return tarefa.result()
+                erro = tarefa.exception()
+        raise erro
+    finally:
+        # Ao contrário da versão com threads, a requisição perdedora é cancelada
+        for tarefa in pendentes:
+            tarefa.cancel()
+
+
+async def get(url):
+    limite = time.monotonic() + transport.deadline
+    tentativa = 0
+    while True:
+        try:
+            return await _get_hedged(url, limite)
+        except TransportError as erro:
+            if not transport._transitorio(erro) or tentativa >= transport.retries:
+                raise
+            espera = transport._espera(tentativa, erro)
+            if time.monotonic() + espera >= limite:
+                raise TransportTimeout(f'Prazo de {transport.deadline}s esgotado para {url}') from erro
+            await asyncio.sleep(espera)
+            tentativa += 1
@@ -0,0 +1,130 @@
+import io
+import re
+from urllib.parse import urljoin
+
+import pandas as pd
+
+from . import bulk, fetch, incremental, parser, scores
+
+# Box scores dos jogos a partir dos links "VER RELATÓRIO" da tabela de jogos.
+# Os relatórios são baixados em paralelo (no máximo `max_workers` de cada
+# vez); o de um jogo encerrado não muda mais e fica no cache permanente. As
+# tabelas saem em formato longo, uma linha por jogador (ou equipe) e
+# estatística, com as colunas de chave da tabela de jogos (DATA + EQUIPE CASA
+# + EQUIPE VISITANTE).
+BASE = 'https://lnb.com.br'
+RELATORIO = 'RELATORIO'
+
+_TEXTO_LINK = 'relatório'
+_JOGADOR = ('Jogador', 'Atleta', 'JOGADOR', 'ATLETA')
+_TOTAL = re.compile(r'^\s*(total|totais|equipe)', re.IGNORECASE)
+_CONVERTIDOS = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+_MINUTOS = re.compile(r'^\s*(\d+):(\d{2})\s*$')
+
+columns_players = incremental.CHAVE + ['TEMPORADA', 'EQUIPE', 'Jogador', 'ESTATISTICA', 'VALOR']
+columns_teams = incremental.CHAVE + ['TEMPORADA', 'EQUIPE', 'ESTATISTICA', 'VALOR']
+
+
+def games(html, season):
+    # Tabela de jogos normalizada com a URL do relatório de cada jogo
+    df = scores.normalize(fetch.parse_table(html), season)
+    links = parser.row_links(html, _TEXTO_LINK)
+    if len(links) != len(df):
+        # Tabela lida pelo pd.read_html com outra quantidade de linhas
+        links = [None] * len(df)
+    df[RELATORIO] = [urljoin(BASE, link) if link else None for link in links]
+    return df
+
+
+def _estatistica(serie):
+    # "5/12" -> convertidos e tentados; "25:30" -> minutos; o resto, número
+    texto = serie.astype('string')
+    partes = texto.str.extract(_CONVERTIDOS)
+    if partes[0].notna().any() and partes[0].notna().sum() >= texto.notna().sum() / 2:
+        return {' C': pd.to_numeric(partes[0]), ' T': pd.to_numeric(partes[1])}
+    minutos = texto.str.extract(_MINUTOS)
+    if minutos[0].notna().any():
+        return {'': pd.to_numeric(minutos[0]) + pd.to_numeric(minutos[1]) / 60}
+    return {'': pd.to_numeric(texto, errors='coerce')}
+
+
+def _longo(df, ids):
+    estatisticas = {}
+    for coluna in df.columns:
+        if coluna in ids:
+            continue
+        for sufixo, valores in _estatistica(df[coluna]).items():
+            estatisticas[f'{coluna}{sufixo}'] = valores.astype('float64')
+    largo = pd.concat([df[ids]] + [pd.Series(v, name=k) for k, v in estatisticas.items()], axis=1)
+    return largo.melt(id_vars=ids, var_name='ESTATISTICA', value_name='VALOR').dropna(subset=['VALOR'])
+
+
+def _equipe(df, coluna):
+    total = df[coluna].astype('string').str.match(_TOTAL).fillna(False).to_numpy()
+    jogadores = df[~total].reset_index(drop=True)
+    jogadores = jogadores[jogadores[coluna].notna()].rename(columns={coluna: 'Jogador'})
+    jogadores = _longo(jogadores, ['Jogador'])
+    if total.any():
+        equipe = _longo(df[total].iloc[[-1]].drop(columns=[coluna]).reset_index(drop=True), [])
+    else:
+        # Relatório sem linha de totais: a equipe é a soma dos jogadores
+        equipe = jogadores.groupby('ESTATISTICA', sort=False, as_index=False)['VALOR'].sum()
+    return jogadores, equipe
+
+
+def from_html(html):
+    # Box score de um relatório: (jogadores, equipes), com EQUIPE valendo
+    # 'casa' ou 'visitante' (as duas primeiras tabelas com coluna de jogador)
+    tabelas = [t for t in pd.read_html(io.StringIO(html)) if any(c in t.columns for c in _JOGADOR)]
+    jogadores, equipes = [], []
+    for lado, tabela in zip(('casa', 'visitante'), tabelas):
+        coluna = next(c for c in _JOGADOR if c in tabela.columns)
+        j, e = _equipe(tabela, coluna)
+        jogadores.append(j.assign(EQUIPE=lado))
+        equipes.append(e.assign(EQUIPE=lado))
+    if not jogadores:
+        raise ValueError('Relatório sem tabela de box score.')
+    return pd.concat(jogadores, ignore_index=True), pd.concat(equipes, ignore_index=True)
+
+
+def _baixar(url, finished):
+    return from_html(fetch.get_html(url, finished))
+
+
+def _chave(jogo, df):
+    # 'casa'/'visitante' -> nome da equipe, mais as colunas de chave do jogo
+    nomes = {'casa': jogo[incremental.CHAVE[1]], 'visitante': jogo[incremental.CHAVE[2]]}
+    df = df.assign(EQUIPE=df['EQUIPE'].map(nomes))
+    for coluna in incremental.CHAVE + ['TEMPORADA']:
+        df[coluna] = jogo[coluna]
+    return df
+
+
+def collect(jogos, max_workers=None, on_error=None):
+    jogos = jogos[jogos[RELATORIO].notna()].drop_duplicates(RELATORIO).reset_index(drop=True)
+    # Jogo com vencedor já terminou: o relatório vai para o cache permanente
+    combinacoes = [{'url': url, 'finished': bool(finished)}
+                   for url, finished in zip(jogos[RELATORIO], jogos['VENCEDOR'].notna())]
+    linha = {url: i for i, url in enumerate(jogos[RELATORIO])}
+    falhas = {}
+
+    def falhou(params, erro):
+        falhas[params['url']] = erro
+        if on_error is not None:
+            on_error(params, erro)
+
+    # Os relatórios chegam na ordem em que terminam; a saída segue a tabela de jogos
+    resultados = [None] * len(jogos)
+    for params, (j, e) in bulk.iter_run(_baixar, combinacoes, max_workers, on_error=falhou):
+        i = linha[params['url']]
+        resultados[i] = _chave(jogos.iloc[i], j), _chave(jogos.iloc[i], e)
+    resultados = [r for r in resultados if r is not None]
+
+    if resultados:
+        jogadores = pd.concat([j for j, _ in resultados], ignore_index=True)[columns_players]
+        equipes = pd.concat([e for _, e in resultados], ignore_index=True)[columns_teams]
+    else:
+        jogadores, equipes = pd.DataFrame(columns=columns_players), pd.DataFrame(columns=columns_teams)
+    # Falhas por relatório: {url: exceção}
+    jogadores.attrs['falhas'] = equipes.attrs['falhas'] = falhas
+    return jogadores, equipes
@@ -0,0 +1,103 @@
+import contextvars
+import functools
+import itertools
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from . import frames as _frames
+
+# Número padrão de downloads simultâneos nas funções *_many e iter_*
+max_workers = 8
+
+
+def as_list(valor):
+    if isinstance(valor, (str, bytes)) or not isinstance(valor, Iterable):
+        return [valor]
+    return list(dict.fromkeys(valor))
+
+
+def grid(**params):
+    return {nome: as_list(valor) for nome, valor in params.items()}
+
+
+def combinations(grade):
+    nomes = list(grade)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*grade.values())]
+
+
+def _tag(df, params, ignorar):
+    df = df.copy()
+    for nome, valor in params.items():
+        if nome not in ignorar:
+            df[nome] = pd.Categorical([valor] * len(df)) if _frames.compact else valor
+    return df
+
+
+def _executar(func, combinacoes, workers, max_pending):
+    # Gera (índice, futuro) na ordem em que terminam. Um novo download só é
+    # agendado depois que o consumidor pega um resultado, então nunca há mais
+    # que `max_pending` páginas prontas esperando para serem lidas.
+    workers = workers or max_workers
+    max_pending = max(1, max_pending or 2 * workers)
+    restantes = iter(enumerate(combinacoes))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pendentes = {}
+
+    def agendar():
+        for i, params in restantes:
+            # Com o contexto de quem chamou, as consultas entram no span dele
+            pendentes[executor.submit(contextvars.copy_context().run, func, **params)] = i
+            return
+
+    try:
+        for _ in range(max_pending):
+            agendar()
+        while pendentes:
+            feitos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in feitos:
+                yield pendentes.pop(futuro), futuro
+                agendar()
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_run(func, combinacoes, workers=None, max_pending=None, on_error=None):
+    for i, futuro in _executar(func, combinacoes, workers, max_pending):
+        try:
+            df = futuro.result()
+        except BrokenExecutor:
+            # Pool de processos quebrado não é falha de uma combinação
+            raise
+        except Exception as erro:
+            if on_error is None:
+                raise
+            on_error(combinacoes[i], erro)
+            continue
+        yield combinacoes[i], df
+
+
+def run(func, combinacoes, workers=None, ignorar=('season',)):
+    resultados = [None] * len(combinacoes)
+    falhas = {}
+
+    # As páginas voltam em pandas para serem marcadas e concatenadas; o
+    # formato de saída configurado vale para o resultado final
+    func = functools.partial(func, output='pandas')
+    for i, futuro in _executar(func, combinacoes, workers, len(combinacoes)):
+        params = combinacoes[i]
+        try:
+            resultados[i] = _tag(futuro.result(), params, ignorar)
+        except BrokenExecutor:
+            raise
+        except Exception as erro:
+            falhas[tuple(params.values())] = erro
+
+    frames = [df for df in resultados if df is not None]
+    df = _frames.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    # Falhas por combinação de parâmetros: {(season, fase, ...): exceção}
+    df.attrs['falhas'] = falhas
+    return _frames.convert(df, _frames.output)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+# Cache em disco do HTML bruto das páginas da LNB, indexado pela URL.
+# Páginas de temporadas encerradas nunca expiram; as da temporada em
+# andamento valem por `ttl_temporada_atual` segundos.
+diretorio = os.environ.get('NBB_API_CACHE_DIR') or None
+ttl_temporada_atual = float(os.environ.get('NBB_API_CACHE_TTL', 15 * 60))
+
+_PERMANENTE = 'permanente'
+_TEMPORARIO = 'temporario'
+
+
+def configure(path=None, ttl=None):
+    global diretorio, ttl_temporada_atual
+    if path is None:
+        path = os.path.join(os.path.expanduser('~'), '.cache', 'nbb_api')
+    diretorio = str(path)
+    if ttl is not None:
+        ttl_temporada_atual = float(ttl)
+
+
+def disable():
+    global diretorio
+    diretorio = None
+
+
+def enabled():
+    return diretorio is not None
+
+
+def _caminho(tipo, url):
+    chave = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(diretorio, tipo, chave[:2], chave + '.html')
+
+
+def _ler(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def get(url):
+    if diretorio is None:
+        return None
+
+    try:
+        return _ler(_caminho(_PERMANENTE, url))
+    except FileNotFoundError:
+        pass
+
+    caminho = _caminho(_TEMPORARIO, url)
+    try:
+        if time.time() - os.path.getmtime(caminho) > ttl_temporada_atual:
+            return None
+        return _ler(caminho)
+    except FileNotFoundError:
+        return None
+
+
+def put(url, html, permanente=False):
+    if diretorio is None:
+        return
+
+    caminho = _caminho(_PERMANENTE if permanente else _TEMPORARIO, url)
+    pasta = os.path.dirname(caminho)
+    os.makedirs(pasta, exist_ok=True)
+
+    # Escrita atômica: processos concorrentes nunca leem um arquivo pela metade
+    fd, tmp = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, caminho)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    if permanente:
+        try:
+            os.unlink(_caminho(_TEMPORARIO, url))
+        except FileNotFoundError:
+            pass
+
+
+def clear(permanente=False):
+    if diretorio is None:
+        return
+    shutil.rmtree(os.path.join(diretorio, _TEMPORARIO), ignore_errors=True)
+    if permanente:
+        shutil.rmtree(os.path.join(diretorio, _PERMANENTE), ignore_errors=True)
@@ -0,0 +1,172 @@
+import datetime
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import bulk
+
+# Banco SQLite opcional onde as funções get_* gravam tudo o que devolvem,
+# uma tabela por liga e dataset (nbb_stats, ldb_placares...). Os parâmetros
+# da consulta viram colunas com prefixo "_" (_season, _fase, _categ...), para
+# não colidir com colunas da LNB como FASE (o SQLite não diferencia
+# maiúsculas). query() monta o SELECT com os filtros e as colunas pedidas,
+# então só as linhas que interessam saem do banco.
+caminho = None
+
+_OPERADORES = ('=', '!=', '<', '<=', '>', '>=', 'like')
+
+# Colunas indexadas quando existem na tabela (jogador + camisa num só índice)
+_INDICES = [('_season',), ('_fase',), ('Equipe',), ('EQUIPES',), ('EQUIPE CASA',), ('EQUIPE VISITANTE',),
+            ('Jogador', 'Camisa'), ('FASE',), ('DATA',)]
+
+# Colunas de equipe usadas pelo filtro `team`
+_EQUIPES = ('Equipe', 'EQUIPES', 'EQUIPE CASA', 'EQUIPE VISITANTE')
+
+_conexao = None
+_lock = threading.RLock()
+
+
+def configure(path):
+    global caminho
+    close()
+    caminho = str(path)
+
+
+def disable():
+    global caminho
+    close()
+    caminho = None
+
+
+def enabled():
+    return caminho is not None
+
+
+def close():
+    global _conexao
+    with _lock:
+        if _conexao is not None:
+            _conexao.close()
+            _conexao = None
+
+
+def _conectar():
+    global _conexao
+    if caminho is None:
+        raise RuntimeError('Nenhum banco configurado. Use nbb_api.db.configure(caminho).')
+    if _conexao is None:
+        _conexao = sqlite3.connect(caminho, check_same_thread=False)
+        _conexao.execute('PRAGMA journal_mode=WAL')
+    return _conexao
+
+
+def _id(nome):
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def _tabela(liga, dataset):
+    return f'{liga}_{dataset}'
+
+
+def _colunas(conexao, tabela):
+    return [linha[1] for linha in conexao.execute(f'PRAGMA table_info({_id(tabela)})')]
+
+
+def _valor(valor):
+    if valor is None or valor is pd.NA or valor is pd.NaT:
+        return None
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    if isinstance(valor, (pd.Timestamp, datetime.datetime)):
+        return valor.isoformat(sep=' ')
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def write(liga, dataset, params, df):
+    # Substitui as linhas da mesma combinação de parâmetros pelas novas
+    if df is None:
+        return
+    tabela = _tabela(liga, dataset)
+    parametros = {f'_{nome}': _valor(valor) for nome, valor in params.items()}
+    colunas_df = [str(c) for c in df.columns]
+
+    with _lock:
+        conexao = _conectar()
+        with conexao:
+            existentes = _colunas(conexao, tabela)
+            if not existentes:
+                conexao.execute(f'CREATE TABLE {_id(tabela)} ({", ".join(_id(c) for c in parametros)})')
+                existentes = list(parametros)
+            minusculas = {c.lower() for c in existentes}
+            for coluna in list(parametros) + colunas_df:
+                if coluna.lower() not in minusculas:
+                    conexao.execute(f'ALTER TABLE {_id(tabela)} ADD COLUMN {_id(coluna)}')
+                    minusculas.add(coluna.lower())
+                    existentes.append(coluna)
+            for indice in _INDICES:
+                if all(c.lower() in minusculas for c in indice):
+                    nome = tabela + '_' + '_'.join(c.strip('_').replace(' ', '_').lower() for c in indice)
+                    conexao.execute(f'CREATE INDEX IF NOT EXISTS {_id(nome)} ON {_id(tabela)} '
+                                    f'({", ".join(_id(c) for c in indice)})')
+
+            filtro = ' AND '.join(f'{_id(c)} IS ?' for c in parametros)
+            conexao.execute(f'DELETE FROM {_id(tabela)} WHERE {filtro}', list(parametros.values()))
+
+            nomes = list(parametros) + colunas_df
+            sql = (f'INSERT INTO {_id(tabela)} ({", ".join(_id(c) for c in nomes)}) '
+                   f'VALUES ({", ".join("?" * len(nomes))})')
+            fixos = list(parametros.values())
+            linhas = (fixos + [_valor(v) for v in linha] for linha in df.itertuples(index=False, name=None))
+            conexao.executemany(sql, linhas)
+
+
+def _condicao(coluna, criterio, valores):
+    if isinstance(criterio, tuple):
+        operador, valor = criterio
+        if operador.lower() not in _OPERADORES:
+            raise ValueError(f'{operador} não é um operador válido. Tente um de: "' + '", "'.join(_OPERADORES) + '".')
+        valores.append(_valor(valor))
+        return f'{_id(coluna)} {operador.upper()} ?'
+    lista = bulk.as_list(criterio)
+    valores.extend(_valor(v) for v in lista)
+    if len(lista) == 1:
+        return f'{_id(coluna)} = ?'
+    return f'{_id(coluna)} IN ({", ".join("?" * len(lista))})'
+
+
+def query(liga, dataset, columns=None, where=None, team=None, limit=None, **params):
+    # params: filtros pelos parâmetros das funções get_* (season, fase, categ...)
+    # where: {coluna: valor | [valores] | (operador, valor)}
+    tabela = _tabela(liga, dataset)
+    with _lock:
+        conexao = _conectar()
+        existentes = _colunas(conexao, tabela)
+    if not existentes:
+        return pd.DataFrame(columns=bulk.as_list(columns) if columns is not None else [])
+
+    condicoes, valores = [], []
+    for nome, criterio in params.items():
+        condicoes.append(_condicao(f'_{nome}', criterio, valores))
+    for coluna, criterio in (where or {}).items():
+        condicoes.append(_condicao(coluna, criterio, valores))
+    if team is not None:
+        colunas_equipe = [c for c in _EQUIPES if c in existentes]
+        partes = [_condicao(c, team, valores) for c in colunas_equipe]
+        condicoes.append('(' + ' OR '.join(partes) + ')' if partes else '0')
+
+    selecionadas = [c for c in existentes if not c.startswith('_')] if columns is None else bulk.as_list(columns)
+    sql = f'SELECT {", ".join(_id(c) for c in selecionadas)} FROM {_id(tabela)}'
+    if condicoes:
+        sql += ' WHERE ' + ' AND '.join(condicoes)
+    if limit is not None:
+        sql += f' LIMIT {int(limit)}'
+
+    with _lock:
+        df = pd.read_sql_query(sql, conexao, params=valores)
+    if 'DATA' in df.columns:
+        df['DATA'] = pd.to_datetime(df['DATA'])
+    return df
@@ -0,0 +1,46 @@
+import time
+
+from . import cache, instrument, memo, parser, scheduler, transport
+
+
+def _download(url):
+    # O HTML e o tamanho da resposta, para a instrumentação
+    with scheduler.slot(url):
+        resposta = transport.get(url)
+    return resposta.text, len(resposta.content)
+
+
+def _baixar(url, finished):
+    html, tamanho = _download(url)
+    cache.put(url, html, permanente=finished)
+    return html, tamanho
+
+
+def get_html(url, finished=False, force=False):
+    # force: ignora o que estiver no cache (mas atualiza a entrada)
+    if not finished:
+        memo.mark_unfinished()
+    medir = instrument.enabled()
+    inicio = time.perf_counter() if medir else 0.0
+    html = None if force else cache.get(url)
+    resultado, tamanho = 'hit', 0
+    if html is None:
+        # Pedidos simultâneos da mesma URL dividem um só download
+        (html, tamanho), dono = scheduler.shared(('html', url), lambda: _baixar(url, finished))
+        resultado = 'miss' if dono else 'shared'
+    if medir:
+        instrument.fetched(url, inicio, resultado, tamanho)
+    return html
+
+
+def parse_table(html):
+    if not instrument.enabled():
+        return parser.read_table(html)
+    inicio = time.perf_counter()
+    df = parser.read_table(html)
+    instrument.parsed(inicio, df)
+    return df
+
+
+def read_table(url, finished=False):
+    return parse_table(get_html(url, finished))
@@ -0,0 +1,222 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import db, instrument, players
+from .validation import validate_choice
+
+# Modo compacto dos DataFrames devolvidos pelas funções get_*: equipes,
+# temporadas e fases viram categorias (com um dicionário de categorias por
+# liga, compartilhado por todas as tabelas), números inteiros viram o menor
+# inteiro anulável que comporta os valores e médias viram float32.
+compact = False
+
+# Formato de saída: 'pandas' (padrão), 'arrow' (pyarrow.Table) ou
+# 'pandas-arrow' (DataFrame com colunas ArrowDtype). Os dois últimos
+# precisam do pyarrow (pip install nbb_api[arrow]).
+output = 'pandas'
+outputs = ['pandas', 'arrow', 'pandas-arrow']
+
+# Colunas categóricas -> grupo cujo dicionário de categorias elas compartilham
+_GRUPOS = {
+    'Equipe': 'equipes', 'EQUIPES': 'equipes', 'EQUIPE CASA': 'equipes',
+    'EQUIPE VISITANTE': 'equipes', 'VENCEDOR': 'equipes',
+    'Temporada': 'temporadas', 'TEMPORADA': 'temporadas',
+    'FASE': 'fases', 'RODADA': 'fases',
+}
+# Colunas de texto que guardam números (número da camisa)
+_NUMERICAS = {'Camisa'}
+_INTEIROS = [('Int8', np.int8), ('Int16', np.int16), ('Int32', np.int32), ('Int64', np.int64)]
+
+_categorias = {}  # (liga, grupo) -> CategoricalDtype
+_lock = threading.Lock()
+_chamada = contextvars.ContextVar('nbb_api_frames_chamada', default=None)
+
+
+def configure(compact=None, output=None):
+    if compact is not None:
+        globals()['compact'] = bool(compact)
+    if output is not None:
+        validate_choice(output, outputs)
+        globals()['output'] = output
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Esta opção precisa do pyarrow. Instale com: pip install nbb_api[arrow]') from None
+    return pyarrow
+
+
+def categories(liga, grupo):
+    dtype = _categorias.get((liga, grupo))
+    return [] if dtype is None else list(dtype.categories)
+
+
+def _dtype_categorico(liga, grupo, valores):
+    # O dicionário só cresce (novas categorias vão para o fim), então os
+    # códigos das tabelas já devolvidas continuam válidos
+    with _lock:
+        dtype = _categorias.get((liga, grupo))
+        conhecidas = dtype.categories if dtype is not None else pd.Index([], dtype=object)
+        novas = pd.Index(pd.unique(valores.dropna())).difference(conhecidas, sort=False)
+        if dtype is None or len(novas):
+            dtype = _categorias[(liga, grupo)] = pd.CategoricalDtype(conhecidas.append(novas).astype(object))
+        return dtype
+
+
+def _menor_inteiro(serie):
+    valores = serie.dropna()
+    if len(valores) == 0:
+        return serie.astype('Int8')
+    minimo, maximo = valores.min(), valores.max()
+    for nome, tipo in _INTEIROS:
+        info = np.iinfo(tipo)
+        if info.min <= minimo and maximo <= info.max:
+            return serie.astype(nome)
+
+
+def compact_frame(df, liga):
+    df = df.copy()
+    for nome in df.columns:
+        serie = df[nome]
+        if nome in _GRUPOS:
+            df[nome] = serie.astype(_dtype_categorico(liga, _GRUPOS[nome], serie))
+        elif nome in _NUMERICAS:
+            df[nome] = _menor_inteiro(pd.to_numeric(serie, errors='coerce'))
+        elif pd.api.types.is_bool_dtype(serie.dtype):
+            continue
+        elif pd.api.types.is_integer_dtype(serie.dtype):
+            df[nome] = _menor_inteiro(serie)
+        elif pd.api.types.is_float_dtype(serie.dtype):
+            df[nome] = serie.astype(np.float32)
+    return df
+
+
+def concat(frames, **kwargs):
+    # Categorias de tabelas compactadas em momentos diferentes podem estar em
+    # versões diferentes do dicionário da liga: unifica antes de concatenar
+    frames = list(frames)
+    categoricas = {}
+    for df in frames:
+        for nome in df.columns:
+            if isinstance(df[nome].dtype, pd.CategoricalDtype):
+                categoricas.setdefault(nome, []).append(df[nome].dtype.categories)
+    for nome, indices in categoricas.items():
+        todas = indices[0]
+        for indice in indices[1:]:
+            todas = todas.append(indice.difference(todas, sort=False))
+        if all(indice.equals(todas) for indice in indices):
+            continue
+        dtype = pd.CategoricalDtype(todas)
+        frames = [df.assign(**{nome: df[nome].astype(dtype)}) if nome in df.columns else df for df in frames]
+    return pd.concat(frames, **kwargs)
+
+
+def convert(df, formato):
+    validate_choice(formato, outputs)
+    if formato == 'pandas':
+        return df
+    # Colunas numéricas e de texto já em Arrow (pandas >= 3 com pyarrow)
+    # passam para a tabela sem cópia; categorias viram dictionary arrays
+    tabela = _pyarrow().Table.from_pandas(df, preserve_index=False)
+    if formato == 'arrow':
+        return tabela
+    convertido = tabela.to_pandas(types_mapper=pd.ArrowDtype)
+    convertido.attrs = df.attrs
+    return convertido
+
+
+def _parametros(assinatura, args, kwargs):
+    ligados = assinatura.bind(*args, **kwargs)
+    ligados.apply_defaults()
+    parametros = {}
+    for nome, valor in ligados.arguments.items():
+        if assinatura.parameters[nome].kind is inspect.Parameter.VAR_KEYWORD:
+            parametros.update(valor)
+        else:
+            parametros[nome] = valor
+    return parametros
+
+
+def reused():
+    # A tabela da chamada atual não foi montada agora (veio da memória ou de
+    # uma chamada idêntica simultânea): quem a montou já gravou no banco e no
+    # índice de jogadores
+    estado = _chamada.get()
+    if estado is not None:
+        estado['gravar'] = False
+
+
+def _precisa_gravar(df, estado):
+    return (df is not None and estado['gravar']
+            and (db.enabled() or (players.enabled() and 'Jogador' in df.columns)))
+
+
+def _gravar(df, liga, dataset, chamada):
+    if db.enabled():
+        db.write(liga, dataset, _parametros(*chamada), df)
+    if players.enabled() and 'Jogador' in df.columns:
+        params = _parametros(*chamada)
+        origem = dataset + ':' + '&'.join(f'{nome}={valor}' for nome, valor in params.items() if nome != 'season')
+        players.add(df, liga, params['season'], origem)
+
+
+def _finalizar(df, liga, compactar, formato):
+    if df is None:
+        return df
+    if compactar is None:
+        compactar = compact
+    if compactar:
+        df = compact_frame(df, liga)
+    return convert(df, formato or output)
+
+
+def finalize(liga, dataset):
+    # Acrescenta os parâmetros `compact` e `output` a uma função get_*
+    # (síncrona ou async), grava o resultado no banco, se configurado, e
+    # abre o span da instrumentação. Só grava tabelas montadas pela própria
+    # chamada (nas async, fora do event loop).
+    # Fica por fora da memoização: a memória guarda sempre a tabela original.
+    def decorador(func):
+        assinatura = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, compact=None, output=None, **kwargs):
+                if output is not None:
+                    validate_choice(output, outputs)
+                with instrument.span(liga, func.__name__):
+                    estado = {'gravar': True}
+                    token = _chamada.set(estado)
+                    try:
+                        df = await func(*args, **kwargs)
+                    finally:
+                        _chamada.reset(token)
+                    if _precisa_gravar(df, estado):
+                        await asyncio.to_thread(_gravar, df, liga, dataset, (assinatura, args, kwargs))
+                    return _finalizar(df, liga, compact, output)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, compact=None, output=None, **kwargs):
+                if output is not None:
+                    validate_choice(output, outputs)
+                with instrument.span(liga, func.__name__):
+                    estado = {'gravar': True}
+                    token = _chamada.set(estado)
+                    try:
+                        df = func(*args, **kwargs)
+                    finally:
+                        _chamada.reset(token)
+                    if _precisa_gravar(df, estado):
+                        _gravar(df, liga, dataset, (assinatura, args, kwargs))
+                    return _finalizar(df, liga, compact, output)
+        return wrapper
+
+    return decorador
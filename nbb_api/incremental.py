@@ -0,0 +1,82 @@
+import threading
+
+import pandas as pd
+
+from . import fetch
+from .strings import Strings
+
+# Atualização incremental da tabela de jogos de uma temporada. A última
+# tabela normalizada fica guardada por fase; a cada chamada só são baixadas
+# as fases que ainda podem mudar (a última, onde aparecem os novos jogos, e
+# as que têm jogos sem placar), e os jogos novos ou alterados são
+# identificados pela chave DATA + EQUIPE CASA + EQUIPE VISITANTE. Uma fase
+# só passa a ser baixada quando a anterior não tem mais jogos sem placar
+# marcados para o futuro (ou quando ela mesma já tinha jogos): durante a
+# fase regular, cada atualização baixa uma página só.
+CHAVE = ['DATA', Strings.equipe_casa, Strings.equipe_visitante]
+
+_estado = {}  # (liga, temporada, fase) -> {fase da página: DataFrame}
+_lock = threading.Lock()
+
+
+def reset(liga=None, season=None):
+    with _lock:
+        for chave in list(_estado):
+            if (liga is None or chave[0] == liga) and (season is None or chave[1] == str(season)):
+                del _estado[chave]
+
+
+def _hashes(df):
+    chaves = pd.MultiIndex.from_frame(df[CHAVE])
+    return pd.Series(pd.util.hash_pandas_object(df, index=False).to_numpy(), index=chaves)
+
+
+def changed_rows(antiga, nova):
+    # Linhas de `nova` que não existiam em `antiga` ou mudaram (placar, horário...)
+    if antiga is None or len(antiga) == 0:
+        return nova
+    anteriores = _hashes(antiga)
+    anteriores = anteriores[~anteriores.index.duplicated(keep='last')]
+    atuais = _hashes(nova)
+    posicoes = anteriores.index.get_indexer(atuais.index)
+    mudou = (posicoes == -1) | (anteriores.to_numpy()[posicoes] != atuais.to_numpy())
+    return nova[mudou]
+
+
+def _fechada(df):
+    return df is not None and len(df) > 0 and bool(df['VENCEDOR'].notna().all())
+
+
+def _terminou(df):
+    # Nenhum jogo sem placar marcado para depois de agora
+    pendentes = df['DATA'][df['VENCEDOR'].isna()]
+    return not bool((pendentes > pd.Timestamp.now()).any())
+
+
+def refresh(liga, season, fase, paginas, request, from_html):
+    chave = (liga, str(season), fase)
+    with _lock:
+        anteriores = dict(_estado.get(chave, {}))
+
+    atuais, alteradas = {}, []
+    for i, pagina in enumerate(paginas):
+        antiga = anteriores.get(pagina)
+        # Fase já encerrada (todos os jogos com vencedor) não muda mais
+        if i < len(paginas) - 1 and _fechada(antiga):
+            atuais[pagina] = antiga
+            continue
+        # Fase que ainda não começou: nem é baixada
+        if (i > 0 and (antiga is None or len(antiga) == 0)
+                and not all(_terminou(df) for df in atuais.values())):
+            continue
+        url, finished = request(season, pagina)
+        nova = from_html(fetch.get_html(url, finished, force=True), season)
+        alteradas.append(changed_rows(antiga, nova))
+        atuais[pagina] = nova
+
+    with _lock:
+        _estado[chave] = atuais
+
+    tabela = pd.concat(list(atuais.values()), ignore_index=True)
+    alteradas = pd.concat(alteradas, ignore_index=True) if alteradas else tabela.iloc[:0]
+    return tabela, alteradas
@@ -0,0 +1,200 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Instrumentação por etapa das funções get_*. Cada chamada abre um span
+# (liga e função) e as etapas dentro dela emitem eventos com a duração em
+# segundos: 'fetch' (URL, bytes baixados e resultado do cache: 'hit', 'miss'
+# ou 'shared' quando outro pedido já estava baixando a mesma página) e
+# 'parse' (linhas lidas). Ao final vem o evento 'call', com os totais da
+# chamada e o tempo de transformação (o que sobra depois de fetch e parse).
+# Os eventos são dicts entregues a cada sink registrado com add(): qualquer
+# função, logging_sink() ou PrometheusSink. Sem sinks, o código instrumentado
+# só checa enabled() e não mede nada.
+_sinks = ()
+_lock = threading.Lock()
+_span = contextvars.ContextVar('nbb_api_span', default=None)
+_NULO = nullcontext()
+
+_ETAPAS = ('fetch', 'parse')
+_TOTAIS = ('bytes', 'cache_hits', 'cache_misses', 'fetch', 'parse')
+
+log = logging.getLogger('nbb_api')
+
+
+def add(sink):
+    global _sinks
+    with _lock:
+        _sinks += (sink,)
+    return sink
+
+
+def remove(sink):
+    global _sinks
+    with _lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def disable():
+    global _sinks
+    with _lock:
+        _sinks = ()
+
+
+def enabled():
+    return bool(_sinks)
+
+
+@contextmanager
+def capture():
+    # Guarda numa lista os eventos emitidos dentro do bloco
+    eventos = []
+    add(eventos.append)
+    try:
+        yield eventos
+    finally:
+        remove(eventos.append)
+
+
+def _emitir(evento):
+    for sink in _sinks:
+        try:
+            sink(evento)
+        except Exception:
+            # Um sink com defeito não pode derrubar a consulta
+            log.exception('Erro no sink de instrumentação %r', sink)
+
+
+def span(liga, funcao):
+    if not _sinks:
+        return _NULO
+    return _medir(liga, funcao)
+
+
+@contextmanager
+def _medir(liga, funcao):
+    pai = _span.get()
+    atual = {'event': 'call', 'league': liga, 'function': funcao, 'urls': [], 'bytes': 0,
+             'cache_hits': 0, 'cache_misses': 0, 'fetch': 0.0, 'parse': 0.0}
+    token = _span.set(atual)
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        yield atual
+    except BaseException as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        _span.reset(token)
+        atual['duration'] = time.perf_counter() - inicio
+        # Nas consultas em lote, fetch e parse somam o tempo de todas as threads
+        atual['transform'] = max(0.0, atual['duration'] - atual['fetch'] - atual['parse'])
+        atual['error'] = erro
+        if pai is not None:
+            with _lock:
+                pai['urls'].extend(atual['urls'])
+                for chave in _TOTAIS:
+                    pai[chave] += atual[chave]
+        _emitir(atual)
+
+
+def _etapa(etapa, inicio, **campos):
+    duracao = time.perf_counter() - inicio
+    atual = _span.get()
+    evento = {'event': etapa, 'league': None, 'function': None, **campos, 'duration': duracao}
+    if atual is not None:
+        evento['league'], evento['function'] = atual['league'], atual['function']
+        with _lock:
+            if evento.get('url') is None and atual['urls']:
+                evento['url'] = atual['urls'][-1]
+            atual[etapa] += duracao
+            if etapa == 'fetch':
+                atual['urls'].append(evento['url'])
+                atual['bytes'] += evento['bytes']
+                atual['cache_hits' if evento['cache'] == 'hit' else 'cache_misses'] += 1
+    _emitir(evento)
+
+
+def fetched(url, inicio, cache, tamanho):
+    # `inicio` é o time.perf_counter() do começo da etapa; `tamanho` é o do
+    # conteúdo da resposta, e só o que foi baixado por este pedido conta
+    _etapa('fetch', inicio, url=url, cache=cache, bytes=tamanho if cache == 'miss' else 0)
+
+
+def parsed(inicio, df):
+    _etapa('parse', inicio, url=None, rows=len(df))
+
+
+def logging_sink(logger=None, level=logging.INFO):
+    logger = logger or log
+
+    def sink(evento):
+        if not logger.isEnabledFor(level):
+            return
+        campos = ' '.join(f'{nome}={valor:.6f}' if isinstance(valor, float) else f'{nome}={valor}'
+                          for nome, valor in evento.items() if nome != 'event')
+        logger.log(level, 'nbb_api %s %s', evento['event'], campos)
+
+    return sink
+
+
+def _rotulos(**rotulos):
+    def escapar(valor):
+        return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{nome}="{escapar(valor)}"' for nome, valor in rotulos.items()) + '}'
+
+
+class PrometheusSink:
+    # Acumula os eventos e exporta no formato texto do Prometheus com render()
+    def __init__(self, prefix='nbb_api'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._etapas = {}  # (liga, função, etapa) -> [soma, contagem]
+        self._bytes = {}  # (liga, função) -> bytes
+        self._cache = {}  # (liga, função, resultado) -> pedidos
+        self._erros = {}  # (liga, função, erro) -> chamadas
+
+    def _somar(self, chave, duracao):
+        item = self._etapas.setdefault(chave, [0.0, 0])
+        item[0] += duracao
+        item[1] += 1
+
+    def __call__(self, evento):
+        liga, funcao = evento['league'] or '', evento['function'] or ''
+        with self._lock:
+            if evento['event'] in _ETAPAS:
+                self._somar((liga, funcao, evento['event']), evento['duration'])
+            if evento['event'] == 'fetch':
+                self._bytes[liga, funcao] = self._bytes.get((liga, funcao), 0) + evento['bytes']
+                chave = (liga, funcao, evento['cache'])
+                self._cache[chave] = self._cache.get(chave, 0) + 1
+            elif evento['event'] == 'call':
+                self._somar((liga, funcao, 'transform'), evento['transform'])
+                self._somar((liga, funcao, 'total'), evento['duration'])
+                if evento['error'] is not None:
+                    chave = (liga, funcao, evento['error'])
+                    self._erros[chave] = self._erros.get(chave, 0) + 1
+
+    def render(self):
+        p = self.prefix
+        with self._lock:
+            linhas = [f'# HELP {p}_stage_seconds Tempo gasto em cada etapa das funções get_*.',
+                      f'# TYPE {p}_stage_seconds summary']
+            for (liga, funcao, etapa), (soma, contagem) in sorted(self._etapas.items()):
+                rotulos = _rotulos(league=liga, function=funcao, stage=etapa)
+                linhas += [f'{p}_stage_seconds_sum{rotulos} {soma!r}', f'{p}_stage_seconds_count{rotulos} {contagem}']
+            linhas += [f'# HELP {p}_downloaded_bytes_total Bytes baixados da LNB.',
+                       f'# TYPE {p}_downloaded_bytes_total counter']
+            linhas += [f'{p}_downloaded_bytes_total{_rotulos(league=liga, function=funcao)} {n}'
+                       for (liga, funcao), n in sorted(self._bytes.items())]
+            linhas += [f'# HELP {p}_cache_requests_total Páginas pedidas, por resultado do cache.',
+                       f'# TYPE {p}_cache_requests_total counter']
+            linhas += [f'{p}_cache_requests_total{_rotulos(league=liga, function=funcao, result=resultado)} {n}'
+                       for (liga, funcao, resultado), n in sorted(self._cache.items())]
+            linhas += [f'# HELP {p}_errors_total Chamadas que terminaram em erro.',
+                       f'# TYPE {p}_errors_total counter']
+            linhas += [f'{p}_errors_total{_rotulos(league=liga, function=funcao, error=erro)} {n}'
+                       for (liga, funcao, erro), n in sorted(self._erros.items())]
+        return '\n'.join(linhas) + '\n'
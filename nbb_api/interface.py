@@ -1,14 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
-import importlib
-
-# Força carregamento do parser html5lib se possível
-try:
-    importlib.import_module("html5lib")
-except ImportError:
-    messagebox.showerror("Erro", "Dependência 'html5lib' ausente. Instale com: pip install html5lib")
-    exit(1)
 
 from nbb_api import nbb, liga_ouro, ldb
 
@@ -1,7 +1,8 @@
-import pandas as pd
 import warnings
-import numpy as np
 from .strings import Strings
+from . import boxscores, bulk, fetch, frames, incremental, memo, parallel, planner, profiles, scores
+from .transport import ParseError
+from .validation import validate_choice as _validate_choice
 
 # Dicionários de suporte
 season_dict = {
@@ -39,30 +40,45 @@ def _validate_season(season):
 # CLASSIFICAÇÃO
 # ==========================================
 
-def get_classificacao(season):
+def _classificacao_request(season):
     _validate_season(season)
     url = f'https://lnb.com.br/ldb/temporada-{season}'
 
+    # Só há classificação publicada a partir de 2023
+    if season not in ["2023", "2024", "2025"]:
+        return None
+    if season == "2025":
+        url = 'https://lnb.com.br/ldb/'
+    return url, season != seasons[-1]
+
+
+def _classificacao_from_html(html, season):
     try:
-        if season in ["2023", "2024", "2025"]:
-          if season == "2025":
-              url = 'https://lnb.com.br/ldb/'
-          df = pd.read_html(url)[0]
-          df = df.iloc[::2].reset_index(drop=True)
-          df = df.dropna(how='all', axis=1)
-          df['EQUIPES'] = df['EQUIPES'].str[3:]
-          df['TEMPORADA'] = season
-          return df
-    except Exception:
-        print(msg_erro)
-        return pd.DataFrame(columns=['EQUIPES', 'TEMPORADA'])
+        df = fetch.parse_table(html)
+        df = df.iloc[::2].reset_index(drop=True)
+        df = df.dropna(how='all', axis=1)
+        df['EQUIPES'] = df['EQUIPES'].str[3:]
+        df['TEMPORADA'] = season
+        return df
+    except Exception as e:
+        raise ParseError(f'{msg_erro} ({e!r})') from e
+
+
+@frames.finalize('ldb', 'classificacao')
+@memo.memoize
+def get_classificacao(season):
+    pedido = _classificacao_request(season)
+    if pedido is None:
+        return None
+    url, finished = pedido
+    return _classificacao_from_html(fetch.get_html(url, finished), season)
 
 
 # ==========================================
 # ESTATÍSTICAS
 # ==========================================
 
-def get_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
+def _stats_request(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
     _validate_season(season)
 
     if fase not in fases:
@@ -87,8 +103,12 @@ def get_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
     url = (f'https://lnb.com.br/ldb/estatisticas/{categ}/?aggr={tipo}&type={quem}'
            f'&suffered_rule={sofrido_val}&season%5B%5D={season2}&phase{fase_encoded}')
 
+    return url, str(season) != seasons[-1]
+
+
+def _stats_from_html(html, season, quem):
     try:
-        df = pd.read_html(url)[0]
+        df = fetch.parse_table(html)
         if quem == 'athletes':
             df['Camisa'] = df['Jogador'].str.extract(r'#(\d+)$')
             df['Jogador'] = df['Jogador'].str.replace(r' #\d+$', '', regex=True)
@@ -96,16 +116,36 @@ def get_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
             df = df.drop(columns=['Pos.'])
         df['Temporada'] = season
         return df
-    except Exception:
-        print(msg_erro)
-        return pd.DataFrame(columns=['Jogador' if quem == 'athletes' else 'Equipe', 'Temporada'])
+    except Exception as e:
+        raise ParseError(f'{msg_erro} ({e!r})') from e
+
+
+@frames.finalize('ldb', 'stats')
+@memo.memoize
+def get_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
+    # Calcula a partir de páginas já em cache quando possível (média, total, equipes)
+    params = dict(season=season, fase=fase, categ=categ, tipo=tipo, quem=quem, sofrido=sofrido)
+    return planner.get_stats(params, _stats_request, _stats_from_html, fases)
+
+
+def _stats_pagina(season, fase, categ, tipo='avg', quem='athletes', sofrido=False):
+    url, finished = _stats_request(season, fase, categ, tipo, quem, sofrido)
+    return url, finished, (season, quem)
+
+
+@frames.finalize('ldb', 'profiles')
+def get_player_profiles(season, fase, tipo='avg', max_workers=None):
+    # Todas as categorias de estatísticas dos atletas, uma linha por jogador e equipe
+    _stats_request(season, fase, categs[0], tipo, 'athletes')  # valida antes de baixar
+    params = dict(season=season, fase=fase, tipo=tipo, quem='athletes')
+    return profiles.collect(get_stats, categs, params, max_workers)
 
 
 # ==========================================
 # PLACARES
 # ==========================================
 
-def get_placares(season, fase):
+def _placares_request(season, fase):
     _validate_season(season)
 
     if fase not in fases:
@@ -119,44 +159,96 @@ def get_placares(season, fase):
     else:
         url = f'https://lnb.com.br/ldb/tabela-de-jogos/?season%5B%5D={season2}'
 
+    return url, str(season) != seasons[-1]
+
+
+def _placares_from_html(html, season):
     try:
-        df = pd.read_html(url)[0]
-        df = df.dropna(how='all', axis=1)
+        return scores.normalize(fetch.parse_table(html), season)
+    except Exception as e:
+        raise ParseError(f'{msg_erro} ({e!r})') from e
+
+
+@frames.finalize('ldb', 'placares')
+@memo.memoize
+def get_placares(season, fase):
+    url, finished = _placares_request(season, fase)
+    return _placares_from_html(fetch.get_html(url, finished), season)
+
+
+def _placares_pagina(season, fase):
+    url, finished = _placares_request(season, fase)
+    return url, finished, (season,)
+
+
+def refresh_placares(season, fase='total'):
+    _placares_request(season, fase)  # valida antes de baixar
+    return incremental.refresh('ldb', season, fase, [fase], _placares_request, _placares_from_html)
+
+
+def get_boxscores(season, fase, max_workers=None):
+    # Box scores de todos os jogos com relatório: (jogadores, equipes)
+    url, finished = _placares_request(season, fase)
+    return boxscores.collect(boxscores.games(fetch.get_html(url, finished), season), max_workers)
+
+
+# ==========================================
+# CONSULTAS EM LOTE
+# ==========================================
+
+def _stats_grid(season, fase, categ, tipo, quem, sofrido):
+    grade = bulk.grid(season=season, fase=fase, categ=categ, tipo=tipo, quem=quem, sofrido=sofrido)
+
+    for valor in grade['season']:
+        _validate_choice(str(valor), seasons)
+    for nome, permitidos in [('fase', fases), ('categ', categs), ('tipo', tipos), ('quem', quems)]:
+        for valor in grade[nome]:
+            _validate_choice(valor, permitidos)
+    for valor in grade['sofrido']:
+        _validate_choice(valor, sofridos, is_boolean=True)
+
+    return bulk.combinations(grade)
+
+
+def _placares_grid(season, fase):
+    grade = bulk.grid(season=season, fase=fase)
+
+    for valor in grade['season']:
+        _validate_choice(str(valor), seasons)
+    for valor in grade['fase']:
+        _validate_choice(valor, fases)
+
+    return bulk.combinations(grade)
+
+
+def _stats_func(processes):
+    if not processes:
+        return get_stats
+    return frames.finalize('ldb', 'stats')(parallel.offload(_stats_pagina, _stats_from_html, processes))
+
+
+def _placares_func(processes):
+    if not processes:
+        return get_placares
+    return frames.finalize('ldb', 'placares')(parallel.offload(_placares_pagina, _placares_from_html, processes))
+
+
+def get_stats_many(season, fase, categ, tipo='avg', quem='athletes', sofrido=False, max_workers=None,
+                   processes=None):
+    combinacoes = _stats_grid(season, fase, categ, tipo, quem, sofrido)
+    return bulk.run(_stats_func(processes), combinacoes, max_workers or processes)
+
+
+def get_placares_many(season, fase, max_workers=None, processes=None):
+    return bulk.run(_placares_func(processes), _placares_grid(season, fase), max_workers or processes)
+
+
+def iter_stats(season, fase, categ, tipo='avg', quem='athletes', sofrido=False,
+               max_workers=None, max_pending=None, on_error=None, processes=None):
+    combinacoes = _stats_grid(season, fase, categ, tipo, quem, sofrido)
+    return bulk.iter_run(_stats_func(processes), combinacoes, max_workers or processes, max_pending, on_error)
 
-        # Tentativa de remoção de colunas extras
-        try:
-            df = df.drop(columns=['#', 'CASA', 'Unnamed: 15', 'GINÁSIO', 'RODADA'])
-        except KeyError:
-            try:
-                df = df.drop(columns=['#', 'CASA', 'Unnamed: 14', 'GINÁSIO', 'RODADA'])
-            except Exception:
-                pass  # Continua mesmo que não consiga
-
-        df['DATA'] = pd.to_datetime(df['DATA'], errors='coerce', format='%d/%m/%Y  %H:%M')
-
-        df = df.rename(columns={
-            'Unnamed: 3': Strings.equipe_casa,
-            'Unnamed: 7': Strings.equipe_visitante,
-            'Unnamed: 5': Strings.placar_raw,
-            'TRANSMISSÃO': 'GINASIO',
-            'FASE': 'RODADA',
-            'CAMPEONATO': 'FASE'
-        })
-
-        df[Strings.placar_raw] = df[Strings.placar_raw].str.replace('  VER RELATÓRIO', '')
-        df[Strings.placar_casa] = df[Strings.placar_raw].str.extract(r'^(\d+)')
-        df[Strings.placar_visitante] = df[Strings.placar_raw].str.extract(r'X (\d+)$')
-
-        df['VENCEDOR'] = np.where(df[Strings.placar_casa].astype(float) > df[Strings.placar_visitante].astype(float),
-                                  df[Strings.equipe_casa], df[Strings.equipe_visitante])
-        df['TEMPORADA'] = season
 
-        cols_final = ['DATA', 'EQUIPE CASA', 'PLACAR CASA', 'PLACAR VISITANTE',
-                      'EQUIPE VISITANTE', 'VENCEDOR', 'RODADA', 'FASE', 'GINASIO', 'TEMPORADA']
-        return df[[col for col in cols_final if col in df.columns]]
-    except Exception:
-        print(msg_erro)
-        return pd.DataFrame(columns=[
-            'DATA', 'EQUIPE CASA', 'PLACAR CASA', 'PLACAR VISITANTE',
-            'EQUIPE VISITANTE', 'VENCEDOR', 'RODADA', 'FASE', 'GINASIO', 'TEMPORADA'
-        ])
+def iter_placares(season, fase, max_workers=None, max_pending=None, on_error=None, processes=None):
+    return bulk.iter_run(_placares_func(processes), _placares_grid(season, fase),
+                         max_workers or processes, max_pending, on_error)
@@ -1,6 +1,6 @@
-import pandas as pd
-import numpy as np
-from .strings import Strings
+from . import boxscores, bulk, fetch, frames, incremental, memo, parallel, scores
+from .transport import ParseError
+from .validation import validate_choice as _validate_choice
 
 # Dicionários de suporte
 season_dict = {
@@ -25,7 +25,7 @@ msg_erro = "Erro ao carregar os dados da Liga Ouro. Verifique se a temporada est
 # ============================================================
 # Classificação
 # ============================================================
-def get_classificacao(season):
+def _classificacao_request(season):
     if str(season) not in seasons:
         raise ValueError(f"{season} não é um valor válido. Tente um de: " + ", ".join(seasons))
 
@@ -34,8 +34,12 @@ def get_classificacao(season):
     else:
       url = f'https://lnb.com.br/liga-ouro/liga-ouro-{season}'
 
+    return url, str(season) != seasons[-1]
+
+
+def _classificacao_from_html(html, season):
     try:
-        df = pd.read_html(url)[0]
+        df = fetch.parse_table(html)
         df = df.iloc[::2].reset_index(drop=True)
         df = df.dropna(how='all', axis=1)
 
@@ -43,15 +47,21 @@ def get_classificacao(season):
         df['TEMPORADA'] = season
 
         return df
-    except Exception:
-        print(msg_erro)
-        return pd.DataFrame(columns=['EQUIPES', 'TEMPORADA'])
+    except Exception as e:
+        raise ParseError(f'{msg_erro} ({e!r})') from e
+
+
+@frames.finalize('liga_ouro', 'classificacao')
+@memo.memoize
+def get_classificacao(season):
+    url, finished = _classificacao_request(season)
+    return _classificacao_from_html(fetch.get_html(url, finished), season)
 
 
 # ============================================================
 # Placar
 # ============================================================
-def get_placares(season, fase):
+def _placares_request(season, fase):
     if str(season) not in seasons:
         raise ValueError(f"{season} não é um valor válido. Tente um de: " + ", ".join(seasons))
     if fase not in fases:
@@ -68,54 +78,65 @@ def get_placares(season, fase):
     else:
         url = f'https://lnb.com.br/liga-ouro/tabela-de-jogos/?season%5B%5D={season2}'
 
+    return url, str(season) != seasons[-1]
+
+
+def _placares_from_html(html, season):
     try:
-        df = pd.read_html(url)[0]
-        df = df.dropna(how='all', axis=1)
+        return scores.normalize(fetch.parse_table(html), season)
+    except Exception as e:
+        raise ParseError(f'{msg_erro} ({e!r})') from e
 
-        # Tentativa de remover colunas extras que variam
-        try:
-            df = df.drop(columns=['#', 'CASA', 'Unnamed: 15', 'GINÁSIO', 'RODADA'])
-        except KeyError:
-            try:
-                df = df.drop(columns=['#', 'CASA', 'Unnamed: 14', 'GINÁSIO', 'RODADA'])
-            except Exception:
-                pass
 
-        df['DATA'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y  %H:%M', errors='coerce')
+@frames.finalize('liga_ouro', 'placares')
+@memo.memoize
+def get_placares(season, fase):
+    url, finished = _placares_request(season, fase)
+    return _placares_from_html(fetch.get_html(url, finished), season)
 
-        df = df.rename(columns={
-            'TRANSMISSÃO': 'GINASIO',
-            'FASE': 'RODADA',
-            'CAMPEONATO': 'FASE',
-            'Unnamed: 3': Strings.equipe_casa,
-            'Unnamed: 7': Strings.equipe_visitante,
-            'Unnamed: 5': Strings.placar_raw
-        })
 
-        df[Strings.placar_raw] = df[Strings.placar_raw].str.replace('  VER RELATÓRIO', '')
-        df[Strings.placar_casa] = df[Strings.placar_raw].str.extract(r'^(\d+)')
-        df[Strings.placar_visitante] = df[Strings.placar_raw].str.extract(r'X (\d+)$')
+def _placares_pagina(season, fase):
+    url, finished = _placares_request(season, fase)
+    return url, finished, (season,)
 
-        df[Strings.placar_casa] = pd.to_numeric(df[Strings.placar_casa], errors='coerce')
-        df[Strings.placar_visitante] = pd.to_numeric(df[Strings.placar_visitante], errors='coerce')
 
-        df['VENCEDOR'] = np.where(df[Strings.placar_casa] > df[Strings.placar_visitante],
-                                  df[Strings.equipe_casa], df[Strings.equipe_visitante])
+def refresh_placares(season, fase='total'):
+    _placares_request(season, fase)  # valida antes de baixar
+    # A tabela total é a soma das páginas da fase regular e dos playoffs
+    paginas = ['regular', 'playoffs'] if fase == 'total' else [fase]
+    return incremental.refresh('liga_ouro', season, fase, paginas, _placares_request, _placares_from_html)
 
-        df['VENCEDOR'] = df['VENCEDOR'].where(~df[Strings.placar_casa].isna())
 
-        df['TEMPORADA'] = season
+def get_boxscores(season, fase, max_workers=None):
+    # Box scores de todos os jogos com relatório: (jogadores, equipes)
+    url, finished = _placares_request(season, fase)
+    return boxscores.collect(boxscores.games(fetch.get_html(url, finished), season), max_workers)
+
+
+# ============================================================
+# Consultas em lote
+# ============================================================
+def _placares_grid(season, fase):
+    grade = bulk.grid(season=season, fase=fase)
+
+    for valor in grade['season']:
+        _validate_choice(str(valor), seasons)
+    for valor in grade['fase']:
+        _validate_choice(valor, fases)
+
+    return bulk.combinations(grade)
+
+
+def _placares_func(processes):
+    if not processes:
+        return get_placares
+    return frames.finalize('liga_ouro', 'placares')(parallel.offload(_placares_pagina, _placares_from_html, processes))
+
+
+def get_placares_many(season, fase, max_workers=None, processes=None):
+    return bulk.run(_placares_func(processes), _placares_grid(season, fase), max_workers or processes)
+
 
-        colunas_finais = [
-            'DATA', 'EQUIPE CASA', 'PLACAR CASA', 'PLACAR VISITANTE',
-            'EQUIPE VISITANTE', 'VENCEDOR', 'RODADA', 'FASE', 'GINASIO', 'TEMPORADA'
-        ]
-        return df[[col for col in colunas_finais if col in df.columns]]
-    except Exception:
-        print(msg_erro)
-        return pd.DataFrame(columns=[
-            'DATA', 'EQUIPE CASA', 'PLACAR CASA', 'PLACAR VISITANTE',
-            'EQUIPE VISITANTE', 'VENCEDOR', 'RODADA', 'FASE', 'GINASIO', 'TEMPORADA'
-        ])
-
-    return df
+def iter_placares(season, fase, max_workers=None, max_pending=None, on_error=None, processes=None):
+    return bulk.iter_run(_placares_func(processes), _placares_grid(season, fase),
+                         max_workers or processes, max_pending, on_error)
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import threading
+
+import pandas as pd
+
+from . import incremental, ldb, liga_ouro, nbb
+
+# Feed de jogos alterados para painéis ao vivo. Um único poller por
+# liga/temporada consulta a tabela de jogos (via refresh_placares) e entrega
+# só os jogos novos ou alterados a todos os assinantes, com callback ou
+# asyncio. O intervalo se adapta à tabela: curto enquanto há jogo em
+# andamento, e até `max_interval` quando não há nada marcado.
+min_interval = 30.0
+max_interval = 4 * 3600.0
+duracao_jogo = 3 * 3600.0  # por quanto tempo após o horário marcado um jogo pode estar em andamento
+timezone = 'America/Sao_Paulo'  # fuso dos horários da coluna DATA
+
+ligas = {'nbb': nbb, 'ldb': ldb, 'liga_ouro': liga_ouro}
+
+_pollers = {}
+_lock = threading.Lock()
+
+log = logging.getLogger('nbb_api')
+
+
+def configure(**kwargs):
+    opcoes = ('min_interval', 'max_interval', 'duracao_jogo', 'timezone')
+    for nome, valor in kwargs.items():
+        if nome not in opcoes:
+            raise ValueError(f'{nome} não é uma opção válida. Tente uma de: "' + '", "'.join(opcoes) + '".')
+        globals()[nome] = valor
+
+
+def _agora():
+    return pd.Timestamp.now(tz=timezone).tz_localize(None)
+
+
+def next_interval(tabela, agora=None):
+    if tabela is None or len(tabela) == 0:
+        return max_interval
+    agora = _agora() if agora is None else agora
+    datas = tabela['DATA']
+    pendentes = tabela['VENCEDOR'].isna()
+    # Jogo que já começou e ainda não tem vencedor: acompanha de perto. Depois
+    # de `duracao_jogo` sem resultado (adiado, por exemplo) deixa de contar
+    em_andamento = pendentes & (datas <= agora) & (datas + pd.Timedelta(seconds=duracao_jogo) >= agora)
+    if em_andamento.any():
+        return min_interval
+    proximos = datas[pendentes & (datas > agora)]
+    if len(proximos) == 0:
+        return max_interval
+    return min(max_interval, max(min_interval, (proximos.min() - agora).total_seconds()))
+
+
+class _Poller:
+    def __init__(self, liga, season):
+        self.liga = liga
+        self.season = season
+        self.tabela = None
+        self.erro = None
+        self._assinantes = []
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._rodar, name=f'nbb_api-live-{liga}-{season}', daemon=True)
+
+    def assinar(self, entregar):
+        # Devolve a tabela atual, que quem chega depois recebe como primeiro evento
+        with self._lock:
+            self._assinantes.append(entregar)
+            return self.tabela
+
+    def cancelar(self, entregar):
+        with self._lock:
+            if entregar in self._assinantes:
+                self._assinantes.remove(entregar)
+            return len(self._assinantes)
+
+    def parar(self):
+        self._parar.set()
+
+    def _consultar(self):
+        tabela, _ = ligas[self.liga].refresh_placares(self.season)
+        # A comparação é com a última tabela deste poller: outras chamadas a
+        # refresh_placares não "roubam" as alterações dos assinantes
+        alterados = incremental.changed_rows(self.tabela, tabela)
+        with self._lock:
+            self.tabela = tabela
+            assinantes = list(self._assinantes)
+        if len(alterados):
+            for entregar in assinantes:
+                _entregar(entregar, alterados)
+
+    def _rodar(self):
+        while not self._parar.is_set():
+            try:
+                self._consultar()
+                self.erro = None
+                espera = next_interval(self.tabela)
+            except Exception as erro:
+                self.erro = erro
+                espera = min_interval
+            self._parar.wait(espera)
+
+
+def _entregar(entregar, tabela):
+    # Um assinante com defeito não impede os outros de receber a alteração
+    try:
+        entregar(tabela)
+    except Exception:
+        log.exception('Erro ao entregar jogos alterados para %r', entregar)
+
+
+def _assinar(liga, season, entregar):
+    # Inscreve com o _lock: um _sair simultâneo não pode parar o poller no meio
+    with _lock:
+        poller = _pollers.get((liga, season))
+        if poller is None:
+            poller = _pollers[(liga, season)] = _Poller(liga, season)
+            poller._thread.start()
+        tabela = poller.assinar(entregar)
+    if tabela is not None:
+        _entregar(entregar, tabela)
+    return poller
+
+
+def _sair(poller, entregar):
+    with _lock:
+        if poller.cancelar(entregar) == 0 and _pollers.get((poller.liga, poller.season)) is poller:
+            del _pollers[(poller.liga, poller.season)]
+            poller.parar()
+
+
+class Subscription:
+    def __init__(self, liga, season, callback):
+        self._callback = callback
+        self._poller = _assinar(liga, season, callback)
+
+    def close(self):
+        _sair(self._poller, self._callback)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSubscription:
+    # Iterador assíncrono: `async for alterados in live.watch(...)`
+    def __init__(self, liga, season):
+        self._liga = liga
+        self._season = season
+        self._poller = None
+        self._fila = None
+        self._loop = None
+
+    def _entregar(self, alterados):
+        self._loop.call_soon_threadsafe(self._fila.put_nowait, alterados)
+
+    def __aiter__(self):
+        if self._fila is None:
+            self._loop = asyncio.get_running_loop()
+            self._fila = asyncio.Queue()
+            self._poller = _assinar(self._liga, self._season, self._entregar)
+        return self
+
+    async def __anext__(self):
+        self.__aiter__()
+        return await self._fila.get()
+
+    def close(self):
+        if self._fila is not None:
+            _sair(self._poller, self._entregar)
+
+    async def __aenter__(self):
+        return self.__aiter__()
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+def watch(league='nbb', season=None, callback=None):
+    modulo = ligas[league] if league in ligas else None
+    if modulo is None:
+        raise ValueError(f'{league} não é um valor válido. Tente um de: "' + '", "'.join(ligas) + '".')
+    season = str(season if season is not None else modulo.seasons[-1])
+    if season not in [str(s) for s in modulo.seasons]:
+        raise ValueError(f'{season} não é um valor válido. Tente um de: "' + '", "'.join(modulo.seasons) + '".')
+
+    if callback is not None:
+        return Subscription(league, season, callback)
+    return AsyncSubscription(league, season)
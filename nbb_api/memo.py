@@ -0,0 +1,173 @@
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from . import cache, frames, scheduler
+
+# Memoização em memória dos DataFrames já processados pelas funções get_*.
+# Desativada por padrão; o orçamento é medido com memory_usage(deep=True) e,
+# quando estourado, as entradas usadas há mais tempo são descartadas.
+# Tabelas que dependem de páginas da temporada em andamento expiram depois
+# de cache.ttl_temporada_atual segundos, como no cache de HTML.
+# Mesmo desativada, chamadas idênticas simultâneas são feitas uma vez só.
+_max_bytes = 256 * 1024 * 1024
+
+_ativo = False
+_entradas = OrderedDict()  # chave -> (DataFrame, bytes, expira); expira=None: nunca
+_bytes = 0
+_lock = threading.RLock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_calculo = contextvars.ContextVar('nbb_api_memo_calculo', default=None)
+
+
+def configure(max_bytes=None):
+    global _ativo, _max_bytes
+    with _lock:
+        if max_bytes is not None:
+            _max_bytes = int(max_bytes)
+        _ativo = True
+        _evict()
+
+
+def enable():
+    configure()
+
+
+def disable():
+    global _ativo
+    _ativo = False
+    clear()
+
+
+def enabled():
+    return _ativo
+
+
+def clear():
+    global _bytes
+    with _lock:
+        _entradas.clear()
+        _bytes = 0
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_entradas), bytes=_bytes, max_bytes=_max_bytes)
+
+
+def reset_stats():
+    with _lock:
+        for k in _stats:
+            _stats[k] = 0
+
+
+def _evict():
+    global _bytes
+    while _entradas and _bytes > _max_bytes:
+        _, (_, tamanho, _) = _entradas.popitem(last=False)
+        _bytes -= tamanho
+        _stats['evictions'] += 1
+
+
+def _chave(func, assinatura, args, kwargs):
+    try:
+        ligados = assinatura.bind(*args, **kwargs)
+        ligados.apply_defaults()
+        chave = (func.__module__, func.__name__) + tuple(ligados.arguments.items())
+        hash(chave)
+        return chave
+    except TypeError:
+        return None
+
+
+def mark_unfinished():
+    # Chamado por quem lê uma página da temporada em andamento: a tabela que
+    # está sendo calculada não pode ficar na memória para sempre
+    estado = _calculo.get()
+    if estado is not None:
+        estado['aberta'] = True
+
+
+def lookup(chave):
+    global _bytes
+    with _lock:
+        item = _entradas.get(chave)
+        if item is None:
+            return None
+        df, tamanho, expira = item
+        if expira is not None and time.monotonic() >= expira:
+            del _entradas[chave]
+            _bytes -= tamanho
+            return None
+        _entradas.move_to_end(chave)
+    if expira is not None:
+        mark_unfinished()
+    return df
+
+
+def store(chave, df, finished=True):
+    global _bytes
+    # Tabelas vazias costumam ser falhas de carregamento: não vale a pena guardar
+    if len(df) == 0:
+        return
+    tamanho = int(df.memory_usage(deep=True).sum())
+    if tamanho > _max_bytes:
+        return
+    expira = None if finished else time.monotonic() + cache.ttl_temporada_atual
+    with _lock:
+        antigo = _entradas.pop(chave, None)
+        if antigo is not None:
+            _bytes -= antigo[1]
+        _entradas[chave] = (df, tamanho, expira)
+        _bytes += tamanho
+        _evict()
+
+
+def _calcular(func, args, kwargs):
+    # Devolve (DataFrame, finished): finished=False se alguma página lida
+    # pertence à temporada em andamento
+    estado = {'aberta': False}
+    token = _calculo.set(estado)
+    try:
+        df = func(*args, **kwargs)
+    finally:
+        _calculo.reset(token)
+    if estado['aberta']:
+        mark_unfinished()  # vale também para a chamada memoizada de fora, se houver
+    return df, not estado['aberta']
+
+
+def memoize(func):
+    assinatura = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        chave = _chave(func, assinatura, args, kwargs)
+        if chave is None:
+            return func(*args, **kwargs)
+
+        if _ativo:
+            df = lookup(chave)
+            with _lock:
+                _stats['hits' if df is not None else 'misses'] += 1
+            if df is not None:
+                frames.reused()
+                return df.copy()
+
+        # Chamadas idênticas ao mesmo tempo dividem um só download e parse.
+        # Só chega aqui o que passou pela validação da própria função
+        (df, finished), dono = scheduler.shared(chave, lambda: _calcular(func, args, kwargs))
+        if df is None:
+            return None
+        if not dono:
+            frames.reused()
+        if not _ativo:
+            return df if dono else df.copy()
+        if dono:
+            store(chave, df, finished)
+        return df.copy()
+
+    return wrapper
@@ -1,6 +1,5 @@
-import pandas as pd
-import numpy as np
-from .strings import Strings
+from . import boxscores, bulk, fetch, frames, incremental, memo, parallel, planner, profiles, scores
+from .validation import validate_choice as _validate_choice
 
 season_dict = {
     '2008-09': '1', '2009-10': '2', '2010-11': '3', '2011-12': '4',
@@ -29,14 +28,7 @@ quems = ['athletes', 'teams']
 sofridos = [True, False]
 mandantes = list(mandante_dict.keys())
 
-def _validate_choice(value, allowed, is_boolean=False):
-    if value not in allowed:
-        if is_boolean:
-            raise ValueError(str(value) + Strings.error_valor_invalido_boolean)
-        allowed_str = '", "'.join(allowed)
-        raise ValueError(f'{value}{Strings.erro_valor_invalido}"{allowed_str}".')
-
-def get_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False):
+def _stats_request(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False):
     _validate_choice(season, seasons)
     _validate_choice(fase, fases)
     _validate_choice(categ, categs)
@@ -52,7 +44,11 @@ def get_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos'
         f"&wherePlaying={mandante_dict[mandante]}"
     )
 
-    df = pd.read_html(url)[0]
+    return url, season != seasons[-1]
+
+
+def _stats_from_html(html, season, quem):
+    df = fetch.parse_table(html)
 
     if quem == 'athletes':
         df[['Jogador', 'Camisa']] = df['Jogador'].str.extract(r"(.+?)\s+#(\d+)", expand=True)
@@ -63,7 +59,28 @@ def get_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos'
     return df
 
 
-def get_classificacao(season):
+@frames.finalize('nbb', 'stats')
+@memo.memoize
+def get_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False):
+    # Calcula a partir de páginas já em cache quando possível (média, total, equipes)
+    params = dict(season=season, fase=fase, categ=categ, tipo=tipo, quem=quem, mandante=mandante, sofrido=sofrido)
+    return planner.get_stats(params, _stats_request, _stats_from_html, fases)
+
+
+def _stats_pagina(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False):
+    url, finished = _stats_request(season, fase, categ, tipo, quem, mandante, sofrido)
+    return url, finished, (season, quem)
+
+
+@frames.finalize('nbb', 'profiles')
+def get_player_profiles(season, fase, tipo='avg', mandante='ambos', max_workers=None):
+    # Todas as categorias de estatísticas dos atletas, uma linha por jogador e equipe
+    _stats_request(season, fase, categs[0], tipo, 'athletes', mandante)  # valida antes de baixar
+    params = dict(season=season, fase=fase, tipo=tipo, quem='athletes', mandante=mandante)
+    return profiles.collect(get_stats, categs, params, max_workers)
+
+
+def _classificacao_request(season):
     _validate_choice(season, seasons_classification)
 
     start, end = season.split('-')        # e.g. ["2023","24"]
@@ -72,7 +89,11 @@ def get_classificacao(season):
 
     url = f"https://lnb.com.br/nbb/{season_url}"
 
-    df = pd.read_html(url)[0]
+    return url, season != seasons_classification[-1]
+
+
+def _classificacao_from_html(html, season):
+    df = fetch.parse_table(html)
 
     df = df.iloc[::2].reset_index(drop=True)
     df = df.dropna(how='all', axis=1)
@@ -82,7 +103,14 @@ def get_classificacao(season):
     return df
 
 
-def get_placares(season, fase):
+@frames.finalize('nbb', 'classificacao')
+@memo.memoize
+def get_classificacao(season):
+    url, finished = _classificacao_request(season)
+    return _classificacao_from_html(fetch.get_html(url, finished), season)
+
+
+def _placares_request(season, fase):
     _validate_choice(season, seasons)
     _validate_choice(fase, fases)
 
@@ -94,50 +122,91 @@ def get_placares(season, fase):
         + (f"&phase{fase_code}" if fase != 'total' else "")
     )
 
-    df = pd.read_html(url)[0]
+    return url, season != seasons[-1]
 
-    try:
-        drop_cols = ['#', 'CASA', 'Unnamed: 15', 'GINÁSIO', 'RODADA']
-        if season == '2008-09':
-            drop_cols[2] = 'Unnamed: 14'
-        df = df.drop(columns=drop_cols, errors='ignore')
-        df = df.dropna(how='all', axis=1)
-    except Exception:
-        raise ValueError("Erro ao processar a tabela. Pode ser que os dados ainda não estejam disponíveis.")
 
-    df['DATA'] = pd.to_datetime(df['DATA'], format='%d/%m/%Y  %H:%M', errors='coerce')
+def _placares_from_html(html, season):
+    return scores.normalize(fetch.parse_table(html), season)
 
-    df = df.rename(columns={
-        'TRANSMISSÃO': 'GINASIO',
-        'FASE': 'RODADA',
-        'CAMPEONATO': 'FASE',
-        'Unnamed: 3': Strings.equipe_casa,
-        'Unnamed: 7': Strings.equipe_visitante
-    })
 
-    df[Strings.unnamed_5] = df[Strings.unnamed_5].str.replace('  VER RELATÓRIO', '', regex=False)
-    df[Strings.placar_casa] = df[Strings.unnamed_5].str[:2]
-    df[Strings.placar_visitante] = df[Strings.unnamed_5].str[-2:]
+@frames.finalize('nbb', 'placares')
+@memo.memoize
+def get_placares(season, fase):
+    url, finished = _placares_request(season, fase)
+    return _placares_from_html(fetch.get_html(url, finished), season)
 
-    df[Strings.placar_casa] = pd.to_numeric(df[Strings.placar_casa], errors='coerce')
-    df[Strings.placar_visitante] = pd.to_numeric(df[Strings.placar_visitante], errors='coerce')
 
-    df['VENCEDOR'] = np.where(
-        df[Strings.placar_casa] > df[Strings.placar_visitante], df[Strings.equipe_casa], df[Strings.equipe_visitante]
-    )
-    df['VENCEDOR'] = df.apply(
-        lambda row: np.nan if pd.isna(row[Strings.placar_casa]) or pd.isna(row[Strings.placar_visitante]) else row['VENCEDOR'],
-        axis=1
-    )
+def _placares_pagina(season, fase):
+    url, finished = _placares_request(season, fase)
+    return url, finished, (season,)
 
-    df = df.drop(columns=[Strings.unnamed_5], errors='ignore')
-    df['TEMPORADA'] = season
-    
-    if season!='2008-09':
-        df = df[['DATA',Strings.equipe_casa,Strings.placar_casa,Strings.placar_visitante,Strings.equipe_visitante,
-                 'VENCEDOR','RODADA','FASE','GINASIO','TEMPORADA']]
-    else:
-        df = df[['DATA',Strings.equipe_casa,Strings.placar_casa,Strings.placar_visitante,Strings.equipe_visitante,
-             'VENCEDOR','RODADA','FASE','TEMPORADA']]
-        
-    return df
+
+def refresh_placares(season, fase='total'):
+    _placares_request(season, fase)  # valida antes de baixar
+    # A tabela total é a soma das páginas da fase regular e dos playoffs
+    paginas = ['regular', 'playoffs'] if fase == 'total' else [fase]
+    return incremental.refresh('nbb', season, fase, paginas, _placares_request, _placares_from_html)
+
+
+def get_boxscores(season, fase, max_workers=None):
+    # Box scores de todos os jogos com relatório: (jogadores, equipes)
+    url, finished = _placares_request(season, fase)
+    return boxscores.collect(boxscores.games(fetch.get_html(url, finished), season), max_workers)
+
+
+def _stats_grid(season, fase, categ, tipo, quem, mandante, sofrido):
+    grade = bulk.grid(season=season, fase=fase, categ=categ, tipo=tipo, quem=quem,
+                      mandante=mandante, sofrido=sofrido)
+
+    for nome, permitidos in [('season', seasons), ('fase', fases), ('categ', categs), ('tipo', tipos),
+                             ('quem', quems), ('mandante', mandantes)]:
+        for valor in grade[nome]:
+            _validate_choice(valor, permitidos)
+    for valor in grade['sofrido']:
+        _validate_choice(valor, sofridos, is_boolean=True)
+
+    return bulk.combinations(grade)
+
+
+def _placares_grid(season, fase):
+    grade = bulk.grid(season=season, fase=fase)
+
+    for valor in grade['season']:
+        _validate_choice(valor, seasons)
+    for valor in grade['fase']:
+        _validate_choice(valor, fases)
+
+    return bulk.combinations(grade)
+
+
+def _stats_func(processes):
+    if not processes:
+        return get_stats
+    return frames.finalize('nbb', 'stats')(parallel.offload(_stats_pagina, _stats_from_html, processes))
+
+
+def _placares_func(processes):
+    if not processes:
+        return get_placares
+    return frames.finalize('nbb', 'placares')(parallel.offload(_placares_pagina, _placares_from_html, processes))
+
+
+def get_stats_many(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False,
+                   max_workers=None, processes=None):
+    combinacoes = _stats_grid(season, fase, categ, tipo, quem, mandante, sofrido)
+    return bulk.run(_stats_func(processes), combinacoes, max_workers or processes)
+
+
+def get_placares_many(season, fase, max_workers=None, processes=None):
+    return bulk.run(_placares_func(processes), _placares_grid(season, fase), max_workers or processes)
+
+
+def iter_stats(season, fase, categ, tipo='avg', quem='athletes', mandante='ambos', sofrido=False,
+               max_workers=None, max_pending=None, on_error=None, processes=None):
+    combinacoes = _stats_grid(season, fase, categ, tipo, quem, mandante, sofrido)
+    return bulk.iter_run(_stats_func(processes), combinacoes, max_workers or processes, max_pending, on_error)
+
+
+def iter_placares(season, fase, max_workers=None, max_pending=None, on_error=None, processes=None):
+    return bulk.iter_run(_placares_func(processes), _placares_grid(season, fase),
+                         max_workers or processes, max_pending, on_error)
@@ -0,0 +1,143 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from . import fetch
+
+# Etapa de parse em processos separados. O parse das páginas da LNB segura a
+# GIL quase o tempo todo, então mais threads não ajudam: com `processes` as
+# funções *_many e iter_* continuam baixando em threads, mas mandam o HTML
+# cru (bytes) para um pool de processos, que devolve o DataFrame já
+# processado em forma colunar compacta (arrays numpy; colunas de texto viram
+# códigos int32 + valores únicos) para reduzir o custo de transferência.
+processes = os.cpu_count() or 1
+
+# "spawn" evita fazer fork de um processo com as threads de download ativas
+start_method = 'spawn'
+
+# Um pool por tamanho: quem pede outro `processes` não derruba o pool que
+# outra chamada ainda está usando
+_executores = {}  # processos -> ProcessPoolExecutor
+_lock = threading.Lock()
+
+
+def configure(processes=None, start_method=None):
+    opcoes = {'processes': processes, 'start_method': start_method}
+    for nome, valor in opcoes.items():
+        if valor is not None:
+            globals()[nome] = valor
+    shutdown()
+
+
+def _pool(processos=None):
+    processos = processos or processes
+    with _lock:
+        executor = _executores.get(processos)
+        if executor is None:
+            contexto = multiprocessing.get_context(start_method)
+            executor = _executores[processos] = ProcessPoolExecutor(max_workers=processos, mp_context=contexto)
+        return executor
+
+
+def _descartar(executor):
+    # Pool quebrado (um processo morreu): a próxima chamada cria outro
+    with _lock:
+        tamanhos = [processos for processos, atual in _executores.items() if atual is executor]
+        for processos in tamanhos:
+            del _executores[processos]
+    if tamanhos:
+        executor.shutdown(wait=False)
+
+
+def shutdown(wait=True):
+    with _lock:
+        executores = list(_executores.values())
+        _executores.clear()
+    for executor in executores:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown, wait=False)
+
+
+def _compactar(df):
+    colunas = []
+    for i, nome in enumerate(df.columns):
+        serie = df.iloc[:, i]
+        if serie.dtype.kind in 'biufcmM' and isinstance(serie.dtype, np.dtype):
+            colunas.append((nome, serie.dtype, None, serie.to_numpy()))
+        else:
+            # Texto se repete muito (equipes, fases...): só os valores únicos viajam
+            codigos, valores = pd.factorize(serie.to_numpy(dtype=object))
+            colunas.append((nome, serie.dtype, np.asarray(valores, dtype=object), codigos.astype(np.int32)))
+
+    indice = df.index
+    if isinstance(indice, pd.RangeIndex):
+        indice = (indice.start, indice.stop, indice.step)
+    return colunas, indice, len(df)
+
+
+def _expandir(compactado):
+    colunas, indice, tamanho = compactado
+    if isinstance(indice, tuple):
+        indice = pd.RangeIndex(*indice)
+
+    # Chaves por posição: a tabela pode ter colunas com o mesmo nome
+    dados = {}
+    for i, (nome, dtype, valores, codigos) in enumerate(colunas):
+        if valores is None:
+            dados[i] = pd.Series(codigos, index=indice, dtype=dtype, copy=False)
+        else:
+            coluna = np.full(tamanho, np.nan, dtype=object)
+            presentes = codigos >= 0
+            coluna[presentes] = valores[codigos[presentes]]
+            dados[i] = pd.Series(coluna, index=indice, dtype=dtype)
+
+    df = pd.DataFrame(dados, index=indice)
+    df.columns = [nome for nome, *_ in colunas]
+    return df
+
+
+def _trabalho(from_html, html, args):
+    return _compactar(from_html(html.decode('utf-8'), *args))
+
+
+def parse(from_html, html, args=(), processes=None):
+    executor = _pool(processes)
+    try:
+        return _expandir(executor.submit(_trabalho, from_html, html.encode('utf-8'), tuple(args)).result())
+    except BrokenProcessPool:
+        _descartar(executor)
+        raise
+
+
+def parse_many(from_html, paginas, processes=None, chunksize=1):
+    # paginas: iterável de (html, args); devolve os DataFrames na mesma ordem
+    itens = [(html.encode('utf-8'), tuple(args)) for html, args in paginas]
+    executor = _pool(processes)
+    try:
+        resultados = list(executor.map(_trabalho, [from_html] * len(itens),
+                                       [html for html, _ in itens], [args for _, args in itens],
+                                       chunksize=chunksize))
+    except BrokenProcessPool:
+        _descartar(executor)
+        raise
+    return [_expandir(r) for r in resultados]
+
+
+def offload(pagina, from_html, processes=None):
+    # Função com a mesma assinatura de get_*: baixa a página na thread atual
+    # (ou lê do cache) e faz o parse num processo do pool
+    def func(**params):
+        url, finished, args = pagina(**params)
+        return parse(from_html, fetch.get_html(url, finished), args, processes)
+
+    # Mesmo nome da função get_* equivalente (_stats_from_html -> get_stats)
+    func.__name__ = 'get_' + from_html.__name__.strip('_').removesuffix('_from_html')
+    return func
@@ -0,0 +1,185 @@
+import io
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+# Extrator das tabelas da LNB (estatísticas, classificação e jogos): lê só a
+# primeira <table> da página com lxml e tipa cada coluna numa única passada,
+# devolvendo o mesmo DataFrame que pd.read_html(...)[0]. Qualquer marcação
+# fora do padrão simples dessas tabelas (colspan/rowspan, tabelas aninhadas,
+# cabeçalho em várias linhas...) cai no pd.read_html.
+
+_ESPACOS = re.compile(r"[\r\n]+|\s{2,}")
+_QUALQUER_TEXTO = re.compile('.+')
+_MILHAR = re.compile(r"^[\-\+]?[0-9]*(,[0-9]{3})*(\.[0-9]*)?([0-9]?(E|e)\-?[0-9]+)?$")
+_INTEIRO = re.compile(r'^[+-]?[0-9]+$')
+_DECIMAL = re.compile(r'^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$')
+_BOOLEANOS = frozenset(['True', 'TRUE', 'true', 'False', 'FALSE', 'false'])
+_CELULAS = ('td', 'th')
+
+# Mesmos valores que o pandas trata como ausentes por padrão
+_NA = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+
+class UnsupportedMarkup(ValueError):
+    pass
+
+
+def _texto(celula):
+    # Célula sem filhos (o caso comum) dispensa percorrer a subárvore
+    texto = (celula.text or '') if len(celula) == 0 else ''.join(celula.itertext())
+    return _ESPACOS.sub(' ', texto.strip())
+
+
+def _celulas(linha):
+    return [filho for filho in linha if filho.tag in _CELULAS]
+
+
+def _primeira_tabela(html):
+    # O documento é lido só até o fim da primeira tabela com texto: o resto
+    # da página (menus, rodapé, outras tabelas) nem chega a virar árvore
+    dados = io.BytesIO(html.encode('utf-8'))
+    try:
+        for _, tabela in etree.iterparse(dados, events=('end',), tag='table', html=True,
+                                         encoding='utf-8', recover=True):
+            if 'display:none' in tabela.get('style', '').replace(' ', ''):
+                continue
+            if any(_QUALQUER_TEXTO.search(t) for t in tabela.itertext()):
+                if any(ancestral.tag == 'table' for ancestral in tabela.iterancestors()):
+                    raise UnsupportedMarkup('Tabela aninhada')
+                return tabela
+    except etree.LxmlError as e:
+        raise UnsupportedMarkup(str(e)) from e
+    raise UnsupportedMarkup('Nenhuma tabela encontrada')
+
+
+def _remover_ocultos(tabela):
+    for elem in tabela.xpath('.//style'):
+        elem.drop_tree()
+    for elem in tabela.xpath('.//*[@style]'):
+        if 'display:none' in elem.get('style', '').replace(' ', ''):
+            elem.drop_tree()
+
+
+def _linhas(tabela):
+    if tabela.find('.//table') is not None:
+        raise UnsupportedMarkup('Tabela aninhada')
+
+    _remover_ocultos(tabela)
+
+    for celula in tabela.xpath('.//td[@colspan or @rowspan]|.//th[@colspan or @rowspan]'):
+        if celula.get('colspan', '1').strip() != '1' or celula.get('rowspan', '1').strip() != '1':
+            raise UnsupportedMarkup('colspan/rowspan')
+
+    cabecalho = []
+    for thead in tabela.xpath('.//thead'):
+        cabecalho.extend(thead.xpath('./tr'))
+        if _celulas(thead):
+            cabecalho.append(thead)
+    corpo = tabela.xpath('.//tbody//tr') + tabela.xpath('./tr')
+    rodape = tabela.xpath('.//tfoot//tr')
+
+    if not cabecalho:
+        while corpo and all(c.tag == 'th' for c in _celulas(corpo[0])):
+            cabecalho.append(corpo.pop(0))
+    if len(cabecalho) != 1:
+        raise UnsupportedMarkup('Cabeçalho com %d linhas' % len(cabecalho))
+
+    linhas = [[_texto(c) for c in _celulas(tr)] for tr in cabecalho + corpo + rodape]
+    largura = max(len(linha) for linha in linhas)
+    if largura < 2:
+        raise UnsupportedMarkup('Tabela com uma coluna')
+    for linha in linhas:
+        linha.extend([''] * (largura - len(linha)))
+    if len(linhas) < 2:
+        raise UnsupportedMarkup('Tabela sem linhas')
+    return linhas[0], linhas[1:]
+
+
+def _nomes(cabecalho):
+    nomes = [nome if nome else f'Unnamed: {i}' for i, nome in enumerate(cabecalho)]
+    # Colunas repetidas ganham sufixos ".1", ".2"... como no pandas
+    contagem = defaultdict(int)
+    for i, nome in enumerate(nomes):
+        atual = contagem[nome]
+        while atual > 0:
+            contagem[nome] = atual + 1
+            nome = f'{nome}.{atual}'
+            atual = contagem[nome]
+        nomes[i] = nome
+        contagem[nome] = atual + 1
+    return nomes
+
+
+def _coluna(valores):
+    # O separador de milhar sai antes da inferência, mesmo em colunas de texto
+    valores = [v.replace(',', '') if ',' in v and _MILHAR.match(v) else v for v in valores]
+    ausentes = [v in _NA for v in valores]
+    presentes = [v for v, na in zip(valores, ausentes) if not na]
+
+    if not presentes:
+        return np.full(len(valores), np.nan)
+
+    if all(_INTEIRO.match(v) for v in presentes):
+        tipo = np.int64 if len(presentes) == len(valores) else np.float64
+    elif all(_DECIMAL.match(v) for v in presentes):
+        tipo = np.float64
+    elif all(v in _BOOLEANOS for v in presentes):
+        if len(presentes) != len(valores):
+            raise UnsupportedMarkup('Coluna booleana com valores ausentes')
+        return np.array([v.lower() == 'true' for v in presentes])
+    else:
+        return [np.nan if na else v for v, na in zip(valores, ausentes)]
+
+    numeros = np.asarray(presentes).astype(tipo)
+    if tipo is np.int64 or len(presentes) == len(valores):
+        return numeros
+    coluna = np.full(len(valores), np.nan)
+    coluna[~np.array(ausentes)] = numeros
+    return coluna
+
+
+def extract_table(html):
+    tabela = _primeira_tabela(html)
+    for br in tabela.iter('br'):
+        br.tail = '\n' + (br.tail or '')
+
+    cabecalho, linhas = _linhas(tabela)
+    nomes = _nomes(cabecalho)
+    colunas = [_coluna(list(valores)) for valores in zip(*linhas)]
+    return pd.DataFrame(dict(zip(nomes, colunas)))
+
+
+def row_links(html, texto):
+    # Para cada linha de dados da primeira tabela (as mesmas linhas que
+    # extract_table devolve), o href do primeiro link cujo texto contém
+    # `texto`, ou None
+    tabela = _primeira_tabela(html)
+    _remover_ocultos(tabela)
+    corpo = tabela.xpath('.//tbody//tr') + tabela.xpath('./tr')
+    if not tabela.xpath('.//thead'):
+        while corpo and all(c.tag == 'th' for c in _celulas(corpo[0])):
+            corpo.pop(0)
+    texto = texto.lower()
+    links = []
+    for tr in corpo + tabela.xpath('.//tfoot//tr'):
+        href = None
+        for a in tr.iter('a'):
+            if texto in ''.join(a.itertext()).lower() and a.get('href'):
+                href = a.get('href').strip()
+                break
+        links.append(href)
+    return links
+
+
+def read_table(html):
+    try:
+        return extract_table(html)
+    except (UnsupportedMarkup, OverflowError):
+        return pd.read_html(io.StringIO(html))[0]
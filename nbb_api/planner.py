@@ -0,0 +1,173 @@
+import threading
+
+import pandas as pd
+
+from . import cache, fetch, memo
+
+# Planejador das consultas de get_stats (desativado por padrão): antes de
+# baixar uma página, verifica se o resultado pode ser calculado a partir de
+# páginas que já estão no cache de HTML:
+#   - tipo='avg' é tipo='sum' dividido pela coluna de jogos (JO), com as
+#     médias arredondadas em `casas_decimais`;
+#   - fase='total' é regular + playoffs, para estatísticas somadas;
+#   - quem='teams' (sem sofrido) é a soma das linhas dos atletas da equipe,
+#     mas só sem a coluna JO: os jogos da equipe não saem dos atletas.
+# As regras se encadeiam. As linhas derivadas seguem a ordenação da página
+# de origem (a coluna pela qual ela está em ordem decrescente). Só vai para
+# a rede quando nenhuma combinação de páginas em cache resolve a consulta.
+casas_decimais = 1
+
+_ativo = False
+_lock = threading.Lock()
+_stats = {'derived': 0, 'fetched': 0}
+
+_CHAVES = {'athletes': ['Jogador', 'Camisa', 'Equipe'], 'teams': ['Equipe']}
+_FIXAS = {'JO', 'Temporada'}
+
+
+def configure(**kwargs):
+    opcoes = ('casas_decimais',)
+    for nome, valor in kwargs.items():
+        if nome not in opcoes:
+            raise ValueError(f'{nome} não é uma opção válida. Tente uma de: "' + '", "'.join(opcoes) + '".')
+        globals()[nome] = valor
+
+
+def enable():
+    global _ativo
+    _ativo = True
+
+
+def disable():
+    global _ativo
+    _ativo = False
+
+
+def enabled():
+    return _ativo
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _lock:
+        for k in _stats:
+            _stats[k] = 0
+
+
+def _contar(nome):
+    with _lock:
+        _stats[nome] += 1
+
+
+def _somaveis(df, chaves):
+    # Colunas numéricas que podem ser somadas; percentuais não podem
+    colunas = [c for c in df.columns if c not in chaves and c not in _FIXAS
+               and pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    if any('%' in str(c) for c in colunas):
+        return None
+    return colunas
+
+
+def _ordenacao(df):
+    # Coluna pela qual a página está em ordem decrescente (o ranking do site)
+    for coluna in df.columns:
+        if coluna in _FIXAS or not pd.api.types.is_numeric_dtype(df[coluna]) or pd.api.types.is_bool_dtype(df[coluna]):
+            continue
+        if df[coluna].is_monotonic_decreasing:
+            return coluna
+    return None
+
+
+def _ordenar(df, origem):
+    coluna = _ordenacao(origem)
+    if coluna is None or coluna not in df.columns:
+        return df
+    return df.sort_values(coluna, ascending=False, kind='stable', ignore_index=True)
+
+
+def _media(soma):
+    if 'JO' not in soma.columns:
+        return None
+    df = soma.copy()
+    jogos = df['JO'].where(df['JO'] > 0)
+    for coluna in df.columns:
+        if coluna in _FIXAS or '%' in str(coluna) or not pd.api.types.is_numeric_dtype(df[coluna]):
+            continue
+        if pd.api.types.is_bool_dtype(df[coluna]):
+            continue
+        df[coluna] = (df[coluna] / jogos).round(casas_decimais)
+    return _ordenar(df, soma)
+
+
+def _total(regular, playoffs, quem):
+    chaves = [c for c in _CHAVES[quem] if c in regular.columns]
+    colunas = _somaveis(regular, chaves)
+    if colunas is None or not chaves or list(playoffs.columns) != list(regular.columns):
+        return None
+    somadas = colunas + (['JO'] if 'JO' in regular.columns else [])
+    ambas = pd.concat([regular, playoffs], ignore_index=True)
+    df = ambas.groupby(chaves, sort=False, dropna=False)[somadas].sum(min_count=1).reset_index()
+    df['Temporada'] = regular['Temporada'].iloc[0] if len(regular) else None
+    return _ordenar(df[list(regular.columns)], regular)
+
+
+def _equipes(atletas):
+    # Os jogos da equipe não podem ser calculados dos atletas (nenhum deles
+    # precisa ter jogado todas as partidas): com JO, a página é baixada
+    colunas = _somaveis(atletas, _CHAVES['athletes'])
+    if colunas is None or 'Equipe' not in atletas.columns or 'JO' in atletas.columns:
+        return None
+    df = atletas.groupby('Equipe', sort=False)[colunas].sum(min_count=1).reset_index()
+    df['Temporada'] = atletas['Temporada'].iloc[0] if len(atletas) else None
+    return _ordenar(df, atletas)
+
+
+def _em_cache(params, request, from_html):
+    url, _ = request(**params)
+    html = cache.get(url)
+    return None if html is None else from_html(html, params['season'], params['quem'])
+
+
+def _obter(params, request, from_html, fases):
+    df = _em_cache(params, request, from_html)
+    return df if df is not None else _derivar(params, request, from_html, fases)
+
+
+def _derivar(params, request, from_html, fases):
+    if params['tipo'] == 'avg':
+        soma = _obter(dict(params, tipo='sum'), request, from_html, fases)
+        return None if soma is None else _media(soma)
+
+    if params['fase'] == 'total' and {'regular', 'playoffs'} <= set(fases):
+        regular = _obter(dict(params, fase='regular'), request, from_html, fases)
+        if regular is not None:
+            playoffs = _obter(dict(params, fase='playoffs'), request, from_html, fases)
+            if playoffs is not None:
+                df = _total(regular, playoffs, params['quem'])
+                if df is not None:
+                    return df
+
+    # Estatísticas sofridas não existem por atleta
+    if params['quem'] == 'teams' and not params.get('sofrido'):
+        atletas = _obter(dict(params, quem='athletes'), request, from_html, fases)
+        return None if atletas is None else _equipes(atletas)
+    return None
+
+
+def get_stats(params, request, from_html, fases):
+    # params: todos os parâmetros de get_stats, já validados pela liga
+    url, finished = request(**params)
+    if not finished:
+        memo.mark_unfinished()
+    if _ativo and cache.get(url) is None:
+        df = _derivar(params, request, from_html, fases)
+        if df is not None:
+            # Tabela montada por esta chamada: vai para o banco com os próprios parâmetros
+            _contar('derived')
+            return df
+    _contar('fetched')
+    return from_html(fetch.get_html(url, finished), params['season'], params['quem'])
@@ -0,0 +1,213 @@
+import numbers
+import sqlite3
+import threading
+import unicodedata
+
+import pandas as pd
+
+# Índice persistente (SQLite) dos jogadores que aparecem nas tabelas de
+# atletas de get_stats, de todas as ligas e temporadas. Cada aparição guarda
+# o nome normalizado (sem acentos, minúsculo), camisa, equipe, liga,
+# temporada, a consulta de origem e a posição da linha na tabela. As buscas
+# usam os índices B-tree do SQLite (O(log n)), inclusive a busca por prefixo,
+# feita como intervalo [prefixo, prefixo + '\uffff').
+#
+# Cada jogador tem um jogador_id: uma aparição é ligada a um jogador já
+# conhecido com o mesmo nome normalizado que tenha passado pela mesma equipe
+# ou usado a mesma camisa (é assim que a passagem da LDB para o NBB fica no
+# mesmo histórico). Sem essa sobreposição, ou se o jogador já está na mesma
+# tabela, é um homônimo e recebe um id novo.
+caminho = None
+
+_TABELA = 'aparicoes'
+_COLUNAS = ['jogador_id', 'chave', 'Jogador', 'Camisa', 'Equipe', 'equipe_chave', 'liga', 'season', 'origem',
+            'linha']
+_LOTE = 500  # parâmetros por consulta IN (...)
+
+_conexao = None
+_lock = threading.RLock()
+
+
+def configure(path):
+    global caminho
+    close()
+    caminho = str(path)
+
+
+def disable():
+    global caminho
+    close()
+    caminho = None
+
+
+def enabled():
+    return caminho is not None
+
+
+def close():
+    global _conexao
+    with _lock:
+        if _conexao is not None:
+            _conexao.close()
+            _conexao = None
+
+
+def normalize(texto):
+    # "  José  da SILVA" -> "jose da silva"
+    if texto is None or (isinstance(texto, float) and pd.isna(texto)):
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    return ' '.join(''.join(c for c in decomposto if not unicodedata.combining(c)).casefold().split())
+
+
+def _conectar():
+    global _conexao
+    if caminho is None:
+        raise RuntimeError('Nenhum índice configurado. Use nbb_api.players.configure(caminho).')
+    if _conexao is None:
+        _conexao = sqlite3.connect(caminho, check_same_thread=False)
+        _conexao.execute('PRAGMA journal_mode=WAL')
+        _conexao.execute(f'CREATE TABLE IF NOT EXISTS {_TABELA} (jogador_id INTEGER, chave TEXT, Jogador TEXT, '
+                         'Camisa TEXT, Equipe TEXT, equipe_chave TEXT, liga TEXT, season TEXT, origem TEXT, '
+                         'linha INTEGER)')
+        if 'jogador_id' not in [coluna[1] for coluna in _conexao.execute(f'PRAGMA table_info({_TABELA})')]:
+            _migrar(_conexao)
+        _conexao.execute(f'CREATE INDEX IF NOT EXISTS {_TABELA}_chave ON {_TABELA} (chave)')
+        _conexao.execute(f'CREATE INDEX IF NOT EXISTS {_TABELA}_jogador ON {_TABELA} (jogador_id)')
+        _conexao.execute(f'CREATE INDEX IF NOT EXISTS {_TABELA}_equipe ON {_TABELA} (equipe_chave, Camisa)')
+        _conexao.execute(f'CREATE INDEX IF NOT EXISTS {_TABELA}_origem ON {_TABELA} (liga, season, origem)')
+    return _conexao
+
+
+def _texto(valor):
+    return None if valor is None or pd.isna(valor) else str(valor)
+
+
+def _atribuir(candidatos, linhas, proximo):
+    # candidatos: chave -> {jogador_id: (camisas, equipes)}, atualizado aqui.
+    # linhas: (chave, camisa, equipe_chave) de uma mesma tabela. Devolve os
+    # ids das linhas e o próximo id livre
+    ids = []
+    na_tabela = set()
+    for chave, camisa, equipe in linhas:
+        jogadores = candidatos.setdefault(chave, {})
+        escolhido, melhor = None, 0
+        for jogador_id, (camisas, equipes) in sorted(jogadores.items()):
+            if jogador_id in na_tabela:
+                continue
+            pontos = 2 * bool(equipe and equipe in equipes) + bool(camisa and camisa in camisas)
+            if pontos > melhor:
+                escolhido, melhor = jogador_id, pontos
+        if escolhido is None:
+            escolhido, proximo = proximo, proximo + 1
+            jogadores[escolhido] = (set(), set())
+        jogadores[escolhido][0].add(camisa)
+        jogadores[escolhido][1].add(equipe)
+        na_tabela.add(escolhido)
+        ids.append(escolhido)
+    return ids, proximo
+
+
+def _migrar(conexao):
+    # Índices criados antes do jogador_id: atribui os ids na ordem em que as
+    # tabelas foram indexadas
+    with conexao:
+        conexao.execute(f'ALTER TABLE {_TABELA} ADD COLUMN jogador_id INTEGER')
+        tabelas = {}
+        for rowid, chave, camisa, equipe, liga, season, origem in conexao.execute(
+                f'SELECT rowid, chave, Camisa, equipe_chave, liga, season, origem FROM {_TABELA} ORDER BY rowid'):
+            tabelas.setdefault((liga, season, origem), []).append((rowid, (chave, camisa, equipe)))
+        candidatos, proximo = {}, 1
+        for linhas in tabelas.values():
+            ids, proximo = _atribuir(candidatos, [linha for _, linha in linhas], proximo)
+            conexao.executemany(f'UPDATE {_TABELA} SET jogador_id = ? WHERE rowid = ?',
+                                [(jogador_id, rowid) for jogador_id, (rowid, _) in zip(ids, linhas)])
+
+
+def _candidatos(conexao, chaves):
+    candidatos = {}
+    chaves = sorted(chaves)
+    for i in range(0, len(chaves), _LOTE):
+        parte = chaves[i:i + _LOTE]
+        sql = (f'SELECT jogador_id, chave, Camisa, equipe_chave FROM {_TABELA} '
+               f'WHERE chave IN ({", ".join("?" * len(parte))})')
+        for jogador_id, chave, camisa, equipe in conexao.execute(sql, parte):
+            camisas, equipes = candidatos.setdefault(chave, {}).setdefault(jogador_id, (set(), set()))
+            camisas.add(camisa)
+            equipes.add(equipe)
+    return candidatos
+
+
+def add(df, liga, season, origem=''):
+    # Substitui as aparições de (liga, temporada, origem) pelas linhas de df;
+    # `origem` identifica a consulta (fase, categoria...) e a linha é a posição em df
+    if df is None or 'Jogador' not in df.columns:
+        return 0
+    season = str(season)
+    camisas = df['Camisa'] if 'Camisa' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    equipes = df['Equipe'] if 'Equipe' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    linhas = [(normalize(jogador), _texto(jogador), _texto(camisa), _texto(equipe), normalize(equipe),
+               liga, season, origem, i)
+              for i, (jogador, camisa, equipe) in enumerate(zip(df['Jogador'], camisas, equipes))
+              if _texto(jogador)]
+    with _lock:
+        conexao = _conectar()
+        with conexao:
+            # Os ids saem antes do DELETE: indexar de novo a mesma consulta mantém os ids
+            candidatos = _candidatos(conexao, {linha[0] for linha in linhas})
+            proximo = conexao.execute(f'SELECT COALESCE(MAX(jogador_id), 0) + 1 FROM {_TABELA}').fetchone()[0]
+            ids, _ = _atribuir(candidatos, [(linha[0], linha[2], linha[4]) for linha in linhas], proximo)
+            conexao.execute(f'DELETE FROM {_TABELA} WHERE liga = ? AND season = ? AND origem = ?',
+                            (liga, season, origem))
+            conexao.executemany(f'INSERT INTO {_TABELA} ({", ".join(_COLUNAS)}) '
+                                f'VALUES ({", ".join("?" * len(_COLUNAS))})',
+                                [(jogador_id,) + linha for jogador_id, linha in zip(ids, linhas)])
+    return len(linhas)
+
+
+def _consultar(sql, valores):
+    with _lock:
+        return pd.read_sql_query(sql, _conectar(), params=valores)
+
+
+def search(texto, limit=20):
+    # Jogadores cujo nome começa com `texto` (sem diferenciar acentos e
+    # maiúsculas), um por jogador_id: homônimos aparecem separados
+    prefixo = normalize(texto)
+    sql = (f'SELECT jogador_id, MIN(chave) AS chave, MIN(Jogador) AS Jogador, GROUP_CONCAT(DISTINCT liga) AS ligas, '
+           f'MIN(season) AS primeira, MAX(season) AS ultima, COUNT(DISTINCT liga || season) AS temporadas '
+           f'FROM {_TABELA} WHERE chave >= ? AND chave < ? GROUP BY jogador_id ORDER BY 2, 1 LIMIT ?')
+    return _consultar(sql, (prefixo, prefixo + '\uffff', int(limit)))
+
+
+def _aparicoes(df):
+    # Uma linha por jogador/liga/temporada/equipe/camisa, com as origens e linhas onde aparece
+    if len(df) == 0:
+        return df.drop(columns=['equipe_chave', 'origem', 'linha']).assign(origens=[])
+    chaves = ['jogador_id', 'chave', 'Jogador', 'liga', 'season', 'Equipe', 'Camisa']
+    df = df.assign(origens=list(zip(df['origem'], df['linha'])))
+    return (df.groupby(chaves, sort=False, dropna=False)['origens'].agg(list).reset_index()
+            .sort_values(['season', 'liga'], kind='stable', ignore_index=True))
+
+
+def history(jogador):
+    # Todas as passagens de um jogador: pelo jogador_id ou pelo nome completo
+    # (sem diferenciar acentos), que traz todos os homônimos
+    # Integral aceita também os numpy.int64 das tabelas devolvidas por search()
+    if isinstance(jogador, numbers.Integral) and not isinstance(jogador, bool):
+        sql, valor = f'SELECT {", ".join(_COLUNAS)} FROM {_TABELA} WHERE jogador_id = ?', int(jogador)
+    else:
+        sql, valor = f'SELECT {", ".join(_COLUNAS)} FROM {_TABELA} WHERE chave = ?', normalize(jogador)
+    return _aparicoes(_consultar(sql, (valor,)))
+
+
+def jersey(equipe, camisa):
+    # Quem vestiu a camisa `camisa` na equipe `equipe`
+    sql = f'SELECT {", ".join(_COLUNAS)} FROM {_TABELA} WHERE equipe_chave = ? AND Camisa = ?'
+    return _aparicoes(_consultar(sql, (normalize(equipe), str(camisa))))
+
+
+def indexed():
+    # (liga, temporada, origem) já indexadas, para atualizar só o que falta
+    sql = f'SELECT DISTINCT liga, season, origem FROM {_TABELA} ORDER BY liga, season, origem'
+    return _consultar(sql, ())
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from . import bulk
+
+# Perfil de temporada dos jogadores: as tabelas de todas as categorias de
+# get_stats (pontos, rebotes, ...) numa só linha por jogador. Cada jogador
+# (nome + camisa + equipe, então homônimos e quem trocou de equipe no meio da
+# temporada ficam em linhas separadas) recebe uma chave inteira, calculada
+# uma vez para todas as tabelas, e as tabelas são juntadas de uma vez pelo
+# índice inteiro. Colunas repetidas entre categorias (JO, Min...) aparecem
+# uma vez só.
+CHAVES = ['Jogador', 'Camisa', 'Equipe']
+COMPARTILHADAS = ['Temporada', 'JO', 'Min']
+
+
+def merge(tabelas):
+    # tabelas: {categoria: DataFrame de atletas}
+    tabelas = {categ: df for categ, df in tabelas.items() if df is not None and len(df)}
+    if not tabelas:
+        return pd.DataFrame(columns=CHAVES + COMPARTILHADAS)
+
+    todas = pd.concat([df[CHAVES] for df in tabelas.values()], ignore_index=True)
+    codigos = todas.groupby(CHAVES, sort=False, dropna=False).ngroup().to_numpy()
+    jogadores = todas.drop_duplicates(ignore_index=True)
+
+    partes, compartilhadas, vistas = [], {}, set()
+    inicio = 0
+    for categ, df in tabelas.items():
+        indice = pd.Index(codigos[inicio:inicio + len(df)])
+        inicio += len(df)
+        df = df.drop(columns=CHAVES).set_axis(indice)
+        df = df[~indice.duplicated()]
+        for coluna in [c for c in COMPARTILHADAS if c in df.columns]:
+            # Quem não aparece numa categoria ainda tem JO/Min nas outras
+            atual = compartilhadas.get(coluna)
+            compartilhadas[coluna] = df[coluna] if atual is None else atual.combine_first(df[coluna])
+        df = df.drop(columns=[c for c in COMPARTILHADAS if c in df.columns])
+        # Mesma estatística em duas categorias: a segunda leva o nome da categoria
+        df = df.rename(columns={c: f'{c} ({categ})' for c in df.columns if c in vistas})
+        vistas.update(df.columns)
+        partes.append(df)
+
+    extras = [compartilhadas[c].rename(c) for c in COMPARTILHADAS if c in compartilhadas]
+    largo = pd.concat(extras + partes, axis=1).reindex(pd.RangeIndex(len(jogadores)))
+    return pd.concat([jogadores, largo], axis=1)
+
+
+def collect(get_stats, categs, params, max_workers=None):
+    # Baixa as categorias em paralelo e junta as tabelas na ordem de `categs`
+    combinacoes = [dict(params, categ=categ) for categ in categs]
+    tabelas = dict.fromkeys(categs)
+    for combinacao, df in bulk.iter_run(lambda **p: get_stats(**p, compact=False, output='pandas'),
+                                        combinacoes, max_workers):
+        tabelas[combinacao['categ']] = df
+    return merge(tabelas)
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+from . import transport
+from .aio import transport as aio_transport
+from .transport import Response, TransportError
+
+# Gravação e reprodução de páginas da LNB para rodar as funções get_* sem
+# rede (benchmarks, testes, depuração). Um corpus é uma pasta com um arquivo
+# por página e um index.json {url: arquivo}. Dentro de `with replay(pasta):`
+# o transporte (síncrono e asyncio) responde com as páginas do corpus, e uma
+# URL que não está nele vira TransportError.
+INDICE = 'index.json'
+
+
+def _ler_indice(diretorio):
+    try:
+        with open(os.path.join(diretorio, INDICE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save(diretorio, url, html):
+    os.makedirs(diretorio, exist_ok=True)
+    indice = _ler_indice(diretorio)
+    nome = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16] + '.html'
+    with open(os.path.join(diretorio, nome), 'w', encoding='utf-8') as f:
+        f.write(html)
+    indice[url] = nome
+    with open(os.path.join(diretorio, INDICE), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def record(urls, diretorio):
+    # Baixa as páginas (pelo transporte normal, com rede) e guarda no corpus
+    for url in urls:
+        save(diretorio, url, transport.get(url).text)
+
+
+class Corpus:
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        self.indice = _ler_indice(diretorio)
+        self.pedidos = []
+
+    def get(self, url):
+        self.pedidos.append(url)
+        nome = self.indice.get(url)
+        if nome is None:
+            raise TransportError(f'{url} não está no corpus {self.diretorio}')
+        with open(os.path.join(self.diretorio, nome), 'rb') as f:
+            conteudo = f.read()
+        return Response(url, 200, {'content-type': 'text/html; charset=utf-8'}, conteudo)
+
+    async def get_async(self, url):
+        return self.get(url)
+
+
+@contextmanager
+def replay(diretorio):
+    corpus = Corpus(diretorio)
+    originais = transport.get, aio_transport.get
+    transport.get, aio_transport.get = corpus.get, corpus.get_async
+    try:
+        yield corpus
+    finally:
+        transport.get, aio_transport.get = originais
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem coordenação entre processos
+    fcntl = None
+
+# Agendador central dos downloads: todo acesso à rede (síncrono ou asyncio)
+# passa por aqui. Por host, limita a taxa com um token bucket (`rate`
+# requisições por segundo, rajadas de até `burst`) e o número de downloads
+# simultâneos (`concurrency`). Chamadas idênticas em andamento ao mesmo tempo
+# (mesma URL, ou mesma chamada get_*) são feitas uma vez só e o resultado é
+# compartilhado. Com `path` configurado, o balde e as vagas ficam em arquivos
+# travados com flock nessa pasta e o orçamento vale para todos os processos.
+# Os limites são opcionais: sem `rate` e `concurrency` (o padrão), nenhum
+# download espera.
+rate = float(os.environ['NBB_API_SCHEDULER_RATE']) if os.environ.get('NBB_API_SCHEDULER_RATE') else None
+burst = 10
+concurrency = int(os.environ['NBB_API_SCHEDULER_CONCURRENCY']) if os.environ.get('NBB_API_SCHEDULER_CONCURRENCY') else None
+path = os.environ.get('NBB_API_SCHEDULER_DIR') or None
+
+_ESPERA_VAGA = 0.05
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+_em_andamento = {}
+_em_andamento_lock = threading.Lock()
+_por_loop = weakref.WeakKeyDictionary()  # loop -> {'chamadas': {...}, 'semaforos': {...}}
+
+
+def configure(**kwargs):
+    opcoes = ('rate', 'burst', 'concurrency', 'path')
+    for nome, valor in kwargs.items():
+        if nome not in opcoes:
+            raise ValueError(f'{nome} não é uma opção válida. Tente uma de: "' + '", "'.join(opcoes) + '".')
+        globals()[nome] = valor
+    with _hosts_lock:
+        _hosts.clear()
+    _por_loop.clear()
+
+
+class _Host:
+    def __init__(self, nome):
+        self.nome = nome
+        self.tokens = float(burst)
+        self.atualizado = time.monotonic()
+        self.ativos = 0
+        self.condicao = threading.Condition()
+
+    def _arquivo(self, sufixo):
+        return os.path.join(path, self.nome.replace(':', '_') + sufixo)
+
+    def reservar(self):
+        # Reserva um token e devolve quanto esperar por ele (tokens negativos
+        # são reservas na fila)
+        if not rate:
+            return 0.0
+        if path is not None and fcntl is not None:
+            return self._reservar_compartilhado()
+        with self.condicao:
+            agora = time.monotonic()
+            self.tokens = min(burst, self.tokens + (agora - self.atualizado) * rate) - 1
+            self.atualizado = agora
+            return max(0.0, -self.tokens / rate)
+
+    def _reservar_compartilhado(self):
+        os.makedirs(path, exist_ok=True)
+        with open(self._arquivo('.bucket'), 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                estado = json.loads(f.read())
+            except ValueError:
+                estado = {'tokens': float(burst), 'atualizado': time.time()}
+            agora = time.time()
+            tokens = min(burst, estado['tokens'] + max(0.0, agora - estado['atualizado']) * rate) - 1
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({'tokens': tokens, 'atualizado': agora}))
+            f.flush()
+            return max(0.0, -tokens / rate)
+
+    def tentar_vaga(self):
+        # Vaga entre processos: um dos `concurrency` arquivos .slotN travado
+        if path is None or fcntl is None or not concurrency:
+            return True, None
+        os.makedirs(path, exist_ok=True)
+        for i in range(concurrency):
+            fd = os.open(self._arquivo(f'.slot{i}'), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True, fd
+            except BlockingIOError:
+                os.close(fd)
+        return False, None
+
+
+def _host(url):
+    nome = urlsplit(url).netloc
+    with _hosts_lock:
+        host = _hosts.get(nome)
+        if host is None:
+            host = _hosts[nome] = _Host(nome)
+        return host
+
+
+def _liberar_vaga(fd):
+    if fd is not None:
+        os.close(fd)  # fechar o descritor solta o flock
+
+
+@contextmanager
+def slot(url):
+    host = _host(url)
+    with host.condicao:
+        while concurrency and host.ativos >= concurrency:
+            host.condicao.wait()
+        host.ativos += 1
+    fd = None
+    try:
+        while True:
+            livre, fd = host.tentar_vaga()
+            if livre:
+                break
+            time.sleep(_ESPERA_VAGA)
+        espera = host.reservar()
+        if espera:
+            time.sleep(espera)
+        yield
+    finally:
+        _liberar_vaga(fd)
+        with host.condicao:
+            host.ativos -= 1
+            host.condicao.notify()
+
+
+def _do_loop():
+    estado = _por_loop.get(asyncio.get_running_loop())
+    if estado is None:
+        estado = _por_loop[asyncio.get_running_loop()] = {'chamadas': {}, 'semaforos': {}}
+    return estado
+
+
+@asynccontextmanager
+async def slot_async(url):
+    host = _host(url)
+    semaforos = _do_loop()['semaforos']
+    semaforo = semaforos.get(host.nome)
+    if semaforo is None:
+        semaforo = semaforos[host.nome] = asyncio.Semaphore(concurrency) if concurrency else nullcontext()
+    async with semaforo:
+        fd = None
+        try:
+            while True:
+                livre, fd = host.tentar_vaga()
+                if livre:
+                    break
+                await asyncio.sleep(_ESPERA_VAGA)
+            espera = host.reservar()
+            if espera:
+                await asyncio.sleep(espera)
+            yield
+        finally:
+            _liberar_vaga(fd)
+
+
+def shared(chave, func):
+    # Executa func() uma vez para todas as chamadas simultâneas com a mesma
+    # chave. Devolve (resultado, dono): quem não é o dono recebe o mesmo objeto
+    with _em_andamento_lock:
+        futuro = _em_andamento.get(chave)
+        dono = futuro is None
+        if dono:
+            futuro = _em_andamento[chave] = Future()
+    if not dono:
+        return futuro.result(), False
+
+    try:
+        resultado = func()
+    except BaseException as erro:
+        futuro.set_exception(erro)
+        raise
+    else:
+        futuro.set_result(resultado)
+        return resultado, True
+    finally:
+        with _em_andamento_lock:
+            del _em_andamento[chave]
+
+
+async def shared_async(chave, corrotina):
+    # Como shared(), para corrotinas do mesmo event loop. Se todos os
+    # interessados desistirem (cancelamento), o download é cancelado
+    chamadas = _do_loop()['chamadas']
+    item = chamadas.get(chave)
+    dono = item is None
+    if dono:
+        item = chamadas[chave] = [asyncio.ensure_future(corrotina()), 0]
+    item[1] += 1
+    try:
+        return await asyncio.shield(item[0]), dono
+    finally:
+        item[1] -= 1
+        if item[1] == 0:
+            if not item[0].done():
+                item[0].cancel()
+            if chamadas.get(chave) is item:
+                del chamadas[chave]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from .strings import Strings
+
+# Normalização única das tabelas de jogos das três ligas (NBB, LDB e Liga
+# Ouro): mesma seleção de colunas, placar como inteiro e vencedor calculados
+# de forma vetorizada, sem percorrer linha a linha.
+_PLACAR = r'^\s*(\d+)\s*X\s*(\d+)'
+_FORMATO_DATA = '%d/%m/%Y  %H:%M'
+
+# Coluna normalizada -> coluna da página da LNB
+_ORIGEM = {
+    Strings.equipe_casa: 'Unnamed: 3',
+    Strings.equipe_visitante: 'Unnamed: 7',
+    'RODADA': 'FASE',
+    'FASE': 'CAMPEONATO',
+    'GINASIO': 'TRANSMISSÃO',
+}
+
+columns = ['DATA', Strings.equipe_casa, Strings.placar_casa, Strings.placar_visitante,
+           Strings.equipe_visitante, 'VENCEDOR', 'RODADA', 'FASE', 'GINASIO', 'TEMPORADA']
+
+
+def _placares(df):
+    if Strings.unnamed_5 not in df.columns:
+        # Temporada sem nenhum placar ainda: a coluna vem vazia e o dropna a remove
+        vazio = pd.Series(pd.NA, index=df.index, dtype='Int64')
+        return vazio, vazio.copy()
+    # Uma passada só da regex: "75 X 70  VER RELATÓRIO" -> 75, 70 (vale para 3 dígitos)
+    partes = df[Strings.unnamed_5].astype('string').str.extract(_PLACAR)
+    return partes[0].astype('Int64'), partes[1].astype('Int64')
+
+
+def _vencedor(casa, visitante, placar_casa, placar_visitante):
+    validos = (placar_casa.notna() & placar_visitante.notna()).to_numpy()
+    casa_venceu = placar_casa.to_numpy(dtype='int64', na_value=0) > placar_visitante.to_numpy(dtype='int64', na_value=0)
+    vencedor = np.where(casa_venceu, casa.to_numpy(dtype=object), visitante.to_numpy(dtype=object))
+    vencedor[~validos] = np.nan
+    return pd.Series(vencedor, index=casa.index, dtype=casa.dtype)
+
+
+def _vazia(season):
+    # Fase ainda sem jogos: a página só tem o cabeçalho
+    saida = pd.DataFrame({coluna: pd.Series(dtype=object) for coluna in columns})
+    saida['DATA'] = pd.Series(dtype='datetime64[ns]')
+    saida[Strings.placar_casa] = pd.Series(dtype='Int64')
+    saida[Strings.placar_visitante] = pd.Series(dtype='Int64')
+    saida['TEMPORADA'] = season
+    return saida
+
+
+def normalize(df, season):
+    if len(df) == 0:
+        return _vazia(season)
+    df = df.dropna(how='all', axis=1)
+
+    casa = df[_ORIGEM[Strings.equipe_casa]]
+    visitante = df[_ORIGEM[Strings.equipe_visitante]]
+    placar_casa, placar_visitante = _placares(df)
+
+    novas = {
+        'DATA': pd.to_datetime(df['DATA'], format=_FORMATO_DATA, errors='coerce'),
+        Strings.equipe_casa: casa,
+        Strings.placar_casa: placar_casa,
+        Strings.placar_visitante: placar_visitante,
+        Strings.equipe_visitante: visitante,
+        'VENCEDOR': _vencedor(casa, visitante, placar_casa, placar_visitante),
+    }
+    for coluna in ('RODADA', 'FASE', 'GINASIO'):
+        if _ORIGEM[coluna] in df.columns:
+            novas[coluna] = df[_ORIGEM[coluna]]
+
+    saida = pd.DataFrame(novas, index=df.index)
+    saida['TEMPORADA'] = season
+    return saida[[coluna for coluna in columns if coluna in saida.columns]]
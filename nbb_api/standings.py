@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from .strings import Strings
+
+# Classificação calculada localmente a partir da tabela de jogos (get_placares),
+# sem baixar a página de classificação. history() devolve a classificação ao
+# fim de cada data da temporada numa só passada acumulada: os resultados do
+# dia de cada equipe são somados numa matriz data x equipe e um cumsum dá o
+# acumulado de todas as datas de uma vez.
+# A ordem usa aproveitamento, vitórias, saldo e pontos pró; o confronto
+# direto do regulamento da LNB não entra no desempate.
+columns = ['POSICAO', 'EQUIPES', 'PTS', 'J', 'V', 'D', '%V', 'PRO', 'CON', 'SALDO']
+
+_ORDEM = ['%V', 'V', 'SALDO', 'PRO']
+_SOMAS = ['V', 'D', 'PRO', 'CON']
+
+
+def _resultados(placares):
+    # Uma linha por equipe e jogo com placar: data, pontos pró/contra e resultado
+    jogos = placares[placares[Strings.placar_casa].notna() & placares[Strings.placar_visitante].notna()]
+    casa = jogos[Strings.placar_casa].astype('int64').to_numpy()
+    visitante = jogos[Strings.placar_visitante].astype('int64').to_numpy()
+    datas = jogos['DATA'].to_numpy()
+    return pd.DataFrame({
+        'DATA': np.concatenate([datas, datas]),
+        'EQUIPES': np.concatenate([jogos[Strings.equipe_casa].to_numpy(dtype=object),
+                                   jogos[Strings.equipe_visitante].to_numpy(dtype=object)]),
+        'V': np.concatenate([casa > visitante, visitante > casa]).astype('int64'),
+        'D': np.concatenate([casa < visitante, visitante < casa]).astype('int64'),
+        'PRO': np.concatenate([casa, visitante]),
+        'CON': np.concatenate([visitante, casa]),
+    })
+
+
+def _equipes(placares):
+    # Equipes que aparecem na tabela, mesmo as que ainda não jogaram
+    nomes = pd.concat([placares[Strings.equipe_casa], placares[Strings.equipe_visitante]]).dropna()
+    return pd.Index(nomes.unique(), name='EQUIPES')
+
+
+def _completar(df):
+    df['J'] = df['V'] + df['D']
+    df['PTS'] = 2 * df['V'] + df['D']  # 2 pontos por vitória e 1 por derrota
+    df['%V'] = (df['V'] / df['J'].where(df['J'] > 0)).fillna(0.0).round(4)
+    df['SALDO'] = df['PRO'] - df['CON']
+    return df
+
+
+def _ordenar(df, grupos=()):
+    df = df.sort_values(list(grupos) + _ORDEM + ['EQUIPES'],
+                        ascending=[True] * len(grupos) + [False] * len(_ORDEM) + [True], kind='stable')
+    if grupos:
+        df['POSICAO'] = df.groupby(list(grupos), sort=False).cumcount() + 1
+    else:
+        df['POSICAO'] = np.arange(1, len(df) + 1)
+    return df.reset_index(drop=True)
+
+
+def table(placares):
+    somas = _resultados(placares).groupby('EQUIPES')[_SOMAS].sum()
+    df = somas.reindex(_equipes(placares), fill_value=0).reset_index()
+    return _ordenar(_completar(df))[columns]
+
+
+def history(placares, dates=None):
+    # Classificação ao fim de cada data (todas as datas com jogo, ou `dates`)
+    resultados = _resultados(placares)
+    resultados['DATA'] = resultados['DATA'].dt.normalize()
+    equipes = _equipes(placares)
+
+    # Matriz data x (estatística, equipe) com o saldo de cada dia, acumulada
+    diario = resultados.pivot_table(index='DATA', columns='EQUIPES', values=_SOMAS, aggfunc='sum', fill_value=0)
+    diario = diario.reindex(columns=pd.MultiIndex.from_product([_SOMAS, equipes]), fill_value=0)
+    acumulado = diario.cumsum()
+    if dates is not None:
+        datas = pd.DatetimeIndex(pd.to_datetime(list(dates))).normalize()
+        # Vale o último dia com jogo até cada data pedida (zero antes do primeiro)
+        acumulado = acumulado.reindex(acumulado.index.union(datas)).ffill().fillna(0).loc[datas]
+        acumulado.index = datas
+    acumulado.index.name = 'DATA'
+
+    df = acumulado.stack(level=1, future_stack=True).rename_axis(['DATA', 'EQUIPES']).reset_index()
+    df[_SOMAS] = df[_SOMAS].astype('int64')
+    return _ordenar(_completar(df), grupos=['DATA'])[['DATA'] + columns]
+
+
+def as_of(placares, date):
+    df = history(placares, [date])
+    return df.drop(columns='DATA')
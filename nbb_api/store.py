@@ -0,0 +1,132 @@
+import os
+import tempfile
+
+import pandas as pd
+
+from . import bulk, frames
+from .validation import validate_choice
+
+# Armazenamento local em arquivos Arrow IPC (Feather v2, sem compressão),
+# um por liga/dataset/temporada: <diretorio>/<liga>/<dataset>/<temporada>.arrow.
+# load() abre os arquivos com memory map, então as colunas devolvidas apontam
+# direto para as páginas mapeadas: carregar é quase instantâneo e vários
+# processos lendo o mesmo histórico dividem uma só cópia no cache do sistema.
+diretorio = os.environ.get('NBB_API_STORE_DIR') or os.path.join(os.path.expanduser('~'), '.local', 'share',
+                                                                 'nbb_api', 'store')
+
+_COLUNAS_TEMPORADA = ('Temporada', 'TEMPORADA')
+# Colunas que as funções em lote acrescentam com os parâmetros de cada consulta
+_PARAMETROS = ('fase', 'categ', 'tipo', 'quem', 'mandante', 'sofrido')
+
+
+def configure(path):
+    global diretorio
+    diretorio = str(path)
+
+
+def _caminho(liga, dataset, season):
+    return os.path.join(diretorio, liga, dataset, f'{season}.arrow')
+
+
+def seasons(liga, dataset):
+    try:
+        nomes = os.listdir(os.path.join(diretorio, liga, dataset))
+    except FileNotFoundError:
+        return []
+    return sorted(nome[:-len('.arrow')] for nome in nomes if nome.endswith('.arrow'))
+
+
+def _temporada(df):
+    for coluna in _COLUNAS_TEMPORADA:
+        if coluna in df.columns:
+            return coluna
+    raise ValueError('A tabela não tem coluna de temporada ("Temporada" ou "TEMPORADA").')
+
+
+def _gravar(tabela, caminho):
+    pa = frames._pyarrow()
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f, pa.ipc.new_file(f, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        # Quem já tem o arquivo antigo mapeado continua lendo a versão antiga
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def _mesclar(parte, caminho):
+    # Junta com o arquivo já gravado: só as linhas das combinações de
+    # parâmetros presentes em `parte` são substituídas
+    parametros = [c for c in _PARAMETROS if c in parte.columns]
+    if not parametros or not os.path.exists(caminho):
+        return parte
+    pa = frames._pyarrow()
+    antigo = pa.ipc.open_file(pa.memory_map(caminho, 'r')).read_all().to_pandas()
+    if not set(parametros) <= set(antigo.columns):
+        return parte
+    novas = pd.MultiIndex.from_frame(parte[parametros].astype(str))
+    manter = ~pd.MultiIndex.from_frame(antigo[parametros].astype(str)).isin(novas)
+    return frames.concat([antigo[manter], parte], ignore_index=True)
+
+
+def save(df, liga, dataset):
+    # Uma tabela com várias temporadas vira um arquivo por temporada. Tabelas
+    # das funções em lote são mescladas com o arquivo existente pelas colunas
+    # de parâmetros (fase, categ...); sem elas, o arquivo é substituído
+    # inteiro. A troca do arquivo é atômica
+    pa = frames._pyarrow()
+    coluna = _temporada(df)
+    for season, parte in df.groupby(coluna, observed=True, sort=False):
+        caminho = _caminho(liga, dataset, season)
+        _gravar(pa.Table.from_pandas(_mesclar(parte, caminho), preserve_index=False), caminho)
+
+
+def import_warehouse(origem):
+    # Converte o dataset Parquet do `python -m nbb_api sync` para este
+    # formato, uma partição league=/dataset=/season= de cada vez
+    pa = frames._pyarrow()
+    import pyarrow.parquet as pq
+
+    importadas = []
+    for pasta, _, arquivos in os.walk(origem):
+        partes = [nome for nome in arquivos if nome.endswith('.parquet')]
+        if not partes:
+            continue
+        chaves = dict(p.split('=', 1) for p in os.path.relpath(pasta, origem).split(os.sep) if '=' in p)
+        if not {'league', 'dataset', 'season'} <= set(chaves):
+            continue
+        tabela = pa.concat_tables([pq.read_table(os.path.join(pasta, nome)) for nome in sorted(partes)],
+                                  promote_options='default')
+        _gravar(tabela, _caminho(chaves['league'], chaves['dataset'], chaves['season']))
+        importadas.append((chaves['league'], chaves['dataset'], chaves['season']))
+    return importadas
+
+
+def _abrir(liga, dataset, season):
+    pa = frames._pyarrow()
+    caminho = _caminho(liga, dataset, season)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f'{liga}/{dataset} da temporada {season} não está no armazenamento local ({caminho}).')
+    # read_all() de um arquivo mapeado não copia os buffers
+    return pa.ipc.open_file(pa.memory_map(caminho, 'r')).read_all()
+
+
+def load(liga, dataset, season=None, columns=None, output='pandas-arrow'):
+    pa = frames._pyarrow()
+    validate_choice(output, ['pandas-arrow', 'arrow'])
+
+    temporadas = seasons(liga, dataset) if season is None else [str(s) for s in bulk.as_list(season)]
+    tabelas = [_abrir(liga, dataset, s) for s in temporadas]
+    if not tabelas:
+        raise FileNotFoundError(f'Nada de {liga}/{dataset} no armazenamento local ({diretorio}).')
+
+    tabela = tabelas[0] if len(tabelas) == 1 else pa.concat_tables(tabelas, promote_options='default')
+    if columns is not None:
+        tabela = tabela.select(bulk.as_list(columns))
+    if output == 'arrow':
+        return tabela
+    # Colunas ArrowDtype continuam apontando para a memória mapeada
+    return tabela.to_pandas(types_mapper=pd.ArrowDtype)
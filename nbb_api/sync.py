@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from . import bulk, frames, ldb, liga_ouro, nbb, scheduler
+
+# Sincronização do histórico completo das ligas num dataset Parquet
+# particionado em <destino>/league=<liga>/dataset=<dataset>/season=<temporada>/.
+# Cada combinação de parâmetros vira um arquivo, registrado num manifesto
+# (JSON lines, só acrescentado) para que uma execução interrompida continue
+# de onde parou. Temporadas encerradas já baixadas são puladas; a temporada
+# em andamento é sempre baixada de novo. `rate` vira o limite do
+# nbb_api.scheduler enquanto a sincronização roda.
+ligas = {'nbb': nbb, 'ldb': ldb, 'liga_ouro': liga_ouro}
+
+MANIFESTO = '_manifest.jsonl'
+
+
+def _grades(modulo):
+    # Sem temporadas repetidas (liga_ouro.seasons lista '2025' duas vezes):
+    # cada combinação é baixada e gravada uma vez só
+    temporadas = list(dict.fromkeys(modulo.seasons))
+    grades = {}
+    if hasattr(modulo, 'get_stats'):
+        params = dict(season=temporadas, fase=modulo.fases, categ=modulo.categs,
+                      tipo=modulo.tipos, quem=modulo.quems)
+        if hasattr(modulo, 'mandantes'):
+            params['mandante'] = modulo.mandantes
+        params['sofrido'] = modulo.sofridos
+        # `sofrido` só muda alguma coisa nas estatísticas de equipes
+        combinacoes = [c for c in bulk.combinations(bulk.grid(**params))
+                       if c['quem'] == 'teams' or not c['sofrido']]
+        grades['stats'] = (modulo.get_stats, combinacoes)
+    grades['placares'] = (modulo.get_placares,
+                          bulk.combinations(bulk.grid(season=temporadas, fase=modulo.fases)))
+    temporadas = list(dict.fromkeys(getattr(modulo, 'seasons_classification', temporadas)))
+    grades['classificacao'] = (modulo.get_classificacao, bulk.combinations(bulk.grid(season=temporadas)))
+    return grades
+
+
+def _chave(liga, dataset, params):
+    return f'{liga}/{dataset}/' + '&'.join(f'{nome}={valor}' for nome, valor in params.items())
+
+
+def _arquivo(liga, dataset, params, chave):
+    nome = hashlib.sha1(chave.encode('utf-8')).hexdigest()[:16] + '.parquet'
+    return os.path.join(f'league={liga}', f'dataset={dataset}', f"season={params['season']}", nome)
+
+
+def read_manifest(destino):
+    manifesto = {}
+    try:
+        with open(os.path.join(destino, MANIFESTO), 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    # Última linha incompleta de uma execução interrompida
+                    continue
+                manifesto[registro['chave']] = registro
+    except FileNotFoundError:
+        pass
+    return manifesto
+
+
+def _registrar(f, registro):
+    f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+    f.flush()
+
+
+def _gravar(df, caminho):
+    pasta = os.path.dirname(caminho)
+    os.makedirs(pasta, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(temporario, index=False)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def _pendentes(destino, manifesto, liga, dataset, combinacoes, atual):
+    pendentes = []
+    for params in combinacoes:
+        registro = manifesto.get(_chave(liga, dataset, params))
+        if (registro is not None and registro['status'] == 'ok' and str(params['season']) != atual
+                and os.path.exists(os.path.join(destino, registro['arquivo']))):
+            continue
+        pendentes.append(params)
+    return pendentes
+
+
+def _sincronizar(f, destino, manifesto, liga, dataset, func, combinacoes, atual, max_workers, resumo, verbose):
+    pendentes = _pendentes(destino, manifesto, liga, dataset, combinacoes, atual)
+    resumo['pulado'] += len(combinacoes) - len(pendentes)
+
+    def baixar(**params):
+        return func(**params, compact=False, output='pandas')
+
+    def falhou(params, erro):
+        resumo['falha'] += 1
+        _registrar(f, {'chave': _chave(liga, dataset, params), 'status': 'falha', 'erro': repr(erro)})
+        if verbose:
+            print(f'{liga}/{dataset} {params}: {erro!r}')
+
+    for params, df in bulk.iter_run(baixar, pendentes, max_workers, on_error=falhou):
+        chave = _chave(liga, dataset, params)
+        registro = {'chave': chave, 'status': 'vazio', 'linhas': 0, 'finalizada': str(params['season']) != atual}
+        # Tabela vazia costuma ser falha de carregamento: fica para a próxima execução
+        if df is not None and len(df):
+            arquivo = _arquivo(liga, dataset, params, chave)
+            _gravar(bulk._tag(df, params, ('season',)), os.path.join(destino, arquivo))
+            registro.update(status='ok', arquivo=arquivo, linhas=len(df))
+        resumo[registro['status']] += 1
+        manifesto[chave] = registro
+        _registrar(f, registro)
+
+
+def _sincronizar_ligas(destino, manifesto, leagues, datasets, seasons, max_workers, resumo, verbose):
+    with open(os.path.join(destino, MANIFESTO), 'a', encoding='utf-8') as f:
+        for liga in leagues:
+            modulo = ligas[liga]
+            for dataset, (func, combinacoes) in _grades(modulo).items():
+                if datasets is not None and dataset not in bulk.as_list(datasets):
+                    continue
+                if seasons is not None:
+                    combinacoes = [c for c in combinacoes if str(c['season']) in seasons]
+                temporadas = modulo.seasons
+                if dataset == 'classificacao':
+                    temporadas = getattr(modulo, 'seasons_classification', temporadas)
+                _sincronizar(f, destino, manifesto, liga, dataset, func, combinacoes, str(temporadas[-1]),
+                             max_workers, resumo, verbose)
+
+
+def sync(destino, leagues=None, datasets=None, seasons=None, max_workers=None, rate=None, verbose=True):
+    frames._pyarrow()
+    leagues = bulk.as_list(leagues) if leagues is not None else list(ligas)
+    seasons = [str(s) for s in bulk.as_list(seasons)] if seasons is not None else None
+
+    os.makedirs(destino, exist_ok=True)
+    manifesto = read_manifest(destino)
+    resumo = {'ok': 0, 'vazio': 0, 'falha': 0, 'pulado': 0}
+
+    rate_anterior = scheduler.rate
+    if rate:
+        scheduler.configure(rate=rate)
+    try:
+        _sincronizar_ligas(destino, manifesto, leagues, datasets, seasons, max_workers, resumo, verbose)
+    finally:
+        if rate:
+            scheduler.configure(rate=rate_anterior)
+
+    if verbose:
+        print('Concluídas: {ok}, vazias: {vazio}, com falha: {falha}, já sincronizadas: {pulado}'.format(**resumo))
+    return resumo
@@ -0,0 +1,334 @@
+import gzip
+import http.client
+import random
+import socket
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from urllib.parse import urljoin, urlsplit
+
+# Transporte HTTP compartilhado pelas três ligas: mantém conexões keep-alive
+# abertas por host (evitando um novo handshake TLS a cada página) e pede as
+# respostas comprimidas com gzip/deflate.
+user_agent = 'nbb_api (+https://github.com/GabrielPastorello/nbb_api)'
+max_conexoes_ociosas = 8
+max_redirecionamentos = 5
+
+# Prazos (em segundos) para conectar e para cada leitura do socket, e prazo
+# total de uma chamada a get(), contando as novas tentativas
+connect_timeout = 10.0
+read_timeout = 30.0
+deadline = 120.0
+
+# Novas tentativas para erros transitórios (timeouts, conexões perdidas,
+# 429 e 5xx), com backoff exponencial e jitter
+retries = 3
+backoff = 0.5
+backoff_max = 8.0
+
+# Requisição "hedged": se a resposta demorar mais que o percentil
+# `hedge_percentile` das latências recentes do host, uma segunda requisição
+# idêntica é disparada e vale a que terminar primeiro. None desativa. No
+# máximo `hedge_max` requisições extras ficam em andamento ao mesmo tempo.
+hedge_percentile = None
+hedge_min_samples = 20
+hedge_max = 4
+
+_STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+_pools = {}
+_pools_lock = threading.Lock()
+_latencias = {}
+_latencias_lock = threading.Lock()
+_hedges = threading.BoundedSemaphore(hedge_max)
+
+
+class TransportError(IOError):
+    pass
+
+
+class TransportTimeout(TransportError):
+    pass
+
+
+class ParseError(ValueError):
+    # A página chegou, mas a tabela não está no formato esperado
+    pass
+
+
+class HTTPStatusError(TransportError):
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(f'A LNB respondeu {status} para {url}')
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+def configure(**kwargs):
+    opcoes = ('connect_timeout', 'read_timeout', 'deadline', 'retries', 'backoff',
+              'backoff_max', 'hedge_percentile', 'hedge_min_samples', 'hedge_max', 'max_conexoes_ociosas')
+    global _hedges
+    for nome, valor in kwargs.items():
+        if nome not in opcoes:
+            raise ValueError(f'{nome} não é uma opção válida. Tente uma de: "' + '", "'.join(opcoes) + '".')
+        globals()[nome] = valor
+    if 'hedge_max' in kwargs:
+        _hedges = threading.BoundedSemaphore(hedge_max)
+
+
+class Response:
+    __slots__ = ('url', 'status', 'headers', 'content')
+
+    def __init__(self, url, status, headers, content):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+
+    @property
+    def charset(self):
+        content_type = self.headers.get('content-type', '')
+        for parte in content_type.split(';')[1:]:
+            nome, _, valor = parte.strip().partition('=')
+            if nome.lower() == 'charset' and valor:
+                return valor.strip('"\'')
+        return 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.charset, errors='replace')
+
+
+class _Pool:
+    def __init__(self, scheme, netloc):
+        self.scheme = scheme
+        self.netloc = netloc
+        self._ociosas = []
+        self._lock = threading.Lock()
+
+    def acquire(self, limite):
+        with self._lock:
+            if self._ociosas:
+                return self._ociosas.pop(), True
+        timeout = min(connect_timeout, _restante(limite, self.netloc))
+        if self.scheme == 'https':
+            conn = http.client.HTTPSConnection(self.netloc, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(self.netloc, timeout=timeout)
+        try:
+            conn.connect()
+        except socket.timeout:
+            conn.close()
+            raise TransportTimeout(f'Tempo esgotado ao conectar em {self.netloc}') from None
+        except OSError as e:
+            conn.close()
+            raise TransportError(f'Falha ao conectar em {self.netloc}: {e}') from e
+        return conn, False
+
+    def release(self, conn):
+        with self._lock:
+            if len(self._ociosas) < max_conexoes_ociosas:
+                self._ociosas.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conn in ociosas:
+            conn.close()
+
+
+def _restante(limite, onde):
+    # Segundos até o prazo total de get(); esgotado, vira TransportTimeout
+    restante = limite - time.monotonic()
+    if restante <= 0:
+        raise TransportTimeout(f'Prazo de {deadline}s esgotado para {onde}')
+    return restante
+
+
+def _pool(scheme, netloc):
+    with _pools_lock:
+        pool = _pools.get((scheme, netloc))
+        if pool is None:
+            pool = _pools[(scheme, netloc)] = _Pool(scheme, netloc)
+        return pool
+
+
+def close():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _decode(content, encoding):
+    encoding = (encoding or '').strip().lower()
+    if encoding == 'gzip':
+        return gzip.decompress(content)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(content)
+        except zlib.error:
+            # Alguns servidores mandam deflate "cru", sem o cabeçalho zlib
+            return zlib.decompress(content, -zlib.MAX_WBITS)
+    return content
+
+
+def _request(url, limite):
+    partes = urlsplit(url)
+    caminho = (partes.path or '/') + (f'?{partes.query}' if partes.query else '')
+    cabecalhos = {
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'User-Agent': user_agent,
+    }
+    pool = _pool(partes.scheme, partes.netloc)
+
+    while True:
+        conn, reutilizada = pool.acquire(limite)
+        try:
+            # Cada leitura do socket espera no máximo o que resta do prazo
+            conn.sock.settimeout(min(read_timeout, _restante(limite, url)))
+            conn.request('GET', caminho, headers=cabecalhos)
+            resposta = conn.getresponse()
+            content = resposta.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            conn.close()
+            # O servidor pode fechar uma conexão ociosa a qualquer momento:
+            # nesse caso tentamos de novo numa conexão nova
+            if reutilizada:
+                continue
+            raise TransportError(f'Conexão perdida com {partes.netloc}: {e}') from e
+        except socket.timeout:
+            conn.close()
+            raise TransportTimeout(f'Tempo esgotado aguardando {url}') from None
+        except TransportError:
+            conn.close()
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise TransportError(f'Falha ao acessar {url}: {e}') from e
+        except BaseException:
+            conn.close()
+            raise
+
+        if resposta.will_close:
+            conn.close()
+        else:
+            pool.release(conn)
+
+        headers = {k.lower(): v for k, v in resposta.getheaders()}
+        return resposta.status, headers, _decode(content, headers.get('content-encoding'))
+
+
+def _registrar_latencia(host, segundos):
+    with _latencias_lock:
+        amostras = _latencias.get(host)
+        if amostras is None:
+            amostras = _latencias[host] = deque(maxlen=200)
+        amostras.append(segundos)
+
+
+def _hedge_delay(host):
+    if hedge_percentile is None:
+        return None
+    with _latencias_lock:
+        amostras = sorted(_latencias.get(host, ()))
+    if len(amostras) < hedge_min_samples:
+        return None
+    return amostras[min(len(amostras) - 1, int(len(amostras) * hedge_percentile / 100))]
+
+
+def _get_once(url, limite):
+    inicio = time.monotonic()
+    for _ in range(max_redirecionamentos + 1):
+        status, headers, content = _request(url, limite)
+        if status in (301, 302, 303, 307, 308) and 'location' in headers:
+            url = urljoin(url, headers['location'])
+            continue
+        if status >= 400:
+            raise HTTPStatusError(url, status, headers.get('retry-after'))
+        _registrar_latencia(urlsplit(url).netloc, time.monotonic() - inicio)
+        return Response(url, status, headers, content)
+    raise TransportError(f'Redirecionamentos demais a partir de {url}')
+
+
+def _em_thread(func, *args):
+    # Cada requisição roda na sua própria thread, criada na hora: nenhuma
+    # fica parada numa fila esperando um worker livre
+    futuro = Future()
+
+    def rodar():
+        try:
+            futuro.set_result(func(*args))
+        except BaseException as e:
+            futuro.set_exception(e)
+
+    threading.Thread(target=rodar, name='nbb_api-hedge', daemon=True).start()
+    return futuro
+
+
+def _hedge(url, limite, hedges):
+    try:
+        return _get_once(url, limite)
+    finally:
+        hedges.release()
+
+
+def _get_hedged(url, limite):
+    atraso = _hedge_delay(urlsplit(url).netloc)
+    if atraso is None:
+        return _get_once(url, limite)
+
+    pendentes = {_em_thread(_get_once, url, limite)}
+    feitos, _ = wait(pendentes, timeout=atraso)
+    hedges = _hedges
+    if not feitos and hedges.acquire(blocking=False):
+        pendentes.add(_em_thread(_hedge, url, limite, hedges))
+
+    erro = None
+    while pendentes:
+        feitos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+        for futuro in feitos:
+            if futuro.exception() is None:
+                # A requisição perdedora termina sozinha e devolve a conexão ao pool
+                return futuro.result()
+            erro = futuro.exception()
+    raise erro
+
+
+def _transitorio(erro):
+    if isinstance(erro, HTTPStatusError):
+        return erro.status in _STATUS_TRANSITORIOS
+    return isinstance(erro, TransportError)
+
+
+def _espera(tentativa, erro):
+    espera = random.uniform(0, min(backoff_max, backoff * 2 ** tentativa))
+    if isinstance(erro, HTTPStatusError) and erro.retry_after:
+        try:
+            espera = max(espera, min(backoff_max, float(erro.retry_after)))
+        except ValueError:
+            pass
+    return espera
+
+
+def get(url):
+    limite = time.monotonic() + deadline
+    tentativa = 0
+    while True:
+        try:
+            return _get_hedged(url, limite)
+        except TransportError as erro:
+            if not _transitorio(erro) or tentativa >= retries:
+                raise
+            espera = _espera(tentativa, erro)
+            if time.monotonic() + espera >= limite:
+                raise TransportTimeout(f'Prazo de {deadline}s esgotado para {url}') from erro
+            time.sleep(espera)
+            tentativa += 1
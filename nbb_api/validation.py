@@ -0,0 +1,9 @@
+from .strings import Strings
+
+
+def validate_choice(value, allowed, is_boolean=False):
+    if value not in allowed:
+        if is_boolean:
+            raise ValueError(str(value) + Strings.error_valor_invalido_boolean)
+        allowed_str = '", "'.join(allowed)
+        raise ValueError(f'{value}{Strings.erro_valor_invalido}"{allowed_str}".')
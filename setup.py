@@ -23,6 +23,7 @@ setuptools.setup(
                               'pytz>=2022.7',
                               'lxml>=4.9.2'
                               ],
+            extras_require={'arrow': ['pyarrow>=14']},
             classifiers=[
                 "Programming Language :: Python :: 3",
                 "License :: OSI Approved :: MIT License",
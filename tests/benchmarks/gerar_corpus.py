@@ -0,0 +1,134 @@
+import random
+import sys
+
+from nbb_api import boxscores, ldb, liga_ouro, nbb, replay
+
+# Corpus sintético para os benchmarks: páginas com a mesma marcação e o
+# mesmo tamanho das páginas da LNB (estatísticas, classificação e tabela de
+# jogos das três ligas, em várias temporadas, mais os relatórios dos jogos
+# da Liga Ouro 2018), gravadas com as URLs que as funções get_* pedem. Quando houver rede, replay.record() grava as páginas
+# reais numa pasta com o mesmo formato.
+#
+#   python tests/benchmarks/gerar_corpus.py <pasta>
+EQUIPES = ['Flamengo', 'Franca', 'Minas', 'Paulistano', 'Pinheiros', 'Bauru', 'São Paulo', 'Corinthians',
+           'Brasília', 'Unifacisa', 'Fortaleza', 'Mogi', 'Caxias do Sul', 'Pato Basquete', 'União Corinthians',
+           'Cearense', 'Botafogo', 'Vasco da Gama']
+NOMES = ['João', 'José', 'Lucas', 'Marcelo', 'Rafael', 'Gustavo', 'André', 'Vítor', 'Matheus', 'Ícaro']
+SOBRENOMES = ['Silva', 'Souza', 'Araújo', 'Gonçalves', 'Oliveira', 'Conceição', 'Dias', 'Mello', 'Brito']
+
+ESTATISTICAS = ['JO', 'Min', 'Pts', 'RO', 'RD', 'RT', 'AS', 'BR', 'TO', 'ER', 'FC', 'EF', '2PC', '2PT', '3PC', '3PT',
+                'LLC', 'LLT']
+
+
+def _tabela(cabecalho, linhas, thead=True):
+    th = ''.join(f'<th>{c}</th>' for c in cabecalho)
+    corpo = ''.join('<tr>' + ''.join(f'<td>{v}</td>' for v in linha) + '</tr>\n' for linha in linhas)
+    if thead:
+        return f'<table class="stats"><thead><tr>{th}</tr></thead><tbody>{corpo}</tbody></table>'
+    return f'<table><tr>{th}</tr>{corpo}</table>'
+
+
+def _pagina(tabela):
+    menu = ''.join(f'<li><a href="/nbb/{i}">Item {i}</a></li>' for i in range(60))
+    return f'<html><head><title>LNB</title></head><body><ul>{menu}</ul>{tabela}<footer>LNB</footer></body></html>'
+
+
+def stats(aleatorio, quem, linhas=280, antiga=False):
+    # antiga: temporadas como 2008-09, sem minutos e com totais com separador de milhar
+    colunas = [c for c in ESTATISTICAS if not (antiga and c == 'Min')]
+    linhas_html = []
+    quantidade = len(EQUIPES) if quem == 'teams' else linhas
+    for i in range(quantidade):
+        equipe = EQUIPES[i % len(EQUIPES)]
+        valores = [aleatorio.randint(1, 34) if c == 'JO' else
+                   (f'{aleatorio.randint(1000, 2500):,}' if antiga and c == 'Pts' else
+                    round(aleatorio.uniform(0, 40), 1)) for c in colunas]
+        if quem == 'teams':
+            linhas_html.append([i + 1, equipe] + valores)
+        else:
+            nome = f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} #{aleatorio.randint(0, 99)}'
+            linhas_html.append([i + 1, nome, equipe] + valores)
+    cabecalho = ['Pos.'] + (['Equipe'] if quem == 'teams' else ['Jogador', 'Equipe']) + colunas
+    return _pagina(_tabela(cabecalho, linhas_html, thead=not antiga))
+
+
+def classificacao(aleatorio):
+    linhas = []
+    for i, equipe in enumerate(EQUIPES, 1):
+        v = aleatorio.randint(5, 30)
+        linhas.append([i, f'{i:02d} {equipe}', 2 * v + (34 - v), 34, v, 34 - v, round(v / 34, 3)])
+        # Linha de detalhe logo abaixo de cada equipe (o iloc[::2] descarta)
+        linhas.append(['', 'Últimos jogos', '', '', '', '', ''])
+    return _pagina(_tabela(['#', 'EQUIPES', 'PTS', 'J', 'V', 'D', '%'], linhas))
+
+
+def placares(aleatorio, jogos=306, antiga=False):
+    cabecalho = ['#', 'DATA', 'CASA', '', '', '', '', '', 'FASE', 'CAMPEONATO']
+    if not antiga:
+        cabecalho += ['RODADA', 'TRANSMISSÃO']
+    linhas = []
+    for i in range(jogos):
+        casa, visitante = aleatorio.sample(EQUIPES, 2)
+        data = f'{1 + i % 28:02d}/{1 + (i // 28) % 12:02d}/2023<br>  {aleatorio.choice([19, 20, 21])}:00'
+        placar = (f'{aleatorio.randint(60, 110)} X {aleatorio.randint(60, 110)}<br> '
+                  f'<a href="/nbb/partida/{i}">VER RELATÓRIO</a>')
+        linha = [i + 1, data, 'x', casa, '', placar, '', visitante, f'{1 + i // 9}ª', 'NBB']
+        if not antiga:
+            linha += [1 + i // 9, 'YouTube']
+        linhas.append(linha)
+    return _pagina(_tabela(cabecalho, linhas, thead=False))
+
+
+def relatorio(aleatorio):
+    # Relatório de um jogo: uma tabela por equipe, com a linha de totais no fim
+    tabelas = []
+    for _ in range(2):
+        linhas = []
+        for _ in range(12):
+            nome = f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)}'
+            convertidos = aleatorio.randint(0, 5)
+            linhas.append([nome, aleatorio.randint(0, 30), f'{convertidos}/{convertidos + aleatorio.randint(0, 5)}',
+                           f'{aleatorio.randint(0, 40)}:{aleatorio.randint(0, 59):02d}', aleatorio.randint(0, 12)])
+        linhas.append(['Total', sum(linha[1] for linha in linhas), '', '200:00', sum(linha[4] for linha in linhas)])
+        tabelas.append(_tabela(['Jogador', 'Pts', '3P', 'Min', 'RT'], linhas))
+    placar = _tabela(['Placar', '1Q', '2Q', '3Q', '4Q'], [['Casa', 20, 22, 18, 25], ['Visitante', 19, 24, 20, 21]])
+    return _pagina(placar + ''.join(tabelas))
+
+
+def paginas():
+    # (url, html) de todas as páginas do corpus
+    aleatorio = random.Random(2024)
+    for season in ['2008-09', '2021-22', '2022-23']:
+        antiga = season == '2008-09'
+        for categ in ['pontos', 'rebotes']:
+            for quem in nbb.quems:
+                url, _ = nbb._stats_request(season, 'regular', categ, 'avg', quem)
+                yield url, stats(aleatorio, quem, antiga=antiga)
+        yield nbb._placares_request(season, 'regular')[0], placares(aleatorio, antiga=antiga)
+        yield nbb._classificacao_request(season)[0], classificacao(aleatorio)
+    for season in ['2023', '2024']:
+        for quem in ldb.quems:
+            yield ldb._stats_request(season, 'regular', 'pontos', 'avg', quem)[0], stats(aleatorio, quem, 200)
+        yield ldb._placares_request(season, 'regular')[0], placares(aleatorio, 200)
+        yield ldb._classificacao_request(season)[0], classificacao(aleatorio)
+    for season in ['2018', '2019']:
+        yield liga_ouro._placares_request(season, 'regular')[0], placares(aleatorio, 90)
+        yield liga_ouro._classificacao_request(season)[0], classificacao(aleatorio)
+
+    # Páginas usadas só pelos perfis e box scores, com outra semente para não
+    # mudar as anteriores
+    aleatorio = random.Random(2025)
+    for categ in nbb.categs[2:]:
+        yield nbb._stats_request('2022-23', 'regular', categ, 'avg', 'athletes')[0], stats(aleatorio, 'athletes')
+    for i in range(90):
+        yield f'{boxscores.BASE}/nbb/partida/{i}', relatorio(aleatorio)
+
+
+def gerar(diretorio):
+    for url, html in paginas():
+        replay.save(diretorio, url, html)
+    return diretorio
+
+
+if __name__ == '__main__':
+    gerar(sys.argv[1])
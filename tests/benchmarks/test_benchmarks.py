@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest.mock import patch
+from nbb_api import aio, cache, fetch, ldb, liga_ouro, memo, nbb, replay, scheduler
+import gerar_corpus
+
+# Benchmarks das funções get_* sobre o corpus (páginas servidas pelo
+# replay, sem rede). Cada caso mede o tempo por etapa (download, parse da
+# tabela e transformação) e o pico de memória. O tempo total é dividido pelo
+# de uma carga fixa de calibração, para comparar máquinas diferentes, e
+# comparado com baseline.json: o teste falha se ficar mais de
+# NBB_API_BENCH_TOLERANCE vezes (padrão 2) mais lento, com uma folga fixa
+# para os casos de poucos milissegundos, ou se o pico de memória passar de
+# NBB_API_BENCH_MEMORY_TOLERANCE vezes (padrão 1.5) o da referência. Nas
+# funções em lote, download e parse somam o tempo de todas as threads.
+# Os tempos dependem da máquina: os benchmarks só rodam com NBB_API_BENCH=1
+# e cada caso sai no log 'nbb_api.bench'.
+#   NBB_API_BENCH_UPDATE=1  grava os valores atuais como nova referência
+#   NBB_API_BENCH_REPORT=arquivo.json  grava o relatório completo
+#   NBB_API_BENCH_CORPUS=pasta  usa um corpus gravado com replay.record()
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+REPETICOES = 5
+ORCAMENTO = 3.0  # segundos por caso: os casos lentos param antes das REPETICOES
+TOLERANCIA = float(os.environ.get('NBB_API_BENCH_TOLERANCE', 2.0))
+TOLERANCIA_MEMORIA = float(os.environ.get('NBB_API_BENCH_MEMORY_TOLERANCE', 1.5))
+FOLGA = 0.25  # em unidades de calibração
+FOLGA_MEMORIA = 2 ** 20  # em bytes
+
+_log = logging.getLogger('nbb_api.bench')
+
+
+def consumir(iterador, *args):
+    # Funções iter_*: o tempo inclui receber todos os resultados
+    return list(iterador(*args))
+
+
+def em_paralelo(corrotina, combinacoes):
+    # Funções da nbb_api.aio: todas as consultas num mesmo event loop
+    async def todas():
+        return await asyncio.gather(*(corrotina(*args) for args in combinacoes))
+    return asyncio.run(todas())
+
+
+NBB_SEASONS = ['2008-09', '2021-22', '2022-23']
+
+CASOS = {
+    'nbb.get_stats athletes': (nbb.get_stats, ('2022-23', 'regular', 'pontos')),
+    'nbb.get_stats teams': (nbb.get_stats, ('2022-23', 'regular', 'pontos', 'avg', 'teams')),
+    'nbb.get_stats 2008-09': (nbb.get_stats, ('2008-09', 'regular', 'rebotes')),
+    'nbb.get_placares': (nbb.get_placares, ('2022-23', 'regular')),
+    'nbb.get_placares 2008-09': (nbb.get_placares, ('2008-09', 'regular')),
+    'nbb.get_classificacao': (nbb.get_classificacao, ('2022-23',)),
+    'nbb.get_player_profiles': (nbb.get_player_profiles, ('2022-23', 'regular')),
+    'ldb.get_stats': (ldb.get_stats, ('2023', 'regular', 'pontos')),
+    'ldb.get_placares': (ldb.get_placares, ('2023', 'regular')),
+    'ldb.get_classificacao': (ldb.get_classificacao, ('2023',)),
+    'liga_ouro.get_placares': (liga_ouro.get_placares, ('2019', 'regular')),
+    'liga_ouro.get_classificacao': (liga_ouro.get_classificacao, ('2019',)),
+    'liga_ouro.get_boxscores': (liga_ouro.get_boxscores, ('2018', 'regular')),
+    'nbb.get_stats_many': (nbb.get_stats_many, (NBB_SEASONS, 'regular', ['pontos', 'rebotes'], 'avg',
+                                                ['athletes', 'teams'])),
+    'nbb.get_placares_many': (nbb.get_placares_many, (NBB_SEASONS, 'regular')),
+    'ldb.get_stats_many': (ldb.get_stats_many, (['2023', '2024'], 'regular', 'pontos', 'avg', ['athletes', 'teams'])),
+    'liga_ouro.get_placares_many': (liga_ouro.get_placares_many, (['2018', '2019'], 'regular')),
+    'nbb.iter_stats': (consumir, (nbb.iter_stats, NBB_SEASONS, 'regular', ['pontos', 'rebotes'])),
+    'ldb.iter_placares': (consumir, (ldb.iter_placares, ['2023', '2024'], 'regular')),
+    'aio.nbb.get_stats': (em_paralelo, (aio.nbb.get_stats, [(season, 'regular', categ) for season in NBB_SEASONS
+                                                            for categ in ['pontos', 'rebotes']])),
+    'aio.nbb.get_placares': (em_paralelo, (aio.nbb.get_placares, [(season, 'regular') for season in NBB_SEASONS])),
+}
+
+resultados = {}
+
+
+def calibracao():
+    # Carga fixa em Python puro: a unidade de tempo dos benchmarks
+    melhor = float('inf')
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        dados = sorted(str(i * 7919 % 100003) for i in range(60000))
+        sum(len(s) for s in dados)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+class Etapas:
+    # Mede o tempo gasto em fetch.get_html (e na versão asyncio) e em
+    # fetch.parse_table durante uma chamada
+    def __init__(self):
+        self.tempos = {'fetch': 0.0, 'parse': 0.0}
+        self._get_html, self._parse_table = fetch.get_html, fetch.parse_table
+        self._get_html_async = aio.fetch.get_html
+
+    def _medido(self, etapa, func):
+        def wrapper(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.tempos[etapa] += time.perf_counter() - inicio
+        return wrapper
+
+    def _medido_async(self, etapa, func):
+        async def wrapper(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.tempos[etapa] += time.perf_counter() - inicio
+        return wrapper
+
+    def __enter__(self):
+        self._patches = [patch('nbb_api.fetch.get_html', self._medido('fetch', self._get_html)),
+                         patch('nbb_api.aio.fetch.get_html', self._medido_async('fetch', self._get_html_async)),
+                         patch('nbb_api.fetch.parse_table', self._medido('parse', self._parse_table))]
+        for p in self._patches:
+            p.start()
+        return self
+
+    def __exit__(self, *exc):
+        for p in self._patches:
+            p.stop()
+
+
+def medir(func, args):
+    melhor, gasto = None, 0.0
+    for i in range(REPETICOES):
+        if i >= 2 and gasto > ORCAMENTO:
+            break
+        with Etapas() as etapas:
+            inicio = time.perf_counter()
+            func(*args)
+            total = time.perf_counter() - inicio
+        gasto += total
+        if melhor is None or total < melhor['total']:
+            melhor = dict(etapas.tempos, total=total)
+    melhor['transform'] = max(0.0, melhor['total'] - melhor['fetch'] - melhor['parse'])
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        melhor['pico_bytes'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return melhor
+
+
+def setUpModule():
+    global _tmp, _replay, _unidade, _configuracao
+    if not os.environ.get('NBB_API_BENCH'):
+        raise unittest.SkipTest('benchmarks desativados: rode com NBB_API_BENCH=1')
+    _configuracao = (cache.diretorio, memo.enabled(), scheduler.rate)
+    cache.disable()
+    memo.disable()
+    scheduler.configure(rate=None)
+    corpus = os.environ.get('NBB_API_BENCH_CORPUS')
+    if corpus is None:
+        _tmp = tempfile.TemporaryDirectory()
+        corpus = gerar_corpus.gerar(_tmp.name)
+    else:
+        _tmp = None
+    _replay = replay.replay(corpus)
+    _replay.__enter__()
+    _unidade = calibracao()
+
+
+def tearDownModule():
+    _replay.__exit__(None, None, None)
+    if _tmp is not None:
+        _tmp.cleanup()
+    diretorio, memo_ativo, rate = _configuracao
+    cache.diretorio = diretorio
+    if memo_ativo:
+        memo.enable()
+    scheduler.configure(rate=rate)
+
+    relatorio = {'calibracao': _unidade, 'casos': resultados}
+    if os.environ.get('NBB_API_BENCH_REPORT'):
+        with open(os.environ['NBB_API_BENCH_REPORT'], 'w') as f:
+            json.dump(relatorio, f, indent=1)
+    if os.environ.get('NBB_API_BENCH_UPDATE'):
+        with open(BASELINE, 'w') as f:
+            json.dump({nome: {'relativo': round(r['relativo'], 2), 'pico_bytes': r['pico_bytes']}
+                       for nome, r in sorted(resultados.items())}, f, indent=1)
+            f.write('\n')
+
+
+def _referencia():
+    try:
+        with open(BASELINE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_caminhos_principais(self):
+        # Testa se nenhuma função get_* ficou mensuravelmente mais lenta ou usa mais memória que a referência
+        referencia = {} if os.environ.get('NBB_API_BENCH_UPDATE') else _referencia()
+        for nome, (func, args) in CASOS.items():
+            with self.subTest(nome):
+                r = resultados[nome] = medir(func, args)
+                r['relativo'] = r['total'] / _unidade
+                _log.info('%-32s total %7.1f ms  fetch %6.1f  parse %6.1f  transform %6.1f  pico %6.1f MiB  (%.2fx)',
+                          nome, r['total'] * 1000, r['fetch'] * 1000, r['parse'] * 1000, r['transform'] * 1000,
+                          r['pico_bytes'] / 2 ** 20, r['relativo'])
+                if nome not in referencia:
+                    continue
+                self.assertLessEqual(r['relativo'], referencia[nome]['relativo'] * TOLERANCIA + FOLGA,
+                                     f'{nome} ficou mais lento: {r["relativo"]:.2f}x contra '
+                                     f'{referencia[nome]["relativo"]}x')
+                self.assertLessEqual(r['pico_bytes'], referencia[nome]['pico_bytes'] * TOLERANCIA_MEMORIA + FOLGA_MEMORIA,
+                                     f'{nome} usa mais memória: {r["pico_bytes"]} bytes contra '
+                                     f'{referencia[nome]["pico_bytes"]}')
+
+if __name__ == '__main__':
+    unittest.main()
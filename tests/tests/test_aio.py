@@ -0,0 +1,179 @@
+import asyncio
+import gzip
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import aio, transport as transporte_sync
+from nbb_api.aio import transport
+
+corpo = '<table><tr><th>Equipe</th></tr><tr><td>São Paulo</td></tr></table>'.encode('utf-8')
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    portas_cliente = []
+
+    def do_GET(self):
+        Handler.portas_cliente.append(self.client_address[1])
+        if self.path == '/lenta':
+            time.sleep(1.0)
+        if self.path == '/sem-frase':
+            # Linha de status sem a frase depois do código
+            self.wfile.write(b'HTTP/1.1 200\r\nContent-Length: %d\r\n\r\n%s' % (len(corpo), corpo))
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(corpo), 10):
+                pedaco = corpo[i:i + 10]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(pedaco), pedaco))
+            self.wfile.write(b'0\r\n\r\n')
+            return
+        dados = gzip.compress(corpo)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clientes que desistem no meio (timeout, cancelamento) são esperados aqui
+        pass
+
+
+class TestAioTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = Server(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.portas_cliente.clear()
+
+    def run_async(self, corrotina):
+        async def executar():
+            try:
+                return await corrotina
+            finally:
+                transport.close()
+        return asyncio.run(executar())
+
+    def test_gzip_e_keep_alive(self):
+        # Testa se as respostas chegam descomprimidas reaproveitando a mesma conexão
+        async def baixar():
+            return [await transport.get(self.base + '/gzip') for _ in range(3)]
+        respostas = self.run_async(baixar())
+        self.assertEqual({r.text for r in respostas}, {corpo.decode('utf-8')})
+        self.assertEqual(len(set(Handler.portas_cliente)), 1)
+
+    def test_chunked(self):
+        # Testa se respostas com Transfer-Encoding: chunked são montadas corretamente
+        self.assertEqual(self.run_async(transport.get(self.base + '/chunked')).content, corpo)
+
+    def test_status_sem_frase(self):
+        # Testa se a linha de status sem a frase ("HTTP/1.1 200") é aceita
+        self.assertEqual(self.run_async(transport.get(self.base + '/sem-frase')).content, corpo)
+
+    def test_pools_fechados_com_o_loop(self):
+        # Testa se as conexões de um event loop são fechadas e esquecidas quando ele termina
+        conexoes = []
+
+        async def baixar():
+            await transport.get(self.base + '/gzip')
+            pool = (await transport._pool('http', self.base.split('//')[1]))
+            conexoes.extend(pool._ociosas)
+
+        for _ in range(3):
+            asyncio.run(baixar())
+        self.assertEqual(len(transport._por_loop), 0)
+        self.assertEqual(len(conexoes), 3)
+        self.assertTrue(all(c.writer.is_closing() for c in conexoes))
+
+    def test_prazo_total(self):
+        # Testa se o prazo total interrompe uma leitura lenta, mesmo sem novas tentativas
+        padrao = {k: getattr(transporte_sync, k) for k in ('deadline', 'retries')}
+        self.addCleanup(transporte_sync.configure, **padrao)
+        transporte_sync.configure(deadline=0.3, retries=0)
+        inicio = time.monotonic()
+        with self.assertRaises(transporte_sync.TransportTimeout):
+            self.run_async(transport.get(self.base + '/lenta'))
+        self.assertLess(time.monotonic() - inicio, 0.8)
+
+    def test_limite_de_hedges(self):
+        # Testa se o hedge respeita hedge_max e libera a vaga quando termina
+        self.addCleanup(transporte_sync.configure, hedge_max=transporte_sync.hedge_max)
+        with patch('nbb_api.transport._hedge_delay', return_value=0.05):
+            for limite, conexoes in [(0, 1), (1, 2)]:
+                transporte_sync.configure(hedge_max=limite)
+                Handler.portas_cliente.clear()
+                self.assertEqual(self.run_async(transport.get(self.base + '/lenta')).content, corpo)
+                self.assertEqual(len(Handler.portas_cliente), conexoes)
+            self.assertTrue(transporte_sync._hedges.acquire(blocking=False))
+            transporte_sync._hedges.release()
+
+    def test_cancelamento(self):
+        # Testa se cancelar a tarefa interrompe a transferência imediatamente
+        async def cancelar():
+            tarefa = asyncio.ensure_future(transport.get(self.base + '/lenta'))
+            await asyncio.sleep(0.1)
+            tarefa.cancel()
+            inicio = time.monotonic()
+            with self.assertRaises(asyncio.CancelledError):
+                await tarefa
+            return time.monotonic() - inicio
+        self.assertLess(self.run_async(cancelar()), 0.5)
+
+
+class TestAioLigas(unittest.TestCase):
+
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_stats_concorrente(self, mock_parse):
+        # Testa se asyncio.gather sobre várias temporadas baixa as páginas ao mesmo tempo
+        mock_parse.side_effect = lambda html: pd.DataFrame({'Jogador': ['Jogador X #12'], 'Pos.': [1]})
+        em_andamento = []
+
+        async def get_html(url, finished=False):
+            em_andamento.append(url)
+            await asyncio.sleep(0.2)
+            return '<table></table>'
+
+        async def buscar():
+            return await asyncio.gather(*[aio.nbb.get_stats(s, 'regular', 'pontos') for s in aio.nbb.seasons[:5]])
+
+        with patch('nbb_api.aio.fetch.get_html', side_effect=get_html):
+            inicio = time.monotonic()
+            dfs = asyncio.run(buscar())
+            self.assertLess(time.monotonic() - inicio, 0.6)
+
+        self.assertEqual([df['Temporada'].iloc[0] for df in dfs], aio.nbb.seasons[:5])
+        self.assertEqual(dfs[0]['Camisa'].iloc[0], '12')
+
+    def test_validacao_compartilhada(self):
+        # Testa se a validação é a mesma das funções síncronas
+        with self.assertRaises(ValueError):
+            asyncio.run(aio.ldb.get_placares('2020', 'regular'))
+        with self.assertRaises(ValueError):
+            asyncio.run(aio.liga_ouro.get_placares('2019', 'fase_extra'))
+
+
+if __name__ == '__main__':
+    unittest.main()
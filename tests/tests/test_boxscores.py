@@ -0,0 +1,92 @@
+import threading
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import boxscores, nbb
+
+cabecalho = ('<tr><th>#</th><th>DATA</th><th>CASA</th><th></th><th></th><th></th><th></th><th></th>'
+             '<th>FASE</th><th>CAMPEONATO</th></tr>')
+
+pagina_jogos = ('<table>' + cabecalho +
+                '<tr><td>1</td><td>01/10/2024  19:00</td><td>x</td><td>Franca</td><td></td>'
+                '<td>75 X 70<br> <a href="/nbb/partida/1">VER RELATÓRIO</a></td><td></td><td>Minas</td>'
+                '<td>1ª</td><td>NBB</td></tr>'
+                '<tr><td>2</td><td>02/10/2024  19:00</td><td>x</td><td>Minas</td><td></td>'
+                '<td>80 X 90<br> <a href="/nbb/partida/2">VER RELATÓRIO</a></td><td></td><td>Flamengo</td>'
+                '<td>1ª</td><td>NBB</td></tr>'
+                '<tr><td>3</td><td>05/10/2024  19:00</td><td>x</td><td>Flamengo</td><td></td>'
+                '<td></td><td></td><td>Franca</td><td>2ª</td><td>NBB</td></tr>'
+                '</table>')
+
+
+def relatorio(casa, visitante):
+    def tabela(jogadores, total):
+        linhas = ''.join(f'<tr><td>{nome}</td><td>{pts}</td><td>{tres}</td><td>{minutos}</td></tr>'
+                         for nome, pts, tres, minutos in jogadores)
+        if total:
+            linhas += '<tr><td>Total</td><td>99</td><td>9/20</td><td>200:00</td></tr>'
+        return f'<table><tr><th>Jogador</th><th>Pts</th><th>3P</th><th>Min</th></tr>{linhas}</table>'
+    return ('<html><body><table><tr><th>Placar</th><th>1Q</th></tr><tr><td>x</td><td>20</td></tr></table>'
+            + tabela(casa, True) + tabela(visitante, False) + '</body></html>')
+
+
+relatorios = {
+    'https://lnb.com.br/nbb/partida/1': relatorio([('Jogador A', 20, '2/5', '30:30'), ('Jogador B', 5, '1/1', '10:00')],
+                                                  [('Jogador C', 30, '4/8', '35:00'), ('Jogador D', 10, '0/2', '20:00')]),
+    'https://lnb.com.br/nbb/partida/2': relatorio([('Jogador C', 12, '1/3', '25:00')],
+                                                  [('Jogador E', 8, '0/0', '15:00')]),
+}
+
+
+class TestBoxscores(unittest.TestCase):
+
+    def setUp(self):
+        self.chamadas = []
+        self.lock = threading.Lock()
+        patcher = patch('nbb_api.fetch.get_html', side_effect=self.get_html)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_html(self, url, finished=False, force=False):
+        with self.lock:
+            self.chamadas.append((url, finished))
+        return relatorios.get(url, pagina_jogos)
+
+    def test_links_dos_relatorios(self):
+        # Testa se cada jogo da tabela recebe a URL absoluta do seu relatório
+        jogos = boxscores.games(pagina_jogos, '2024-25')
+        self.assertEqual(jogos[boxscores.RELATORIO].tolist()[:2],
+                         ['https://lnb.com.br/nbb/partida/1', 'https://lnb.com.br/nbb/partida/2'])
+        self.assertTrue(pd.isna(jogos[boxscores.RELATORIO].iloc[2]))
+
+    def test_box_scores_em_formato_longo(self):
+        # Testa se jogadores e equipes saem em formato longo, com a chave do jogo e os relatórios no cache permanente
+        jogadores, equipes = nbb.get_boxscores('2024-25', 'regular', max_workers=2)
+        self.assertEqual(list(jogadores.columns), boxscores.columns_players)
+        self.assertEqual(list(equipes.columns), boxscores.columns_teams)
+        self.assertIn(('https://lnb.com.br/nbb/partida/1', True), self.chamadas)
+
+        a = jogadores[jogadores['Jogador'] == 'Jogador A'].set_index('ESTATISTICA')['VALOR']
+        self.assertEqual(a['Pts'], 20)
+        self.assertEqual((a['3P C'], a['3P T']), (2, 5))
+        self.assertEqual(a['Min'], 30.5)
+        self.assertEqual(set(jogadores.loc[jogadores['Jogador'] == 'Jogador C', 'EQUIPE']), {'Minas'})
+        self.assertEqual(jogadores['EQUIPE CASA'].iloc[0], 'Franca')
+
+        # Com linha de totais, a equipe usa o total; sem ela, a soma dos jogadores
+        jogo = equipes[equipes['EQUIPE CASA'] == 'Franca'].set_index(['EQUIPE', 'ESTATISTICA'])['VALOR']
+        self.assertEqual(jogo[('Franca', 'Pts')], 99)
+        self.assertEqual(jogo[('Minas', 'Pts')], 40)
+        self.assertEqual(jogo[('Minas', '3P T')], 10)
+
+    def test_falha_de_um_relatorio(self):
+        # Testa se um relatório com erro fica registrado sem derrubar os demais
+        quebrado = {'https://lnb.com.br/nbb/partida/2': '<html><table><tr><th>a</th></tr></table></html>'}
+        with patch.dict(relatorios, quebrado):
+            jogadores, equipes = nbb.get_boxscores('2024-25', 'regular')
+        self.assertEqual(set(jogadores['EQUIPE CASA']), {'Franca'})
+        self.assertEqual(list(jogadores.attrs['falhas']), ['https://lnb.com.br/nbb/partida/2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
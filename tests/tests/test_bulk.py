@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import ldb, nbb
+from nbb_api.transport import TransportTimeout
+
+
+def dummy_stats(html):
+    return pd.DataFrame({'Jogador': ['Jogador X #12', 'Jogador Y #7'], 'Pontos': [18, 9], 'Pos.': [1, 2]})
+
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('nbb_api.fetch.get_html', side_effect=lambda url, finished=False: url)
+        self.mock_get_html = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_get_stats_many_concatena_e_marca(self, mock_parse):
+        # Testa se a grade de parâmetros vira um único DataFrame com as linhas marcadas
+        df = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', ['pontos', 'tocos'], max_workers=4)
+        self.assertEqual(len(df), 8)
+        self.assertEqual(mock_parse.call_count, 4)
+        self.assertEqual(list(df['Temporada'].unique()), ['2021-22', '2022-23'])
+        self.assertEqual(set(df['categ']), {'pontos', 'tocos'})
+        self.assertIn('mandante', df.columns)
+        self.assertEqual(df.attrs['falhas'], {})
+
+    def test_get_stats_many_valida_antes(self):
+        # Testa se um valor inválido na grade impede qualquer download
+        with self.assertRaises(ValueError):
+            nbb.get_stats_many(['2022-23', '1999-00'], 'regular', 'pontos')
+        with self.assertRaises(ValueError):
+            ldb.get_stats_many([2023, 2024], 'regular', 'pontos', sofrido=['talvez'])
+        self.mock_get_html.assert_not_called()
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_falhas_por_chave(self, mock_parse):
+        # Testa se uma falha de rede é reportada por combinação sem derrubar as demais
+        def get_html(url, finished=False):
+            if 'season%5B%5D=71' in url:
+                raise TransportTimeout('Tempo esgotado')
+            return url
+        self.mock_get_html.side_effect = get_html
+
+        df = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', 'pontos')
+        self.assertEqual(list(df['Temporada'].unique()), ['2021-22'])
+        chave = ('2022-23', 'regular', 'pontos', 'avg', 'athletes', 'ambos', False)
+        self.assertIsInstance(df.attrs['falhas'][chave], TransportTimeout)
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_iter_stats_ordem_de_conclusao(self, mock_parse):
+        # Testa se iter_stats entrega primeiro as páginas que terminam primeiro
+        def get_html(url, finished=False):
+            time.sleep(0.3 if 'season%5B%5D=63' in url else 0.01)
+            return url
+        self.mock_get_html.side_effect = get_html
+
+        resultados = list(nbb.iter_stats(['2021-22', '2022-23'], 'regular', 'pontos', max_workers=2))
+        self.assertEqual([params['season'] for params, _ in resultados], ['2022-23', '2021-22'])
+        self.assertEqual(resultados[0][1]['Temporada'].iloc[0], '2022-23')
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_iter_stats_backpressure(self, mock_parse):
+        # Testa se um consumidor lento não acumula mais que max_pending páginas não lidas
+        iniciadas = []
+        lock = threading.Lock()
+
+        def get_html(url, finished=False):
+            with lock:
+                iniciadas.append(url)
+            return url
+        self.mock_get_html.side_effect = get_html
+
+        consumidas = 0
+        for _ in nbb.iter_stats(nbb.seasons, 'regular', 'pontos', max_workers=4, max_pending=2):
+            consumidas += 1
+            time.sleep(0.02)
+            self.assertLessEqual(len(iniciadas), consumidas + 2)
+        self.assertEqual(consumidas, len(nbb.seasons))
+
+    def test_iter_stats_on_error(self):
+        # Testa se on_error recebe as falhas e a iteração continua
+        self.mock_get_html.side_effect = TransportTimeout('Tempo esgotado')
+        falhas = []
+        resultados = list(nbb.iter_placares(['2021-22', '2022-23'], 'regular',
+                                            on_error=lambda params, erro: falhas.append(params['season'])))
+        self.assertEqual(resultados, [])
+        self.assertEqual(sorted(falhas), ['2021-22', '2022-23'])
+
+
+if __name__ == '__main__':
+    unittest.main()
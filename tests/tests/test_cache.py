@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import cache, nbb
+
+html_tabela = '<table><tr><th>EQUIPES</th><th>P</th></tr><tr><td>01 Flamengo</td><td>32</td></tr></table>'
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        cache.configure(self.tmp.name, ttl=60)
+
+    def tearDown(self):
+        cache.disable()
+        self.tmp.cleanup()
+
+    def test_temporada_encerrada_nao_expira(self):
+        # Testa se entradas de temporadas encerradas continuam válidas após o TTL
+        cache.put('http://x/encerrada', '<html>a</html>', permanente=True)
+        with patch('nbb_api.cache.time.time', return_value=time.time() + 10 ** 6):
+            self.assertEqual(cache.get('http://x/encerrada'), '<html>a</html>')
+
+    def test_temporada_atual_expira(self):
+        # Testa se entradas da temporada atual expiram após o TTL configurado
+        cache.put('http://x/atual', '<html>b</html>')
+        self.assertEqual(cache.get('http://x/atual'), '<html>b</html>')
+        with patch('nbb_api.cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(cache.get('http://x/atual'))
+
+    def test_clear_preserva_permanentes(self):
+        # Testa se clear() remove só as entradas temporárias por padrão
+        cache.put('http://x/p', 'p', permanente=True)
+        cache.put('http://x/t', 't')
+        cache.clear()
+        self.assertEqual(cache.get('http://x/p'), 'p')
+        self.assertIsNone(cache.get('http://x/t'))
+
+    @patch('nbb_api.fetch._download', return_value=(html_tabela, len(html_tabela)))
+    def test_get_classificacao_usa_cache(self, mock_download):
+        # Testa se a segunda chamada para a mesma temporada não acessa a rede
+        df1 = nbb.get_classificacao('2022-23')
+        df2 = nbb.get_classificacao('2022-23')
+        self.assertEqual(mock_download.call_count, 1)
+        pd.testing.assert_frame_equal(df1, df2)
+        self.assertEqual(df1['EQUIPES'].iloc[0], 'Flamengo')
+
+    def test_cache_desativado(self):
+        # Testa se, sem diretório configurado, nada é lido nem gravado
+        cache.disable()
+        cache.put('http://x/d', 'd')
+        self.assertIsNone(cache.get('http://x/d'))
+        self.assertFalse(os.listdir(self.tmp.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
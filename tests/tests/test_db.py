@@ -0,0 +1,132 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import aio, cache, db, memo, nbb, planner
+
+pagina_stats = '''
+<table>
+  <thead><tr><th>Pos.</th><th>Jogador</th><th>Equipe</th><th>JO</th><th>EF</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td>McClanahan #22</td><td>Fortaleza</td><td>27</td><td>20.5</td></tr>
+    <tr><td>2</td><td>Antonio #11</td><td>Franca</td><td>19</td><td>18.25</td></tr>
+    <tr><td>3</td><td>Thomas #0</td><td>Franca</td><td>25</td><td>17.0</td></tr>
+  </tbody>
+</table>
+'''
+
+pagina_jogos = '''
+<table>
+  <tr><th>#</th><th>DATA</th><th>CASA</th><th></th><th></th><th></th><th></th><th></th><th>FASE</th><th>CAMPEONATO</th></tr>
+  <tr><td>1</td><td>01/10/2022  19:00</td><td>x</td><td>Franca</td><td></td><td>75 X 70</td><td></td><td>Minas</td>
+      <td>1ª</td><td>NBB</td></tr>
+  <tr><td>2</td><td>02/10/2022  19:00</td><td>x</td><td>Minas</td><td></td><td>80 X 90</td><td></td><td>Flamengo</td>
+      <td>1ª</td><td>NBB</td></tr>
+  <tr><td>3</td><td>03/10/2022  19:00</td><td>x</td><td>Flamengo</td><td></td><td>60 X 65</td><td></td><td>Franca</td>
+      <td>1ª</td><td>NBB</td></tr>
+</table>
+'''
+
+
+class TestDb(unittest.TestCase):
+
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        db.configure(os.path.join(pasta, 'nbb.sqlite'))
+        self.addCleanup(db.disable)
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_stats)
+    def test_grava_e_consulta_com_filtros(self, mock_get_html):
+        # Testa se get_stats grava no banco e query() filtra por parâmetro, coluna e projeção
+        nbb.get_stats('2022-23', 'regular', 'eficiencia')
+        nbb.get_stats('2021-22', 'regular', 'eficiencia')
+        nbb.get_stats('2022-23', 'regular', 'pontos')
+
+        df = db.query('nbb', 'stats', columns=['Jogador', 'Camisa', 'JO'], categ='eficiencia',
+                      where={'JO': ('>', 20)})
+        self.assertEqual(list(df.columns), ['Jogador', 'Camisa', 'JO'])
+        self.assertEqual(len(df), 4)
+        self.assertTrue((df['JO'] > 20).all())
+
+        df = db.query('nbb', 'stats', season=['2021-22'], team='Franca')
+        self.assertEqual(df['Jogador'].tolist(), ['Antonio', 'Thomas'])
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_stats)
+    def test_mesma_combinacao_substitui(self, mock_get_html):
+        # Testa se buscar de novo a mesma combinação substitui as linhas em vez de duplicar
+        nbb.get_stats('2022-23', 'regular', 'eficiencia')
+        nbb.get_stats('2022-23', 'regular', 'eficiencia', tipo='avg')
+        self.assertEqual(len(db.query('nbb', 'stats')), 3)
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_stats)
+    def test_memoria_nao_grava_de_novo(self, mock_get_html):
+        # Testa se uma tabela servida pela memoização não é regravada no banco
+        memo.enable()
+        self.addCleanup(memo.disable)
+        with patch('nbb_api.db.write', wraps=db.write) as write:
+            nbb.get_stats('2022-23', 'regular', 'eficiencia')
+            nbb.get_stats('2022-23', 'regular', 'eficiencia')
+        self.assertEqual(write.call_count, 1)
+
+    def test_derivada_pelo_planejador_e_gravada(self):
+        # Testa se a tabela calculada pelo planejador vai para o banco com os próprios parâmetros
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        cache.configure(pasta)
+        self.addCleanup(cache.disable)
+        planner.enable()
+        self.addCleanup(planner.disable)
+        url, _ = nbb._stats_request('2022-23', 'regular', 'eficiencia', 'sum', 'athletes')
+        cache.put(url, pagina_stats, permanente=True)
+        with patch('nbb_api.fetch._download', side_effect=AssertionError('acessou a rede')):
+            df = nbb.get_stats('2022-23', 'regular', 'eficiencia', 'avg')
+        gravado = db.query('nbb', 'stats', columns=['Jogador', 'EF'], tipo='avg')
+        self.assertEqual(gravado['Jogador'].tolist(), df['Jogador'].tolist())
+        self.assertEqual(gravado['EF'].tolist(), df['EF'].tolist())
+
+    def test_async_grava_fora_do_loop(self):
+        # Testa se, nas funções async, a gravação no banco roda fora da thread do event loop
+        threads = []
+
+        def write(*args):
+            threads.append(threading.get_ident())
+
+        async def buscar():
+            with patch('nbb_api.aio.fetch.get_html', return_value=pagina_stats), \
+                    patch('nbb_api.db.write', side_effect=write):
+                await aio.nbb.get_stats('2022-23', 'regular', 'eficiencia')
+            return threading.get_ident()
+
+        loop = asyncio.run(buscar())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop)
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_jogos)
+    def test_jogos_de_uma_equipe(self, mock_get_html):
+        # Testa se o filtro por equipe pega jogos em casa e fora, e se DATA volta como data
+        nbb.get_placares('2022-23', 'regular')
+        df = db.query('nbb', 'placares', team='Franca')
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df['DATA'].iloc[0], pd.Timestamp('2022-10-01 19:00'))
+        self.assertEqual(df['PLACAR CASA'].tolist(), [75, 60])
+
+        conexao = db._conectar()
+        indices = {linha[1] for linha in conexao.execute('PRAGMA index_list(nbb_placares)')}
+        self.assertIn('nbb_placares_equipe_casa', indices)
+        self.assertIn('nbb_placares_season', indices)
+
+    def test_operador_invalido(self):
+        # Testa se operadores fora da lista são rejeitados (nada de SQL arbitrário)
+        with patch('nbb_api.fetch.get_html', return_value=pagina_stats):
+            nbb.get_stats('2022-23', 'regular', 'eficiencia')
+        with self.assertRaises(ValueError):
+            db.query('nbb', 'stats', where={'JO': ('; DROP TABLE nbb_stats; --', 1)})
+
+
+if __name__ == '__main__':
+    unittest.main()
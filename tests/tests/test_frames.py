@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import frames, memo, nbb
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def dummy_stats(html):
+    if 'season%5B%5D=71' in html:
+        equipes = ['Flamengo', 'Franca']
+    else:
+        equipes = ['Franca', 'Minas']
+    return pd.DataFrame({'Pos.': [1, 2], 'Jogador': ['Jogador X #12', 'Jogador Y #7'],
+                         'Equipe': equipes, 'JO': [30, 28], 'Pts': [18.5, 9.25]})
+
+
+class TestFrames(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('nbb_api.fetch.get_html', side_effect=lambda url, finished=False: url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(frames.configure, compact=False, output='pandas')
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_tipos_compactos(self, mock_parse):
+        # Testa se compact=True troca texto por categorias, inteiros por Int8/Int16 e médias por float32
+        df = nbb.get_stats('2022-23', 'regular', 'pontos', compact=True)
+        self.assertIsInstance(df['Equipe'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df['Temporada'].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(df['JO'].dtype), 'Int8')
+        self.assertEqual(str(df['Camisa'].dtype), 'Int8')
+        self.assertEqual(df['Camisa'].tolist(), [12, 7])
+        self.assertEqual(str(df['Pts'].dtype), 'float32')
+
+        normal = nbb.get_stats('2022-23', 'regular', 'pontos')
+        self.assertNotIsInstance(normal['Equipe'].dtype, pd.CategoricalDtype)
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_dicionario_compartilhado(self, mock_parse):
+        # Testa se tabelas compactadas em momentos diferentes concatenam sem perder as categorias
+        df1 = nbb.get_stats('2022-23', 'regular', 'pontos', compact=True)
+        df2 = nbb.get_stats('2021-22', 'regular', 'pontos', compact=True)
+        self.assertEqual(list(df2['Equipe'].cat.categories[:2]), list(df1['Equipe'].cat.categories[:2]))
+        self.assertIn('Minas', frames.categories('nbb', 'equipes'))
+
+        df = frames.concat([df1, df2], ignore_index=True)
+        self.assertIsInstance(df['Equipe'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['Equipe'].tolist(), ['Flamengo', 'Franca', 'Franca', 'Minas'])
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_configuracao_global_e_lote(self, mock_parse):
+        # Testa se a configuração global vale para as consultas em lote, inclusive nas colunas de parâmetros
+        frames.configure(compact=True)
+        df = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', ['pontos', 'tocos'])
+        self.assertEqual(len(df), 8)
+        for coluna in ['Equipe', 'Temporada', 'categ']:
+            self.assertIsInstance(df[coluna].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(df['Equipe']), {'Flamengo', 'Franca', 'Minas'})
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_memoria_guarda_original(self, mock_parse):
+        # Testa se a memoização guarda a tabela original e serve as duas versões
+        memo.configure(max_bytes=10 ** 7)
+        self.addCleanup(memo.disable)
+        compacto = nbb.get_stats('2022-23', 'regular', 'pontos', compact=True)
+        normal = nbb.get_stats('2022-23', 'regular', 'pontos')
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertIsInstance(compacto['Equipe'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(normal['Equipe'].dtype, pd.CategoricalDtype)
+
+    def test_saida_invalida(self):
+        # Testa se um formato de saída inválido é rejeitado antes do download
+        with self.assertRaises(ValueError):
+            nbb.get_stats('2022-23', 'regular', 'pontos', output='polars')
+        with self.assertRaises(ValueError):
+            frames.configure(output='polars')
+
+    @unittest.skipIf(pyarrow is not None, 'pyarrow instalado')
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_saida_arrow_sem_pyarrow(self, mock_parse):
+        # Testa se, sem o pyarrow, a saída em Arrow explica como instalar
+        with self.assertRaisesRegex(ImportError, 'nbb_api\\[arrow\\]'):
+            nbb.get_stats('2022-23', 'regular', 'pontos', output='arrow')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow não instalado')
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_saida_arrow(self, mock_parse):
+        # Testa se output='arrow' devolve uma pyarrow.Table e 'pandas-arrow' colunas ArrowDtype
+        tabela = nbb.get_stats('2022-23', 'regular', 'pontos', output='arrow', compact=True)
+        self.assertIsInstance(tabela, pyarrow.Table)
+        self.assertTrue(pyarrow.types.is_dictionary(tabela.schema.field('Equipe').type))
+        df = nbb.get_stats('2022-23', 'regular', 'pontos', output='pandas-arrow')
+        self.assertTrue(all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes))
+
+        frames.configure(output='arrow')
+        tabela = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', 'pontos')
+        self.assertEqual(tabela.num_rows, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
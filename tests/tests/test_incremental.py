@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch
+from nbb_api import incremental, nbb
+
+cabecalho = ('<tr><th>#</th><th>DATA</th><th>CASA</th><th></th><th></th><th></th><th></th><th></th>'
+             '<th>FASE</th><th>CAMPEONATO</th></tr>')
+
+
+def pagina(jogos):
+    linhas = ''.join(
+        f'<tr><td>{i}</td><td>{data}</td><td>x</td><td>{casa}</td><td></td><td>{placar}</td><td></td>'
+        f'<td>{visitante}</td><td>1ª</td><td>NBB</td></tr>'
+        for i, (data, casa, placar, visitante) in enumerate(jogos, 1))
+    return f'<table>{cabecalho}{linhas}</table>'
+
+
+regular = [('01/10/2024  19:00', 'Franca', '75 X 70', 'Minas'),
+           ('02/10/2024  19:00', 'Minas', '80 X 90', 'Flamengo')]
+
+
+class TestIncremental(unittest.TestCase):
+
+    def setUp(self):
+        incremental.reset()
+        self.paginas = {
+            'phase%5B%5D=1': pagina(regular),
+            'phase%5B%5D=2': pagina([('01/05/2025  20:00', 'Franca', '', 'Flamengo')]),
+        }
+        patcher = patch('nbb_api.fetch.get_html', side_effect=self.get_html)
+        self.mock_get_html = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_html(self, url, finished=False, force=False):
+        self.assertTrue(force)
+        return next(html for trecho, html in self.paginas.items() if trecho in url)
+
+    def test_so_baixa_o_que_pode_mudar(self):
+        # Testa se a fase encerrada não é baixada de novo e se só os jogos alterados são devolvidos
+        tabela, alterados = nbb.refresh_placares('2024-25')
+        self.assertEqual(len(tabela), 3)
+        self.assertEqual(len(alterados), 3)
+        self.assertEqual(self.mock_get_html.call_count, 2)
+
+        self.paginas['phase%5B%5D=2'] = pagina([('01/05/2025  20:00', 'Franca', '88 X 81', 'Flamengo'),
+                                                 ('03/05/2025  20:00', 'Flamengo', '', 'Franca')])
+        tabela, alterados = nbb.refresh_placares('2024-25')
+        self.assertEqual(self.mock_get_html.call_count, 3)
+        self.assertEqual(len(tabela), 4)
+        self.assertEqual(alterados['EQUIPE CASA'].tolist(), ['Franca', 'Flamengo'])
+        self.assertEqual(alterados['VENCEDOR'].iloc[0], 'Franca')
+
+        tabela, alterados = nbb.refresh_placares('2024-25')
+        self.assertEqual(len(alterados), 0)
+        self.assertEqual(len(tabela), 4)
+
+    def test_fase_com_jogo_pendente_continua_sendo_baixada(self):
+        # Testa se a fase regular com jogo sem placar continua sendo atualizada
+        self.paginas['phase%5B%5D=1'] = pagina(regular + [('05/10/2024  19:00', 'Flamengo', '', 'Franca')])
+        nbb.refresh_placares('2024-25')
+        nbb.refresh_placares('2024-25')
+        self.assertEqual(self.mock_get_html.call_count, 4)
+
+    def test_paginas_por_atualizacao(self):
+        # Testa se, com jogos da fase regular ainda por vir, cada atualização baixa uma página só
+        futuro = ('05/10/2099  19:00', 'Flamengo', '', 'Franca')
+        self.paginas['phase%5B%5D=1'] = pagina(regular + [futuro])
+        self.paginas['phase%5B%5D=2'] = f'<table>{cabecalho}</table>'
+        for chamadas in (1, 2):
+            tabela, _ = nbb.refresh_placares('2024-25')
+            self.assertEqual(self.mock_get_html.call_count, chamadas)
+            self.assertEqual(len(tabela), 3)
+        self.assertTrue(all('phase%5B%5D=1' in c.args[0] for c in self.mock_get_html.call_args_list))
+
+        # Terminada a fase regular, os playoffs passam a ser baixados; a fase regular não
+        self.paginas['phase%5B%5D=1'] = pagina(regular + [futuro[:2] + ('70 X 60',) + futuro[3:]])
+        nbb.refresh_placares('2024-25')
+        self.assertEqual(self.mock_get_html.call_count, 4)
+        nbb.refresh_placares('2024-25')
+        self.assertEqual(self.mock_get_html.call_count, 5)
+
+    def test_fase_sem_jogos(self):
+        # Testa se uma fase cuja página só tem o cabeçalho vira uma tabela vazia
+        self.paginas['phase%5B%5D=2'] = f'<table>{cabecalho}</table>'
+        tabela, alterados = nbb.refresh_placares('2024-25')
+        self.assertEqual(self.mock_get_html.call_count, 2)
+        self.assertEqual(len(tabela), 2)
+        self.assertEqual(len(alterados), 2)
+
+    def test_valida_antes(self):
+        # Testa se parâmetros inválidos levantam erro sem baixar nada
+        with self.assertRaises(ValueError):
+            nbb.refresh_placares('2024-25', 'fase_errada')
+        self.mock_get_html.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+from nbb_api import aio, cache, instrument, nbb
+from nbb_api.transport import Response
+
+tabela = '<table><tr><th>EQUIPES</th><th>P</th></tr><tr><td>01 Flamengo</td><td>32</td></tr><tr><td></td><td></td></tr></table>'
+# Tamanho do conteúdo da resposta: diferente do texto, que não é medido
+tamanho = 4321
+
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cache.configure(self.tmp.name)
+        self.addCleanup(cache.disable)
+        self.addCleanup(instrument.disable)
+        self.url, _ = nbb._classificacao_request('2022-23')
+
+    @patch('nbb_api.fetch._download', return_value=(tabela, tamanho))
+    def test_eventos_por_etapa(self, _):
+        # Testa se uma chamada emite fetch, parse e call com os totais da chamada
+        with instrument.capture() as eventos:
+            nbb.get_classificacao('2022-23')
+            nbb.get_classificacao('2022-23')
+
+        self.assertEqual([e['event'] for e in eventos], ['fetch', 'parse', 'call'] * 2)
+        fetch, parse, chamada = eventos[:3]
+        self.assertEqual((fetch['league'], fetch['function'], fetch['url']), ('nbb', 'get_classificacao', self.url))
+        self.assertEqual((fetch['cache'], fetch['bytes']), ('miss', tamanho))
+        self.assertEqual((parse['url'], parse['rows']), (self.url, 2))
+        self.assertEqual((chamada['urls'], chamada['bytes'], chamada['cache_misses']), ([self.url], tamanho, 1))
+        self.assertIsNone(chamada['error'])
+        self.assertAlmostEqual(chamada['duration'], chamada['fetch'] + chamada['parse'] + chamada['transform'])
+
+        # Na segunda chamada a página vem do cache
+        self.assertEqual((eventos[3]['cache'], eventos[3]['bytes']), ('hit', 0))
+        self.assertEqual(eventos[5]['cache_hits'], 1)
+
+    @patch('nbb_api.fetch._download', return_value=(tabela, tamanho))
+    def test_desativado(self, _):
+        # Testa se, sem sinks, nada é medido
+        with patch('nbb_api.instrument.fetched') as fetched, patch('nbb_api.instrument._medir') as medir:
+            nbb.get_classificacao('2022-23')
+        fetched.assert_not_called()
+        medir.assert_not_called()
+
+    @patch('nbb_api.fetch._download', side_effect=OSError('sem rede'))
+    def test_erro_e_sink_com_defeito(self, _):
+        # Testa se o erro da chamada é registrado e se um sink com defeito não atrapalha a consulta
+        instrument.add(lambda evento: 1 / 0)
+        with instrument.capture() as eventos, self.assertLogs('nbb_api', 'ERROR'):
+            with self.assertRaises(OSError):
+                nbb.get_classificacao('2022-23')
+        self.assertEqual(eventos[-1]['event'], 'call')
+        self.assertEqual(eventos[-1]['error'], 'OSError')
+
+    def test_asyncio(self):
+        # Testa se o parse feito fora do event loop conta no span da chamada async
+        with patch('nbb_api.aio.transport.get') as get, instrument.capture() as eventos:
+            get.return_value = Response(self.url, 200, {}, tabela.encode('utf-8'))
+            asyncio.run(aio.nbb.get_classificacao('2022-23'))
+        self.assertEqual([e['event'] for e in eventos], ['fetch', 'parse', 'call'])
+        self.assertEqual(eventos[0]['bytes'], len(tabela.encode('utf-8')))
+        self.assertEqual(eventos[1]['function'], 'get_classificacao')
+        self.assertGreater(eventos[2]['parse'], 0)
+
+    @patch('nbb_api.fetch._download', return_value=(tabela, tamanho))
+    def test_sinks_logging_e_prometheus(self, _):
+        # Testa se os sinks de logging e Prometheus recebem as chamadas
+        prometheus = instrument.add(instrument.PrometheusSink())
+        instrument.add(instrument.logging_sink())
+        with self.assertLogs('nbb_api', 'INFO') as logs:
+            nbb.get_classificacao('2022-23')
+        self.assertTrue(logs.output[-1].startswith('INFO:nbb_api:nbb_api call league=nbb function=get_classificacao'))
+
+        texto = prometheus.render()
+        self.assertIn('# TYPE nbb_api_stage_seconds summary', texto)
+        self.assertIn('nbb_api_stage_seconds_count{league="nbb",function="get_classificacao",stage="parse"} 1', texto)
+        self.assertIn(f'nbb_api_downloaded_bytes_total{{league="nbb",function="get_classificacao"}} {tamanho}',
+                      texto)
+        self.assertIn('nbb_api_cache_requests_total{league="nbb",function="get_classificacao",result="miss"} 1',
+                      texto)
+
+
+if __name__ == '__main__':
+    unittest.main()
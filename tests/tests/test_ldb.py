@@ -2,14 +2,21 @@ import unittest
 from unittest.mock import patch
 import pandas as pd
 from nbb_api.ldb import get_classificacao, get_stats, get_placares
+from nbb_api.transport import ParseError, TransportTimeout
 
 class TestLDBFuncoes(unittest.TestCase):
 
-    @patch('nbb_api.ldb.pd.read_html')
-    def test_get_classificacao_valido(self, mock_read_html):
+    def setUp(self):
+        # Nenhuma página é baixada: o parse (fetch.parse_table) é substituído em cada teste
+        patcher = patch('nbb_api.fetch.get_html', return_value='<table></table>')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_classificacao_valido(self, mock_parse):
         # Testa se get_classificacao retorna colunas esperadas e remove prefixos de equipe corretamente
         dummy_df = pd.DataFrame({'EQUIPES': ['01 Flamengo', '02 Paulistano']})
-        mock_read_html.return_value = [dummy_df]
+        mock_parse.return_value = dummy_df
 
         df = get_classificacao('2023')
         self.assertIn('EQUIPES', df.columns)
@@ -22,15 +29,15 @@ class TestLDBFuncoes(unittest.TestCase):
         with self.assertRaises(ValueError):
             get_classificacao('2020')
 
-    @patch('nbb_api.ldb.pd.read_html')
-    def test_get_stats_athletes_avg(self, mock_read_html):
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_stats_athletes_avg(self, mock_parse):
         # Testa se get_stats para atletas (avg) retorna colunas esperadas e extrai "Camisa" corretamente
         dummy_df = pd.DataFrame({
             'Jogador': ['Fulano #10', 'Beltrano #5'],
             'Pontos': [20, 15],
             'Pos.': [1, 2]
         })
-        mock_read_html.return_value = [dummy_df]
+        mock_parse.return_value = dummy_df
 
         df = get_stats('2023', 'regular', 'tocos', tipo='avg', quem='athletes')
         self.assertIn('Jogador', df.columns)
@@ -68,8 +75,8 @@ class TestLDBFuncoes(unittest.TestCase):
         with self.assertRaises(ValueError):
             get_stats('2023', 'regular', 'toco', sofrido='talvez')
 
-    @patch('nbb_api.ldb.pd.read_html')
-    def test_get_placares_valido(self, mock_read_html):
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_placares_valido(self, mock_parse):
         # Testa se get_placares retorna as colunas esperadas e extrai corretamente o placar e vencedor
         dummy_df = pd.DataFrame({
             'DATA': ['01/03/2023  19:30'],
@@ -85,7 +92,7 @@ class TestLDBFuncoes(unittest.TestCase):
             'RODADA': [1],
             'Unnamed: 15': ['x']
         })
-        mock_read_html.return_value = [dummy_df]
+        mock_parse.return_value = dummy_df
 
         df = get_placares('2023', 'regular')
         self.assertIn('EQUIPE CASA', df.columns)
@@ -94,6 +101,18 @@ class TestLDBFuncoes(unittest.TestCase):
         self.assertEqual(df['TEMPORADA'].iloc[0], '2023')
         self.assertEqual(df['EQUIPE CASA'].iloc[0], 'Time A')
 
+    @patch('nbb_api.fetch.get_html', side_effect=TransportTimeout('Tempo esgotado'))
+    def test_get_stats_erro_de_rede(self, mock_get_html):
+        # Testa se falhas de rede são propagadas em vez de virar um DataFrame vazio
+        with self.assertRaises(TransportTimeout):
+            get_stats('2023', 'regular', 'tocos')
+
+    @patch('nbb_api.fetch.parse_table', return_value=pd.DataFrame({'Outra': ['x']}))
+    def test_get_placares_pagina_fora_do_formato(self, mock_parse):
+        # Testa se uma página fora do formato esperado levanta ParseError em vez de virar um DataFrame vazio
+        with self.assertRaises(ParseError):
+            get_placares('2023', 'regular')
+
     def test_get_placares_invalido(self):
         # Testa se get_placares levanta erro para temporada e fase inválidas
         with self.assertRaises(ValueError):
@@ -28,20 +28,26 @@ dummy_class_df = pd.DataFrame({
 
 class TestLigaOuro(unittest.TestCase):
 
-    @patch('nbb_api.liga_ouro.pd.read_html')
-    def test_get_placares_valido(self, mock_read_html):
+    def setUp(self):
+        # Nenhuma página é baixada: o parse (fetch.parse_table) é substituído em cada teste
+        patcher = patch('nbb_api.fetch.get_html', return_value='<table></table>')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_placares_valido(self, mock_parse):
         # Testa se get_placares para 2019 retorna colunas esperadas e inclui temporada
-        mock_read_html.return_value = [dummy_placar_df.copy()]
+        mock_parse.return_value = dummy_placar_df.copy()
         df = get_placares('2019', 'regular')
         self.assertIn('EQUIPE CASA', df.columns)
         self.assertIn('PLACAR CASA', df.columns)
         self.assertIn('VENCEDOR', df.columns)
         self.assertEqual(df['TEMPORADA'].iloc[0], '2019')
 
-    @patch('nbb_api.liga_ouro.pd.read_html')
-    def test_get_classificacao_valido(self, mock_read_html):
+    @patch('nbb_api.fetch.parse_table')
+    def test_get_classificacao_valido(self, mock_parse):
         # Testa se get_classificacao retorna colunas esperadas e inclui temporada
-        mock_read_html.return_value = [dummy_class_df.copy()]
+        mock_parse.return_value = dummy_class_df.copy()
         df = get_classificacao('2019')
         self.assertIn('EQUIPES', df.columns)
         self.assertIn('TEMPORADA', df.columns)
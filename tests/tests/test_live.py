@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import live
+
+
+def tabela(*jogos):
+    return pd.DataFrame({
+        'DATA': pd.to_datetime([data for data, _, _ in jogos]),
+        'EQUIPE CASA': [casa for _, casa, _ in jogos],
+        'EQUIPE VISITANTE': ['Minas'] * len(jogos),
+        'VENCEDOR': [vencedor for _, _, vencedor in jogos],
+    })
+
+
+class TestLive(unittest.TestCase):
+
+    def setUp(self):
+        self.tabelas = [tabela(('2025-05-01 20:00', 'Franca', None)),
+                        tabela(('2025-05-01 20:00', 'Franca', 'Franca'), ('2025-05-03 20:00', 'Flamengo', None))]
+        self.consultas = 0
+        patcher = patch('nbb_api.nbb.refresh_placares', side_effect=self.refresh_placares)
+        self.mock_refresh = patcher.start()
+        self.addCleanup(patcher.stop)
+        live.configure(min_interval=0.01, max_interval=0.01)
+        self.addCleanup(live.configure, min_interval=30.0, max_interval=4 * 3600.0)
+
+    def refresh_placares(self, season, fase='total'):
+        atual = self.tabelas[min(self.consultas, len(self.tabelas) - 1)]
+        self.consultas += 1
+        return atual, atual
+
+    def test_intervalo_adaptativo(self):
+        # Testa se o intervalo é curto com jogo em andamento e espera até o próximo jogo quando não há
+        live.configure(min_interval=30.0, max_interval=4 * 3600.0)
+        df = tabela(('2025-05-01 20:00', 'Franca', None), ('2025-05-03 20:00', 'Flamengo', None))
+        self.assertEqual(live.next_interval(df, pd.Timestamp('2025-05-01 21:00')), 30.0)
+        self.assertEqual(live.next_interval(df, pd.Timestamp('2025-05-03 19:00')), 3600.0)
+        self.assertEqual(live.next_interval(df, pd.Timestamp('2025-05-02 09:00')), 4 * 3600.0)
+        self.assertEqual(live.next_interval(df, pd.Timestamp('2025-05-10 09:00')), 4 * 3600.0)
+        # Jogo encerrado não mantém o intervalo curto
+        df.loc[0, 'VENCEDOR'] = 'Franca'
+        self.assertEqual(live.next_interval(df, pd.Timestamp('2025-05-01 21:00')), 4 * 3600.0)
+
+    def test_um_poller_para_varios_assinantes(self):
+        # Testa se dois assinantes dividem um só poller e recebem só os jogos alterados
+        recebidos = {'a': [], 'b': []}
+        pronto = threading.Event()
+
+        def assinante(nome):
+            def callback(alterados):
+                recebidos[nome].append(alterados['EQUIPE CASA'].tolist())
+                if len(recebidos['a']) >= 2 and len(recebidos['b']) >= 1:
+                    pronto.set()
+            return callback
+
+        with live.watch('nbb', '2024-25', callback=assinante('a')) as a:
+            b = live.watch('nbb', '2024-25', callback=assinante('b'))
+            self.assertEqual(len(live._pollers), 1)
+            self.assertTrue(pronto.wait(5))
+            b.close()
+        self.assertEqual(live._pollers, {})
+        self.assertEqual(recebidos['a'][:2], [['Franca'], ['Franca', 'Flamengo']])
+        # Sem alterações nas consultas seguintes, nada mais é entregue
+        self.assertLessEqual(len(recebidos['a']), 2)
+
+    def test_assinante_com_defeito(self):
+        # Testa se um callback que levanta erro não impede os outros assinantes nem o fechamento
+        recebidos = []
+        pronto = threading.Event()
+
+        def callback(alterados):
+            recebidos.append(alterados['EQUIPE CASA'].tolist())
+            if 'Flamengo' in recebidos[-1]:
+                pronto.set()
+
+        def quebrado(alterados):
+            raise RuntimeError('assinante com defeito')
+
+        with self.assertLogs('nbb_api', 'ERROR'):
+            with live.watch('nbb', '2024-25', callback=quebrado) as ruim:
+                with live.watch('nbb', '2024-25', callback=callback):
+                    self.assertTrue(pronto.wait(5))
+                # Quem chega depois recebe a tabela atual, mesmo que o callback falhe
+                tardio = live.watch('nbb', '2024-25', callback=quebrado)
+                tardio.close()
+        self.assertEqual(recebidos[-1], ['Franca', 'Flamengo'])
+        self.assertIsInstance(ruim, live.Subscription)
+        self.assertEqual(live._pollers, {})
+
+    def test_assinante_asyncio(self):
+        # Testa se o iterador assíncrono recebe as alterações do poller
+        async def acompanhar():
+            async with live.watch('nbb', '2024-25') as eventos:
+                primeiro = await eventos.__anext__()
+                segundo = await eventos.__anext__()
+            return primeiro, segundo
+
+        primeiro, segundo = asyncio.run(asyncio.wait_for(acompanhar(), 5))
+        self.assertEqual(len(primeiro), 1)
+        self.assertEqual(segundo['EQUIPE CASA'].tolist(), ['Franca', 'Flamengo'])
+        self.assertEqual(live._pollers, {})
+
+    def test_liga_invalida(self):
+        # Testa se liga ou temporada inválidas levantam erro sem criar poller
+        with self.assertRaises(ValueError):
+            live.watch('nba')
+        with self.assertRaises(ValueError):
+            live.watch('nbb', '1900-01')
+        self.assertEqual(live._pollers, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
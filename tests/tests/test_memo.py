@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import cache, memo, nbb
+
+
+def dummy_stats(*args, **kwargs):
+    return pd.DataFrame({'Jogador': ['Jogador X #12'], 'Pontos': [18], 'Pos.': [1]})
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('nbb_api.fetch.get_html', return_value='<table></table>')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        memo.configure(max_bytes=10 ** 7)
+        memo.reset_stats()
+
+    def tearDown(self):
+        memo.disable()
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_hits_e_misses(self, mock_parse):
+        # Testa se chamadas equivalentes (com e sem argumentos padrão) compartilham a entrada
+        nbb.get_stats('2022-23', 'regular', 'pontos')
+        nbb.get_stats('2022-23', 'regular', 'pontos', tipo='avg')
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(memo.stats()['hits'], 1)
+        self.assertEqual(memo.stats()['misses'], 1)
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_copia_defensiva(self, mock_parse):
+        # Testa se alterar o DataFrame retornado não altera o que está em memória
+        df = nbb.get_stats('2022-23', 'regular', 'pontos')
+        df.loc[0, 'Jogador'] = 'Alterado'
+        df2 = nbb.get_stats('2022-23', 'regular', 'pontos')
+        self.assertEqual(df2['Jogador'].iloc[0], 'Jogador X')
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_lru(self, mock_parse):
+        # Testa se, com orçamento para uma só entrada, a menos usada é descartada
+        tamanho = int(nbb.get_stats('2022-23', 'regular', 'pontos').memory_usage(deep=True).sum())
+        memo.clear()
+        memo.configure(max_bytes=tamanho)
+        nbb.get_stats('2022-23', 'regular', 'pontos')
+        nbb.get_stats('2022-23', 'regular', 'tocos')
+        self.assertEqual(memo.stats()['entries'], 1)
+        self.assertEqual(memo.stats()['evictions'], 1)
+        nbb.get_stats('2022-23', 'regular', 'tocos')
+        self.assertEqual(mock_parse.call_count, 3)
+
+    @patch('nbb_api.fetch.parse_table', side_effect=dummy_stats)
+    def test_temporada_em_andamento_expira(self, mock_parse):
+        # Testa se a tabela da temporada atual expira com o TTL do cache e a de temporada encerrada não
+        with patch.object(cache, 'ttl_temporada_atual', 0):
+            nbb.get_stats(nbb.seasons[-1], 'regular', 'pontos')
+            nbb.get_stats(nbb.seasons[-1], 'regular', 'pontos')
+            self.assertEqual(mock_parse.call_count, 2)
+            nbb.get_stats('2022-23', 'regular', 'pontos')
+            nbb.get_stats('2022-23', 'regular', 'pontos')
+            self.assertEqual(mock_parse.call_count, 3)
+
+    def test_argumento_invalido_nao_memoriza(self):
+        # Testa se argumentos inválidos continuam levantando erro e não entram na memória
+        with self.assertRaises(ValueError):
+            nbb.get_stats('2022-23', 'regular', 'xuxu')
+        self.assertEqual(memo.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
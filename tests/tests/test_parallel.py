@@ -0,0 +1,81 @@
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pandas as pd
+from nbb_api import nbb, parallel
+
+pagina_stats = '''
+<html><body><table>
+  <thead><tr><th>Pos.</th><th>Jogador</th><th>Equipe</th><th>JO</th><th>Pts</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td>McClanahan #22</td><td>Fortaleza B. C.</td><td>27</td><td>20.89</td></tr>
+    <tr><td>2</td><td>Antonio #11</td><td>UNIFACISA</td><td>26</td><td>19.5</td></tr>
+    <tr><td>3</td><td>Thomas #0</td><td>Fortaleza B. C.</td><td>25</td><td>17.67</td></tr>
+  </tbody>
+</table></body></html>
+'''
+
+
+class TestParallel(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        parallel.shutdown()
+
+    def test_formato_compacto_ida_e_volta(self):
+        # Testa se o formato colunar devolve o mesmo DataFrame, com tipos, ausentes e nomes repetidos
+        df = pd.DataFrame({
+            'Equipe': ['A', 'B', None, 'A'],
+            'Pts': [1.5, np.nan, 3.0, 4.0],
+            'JO': np.arange(4),
+            'DATA': pd.to_datetime(['2022-10-01', None, '2022-10-03', '2022-10-04']),
+            'ok': [True, False, True, True],
+        }, index=[3, 5, 7, 9])
+        df['Outro'] = pd.Series([np.nan, 'x', 'y', 'x'], index=df.index, dtype=object)
+        compactado = parallel._compactar(df)
+        self.assertEqual(compactado[0][0][3].dtype, np.int32)
+        pd.testing.assert_frame_equal(parallel._expandir(compactado), df)
+
+        duplicado = pd.DataFrame([[1, 'a'], [2, 'b']], columns=['X', 'X'])
+        pd.testing.assert_frame_equal(parallel._expandir(parallel._compactar(duplicado)), duplicado)
+
+    def test_parse_many_em_processos(self):
+        # Testa se o parse em outros processos dá o mesmo resultado que o parse local
+        paginas = [(pagina_stats, ('2022-23', 'athletes')), (pagina_stats, ('2023-24', 'athletes'))]
+        resultados = parallel.parse_many(nbb._stats_from_html, paginas, processes=2)
+        for (html, args), df in zip(paginas, resultados):
+            pd.testing.assert_frame_equal(df, nbb._stats_from_html(html, *args))
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_stats)
+    def test_get_stats_many_com_processos(self, mock_get_html):
+        # Testa se get_stats_many com processes devolve o mesmo que a versão com threads
+        esperado = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', ['pontos', 'tocos'])
+        df = nbb.get_stats_many(['2021-22', '2022-23'], 'regular', ['pontos', 'tocos'], processes=2)
+        pd.testing.assert_frame_equal(df, esperado)
+        self.assertEqual(mock_get_html.call_count, 8)
+
+    def test_um_pool_por_tamanho(self):
+        # Testa se pedir outro número de processos não derruba o pool que já está em uso
+        dois = parallel._pool(2)
+        self.assertIsNot(parallel._pool(1), dois)
+        self.assertIs(parallel._pool(2), dois)
+        paginas = [(pagina_stats, ('2022-23', 'athletes'))]
+        self.assertEqual(len(parallel.parse_many(nbb._stats_from_html, paginas, processes=2)[0]), 3)
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_stats)
+    def test_pool_quebrado(self, _):
+        # Testa se um pool quebrado levanta o erro em vez de virar falhas por combinação, e é recriado
+        quebrado = Future()
+        quebrado.set_exception(BrokenProcessPool('um processo morreu'))
+        executor = MagicMock(**{'submit.return_value': quebrado})
+        parallel.shutdown()
+        parallel._executores[1] = executor
+        with self.assertRaises(BrokenProcessPool):
+            nbb.get_stats_many(['2021-22', '2022-23'], 'regular', 'pontos', processes=1)
+        executor.shutdown.assert_called_once_with(wait=False)
+        self.assertNotIn(1, parallel._executores)
+
+if __name__ == '__main__':
+    unittest.main()
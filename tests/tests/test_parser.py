@@ -0,0 +1,67 @@
+import io
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import parser
+
+pagina_stats = '''
+<html><body>
+<div class="menu"><a href="/nbb">NBB</a></div>
+<table class="stats">
+  <thead><tr><th>Pos.</th><th>Jogador</th><th>Equipe</th><th>JO</th><th>Min</th><th>Pts</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td>McClanahan #22</td><td>Fortaleza B. C.</td><td>27</td><td>34.11</td><td>20.89</td></tr>
+    <tr><td>2</td><td>Antonio #11</td><td>UNIFACISA</td><td>26</td><td>31.74</td><td>1,017</td></tr>
+    <tr><td>3</td><td>Thomas <span>#0</span></td><td>Corinthians</td><td></td><td>32.13</td><td>17.67</td></tr>
+  </tbody>
+</table>
+<table><tr><th>Outra</th><th>Tabela</th></tr><tr><td>x</td><td>y</td></tr></table>
+</body></html>
+'''
+
+pagina_jogos = '''
+<html><body><table>
+  <tr><th>#</th><th>DATA</th><th></th><th></th><th></th><th>CAMPEONATO</th></tr>
+  <tr><td>1</td><td>01/10/2022<br>  19:00</td><td>Time A</td><td>75 X 70<br> <a href="/relatorio/1">VER RELATÓRIO</a></td><td>Time B</td><td>NBB</td></tr>
+  <tr><td>2</td><td>02/10/2022  20:00</td><td>Time C</td><td></td><td>Time D</td><td>NBB</td></tr>
+</table></body></html>
+'''
+
+
+class TestParser(unittest.TestCase):
+
+    def assert_igual_read_html(self, html):
+        esperado = pd.read_html(io.StringIO(html))[0]
+        pd.testing.assert_frame_equal(parser.extract_table(html), esperado)
+
+    def test_tabela_de_estatisticas(self):
+        # Testa se o extrator devolve o mesmo DataFrame que pd.read_html para estatísticas
+        self.assert_igual_read_html(pagina_stats)
+
+    def test_tabela_de_jogos(self):
+        # Testa se cabeçalhos vazios, <br> e links no placar seguem o pd.read_html
+        self.assert_igual_read_html(pagina_jogos)
+        df = parser.extract_table(pagina_jogos)
+        self.assertEqual(df['Unnamed: 3'].iloc[0], '75 X 70  VER RELATÓRIO')
+
+    def test_tipos_das_colunas(self):
+        # Testa se as colunas numéricas já saem tipadas
+        df = parser.extract_table(pagina_stats)
+        self.assertEqual(df['Pos.'].dtype, 'int64')
+        self.assertEqual(df['JO'].dtype, 'float64')
+        self.assertEqual(df['Pts'].tolist(), [20.89, 1017.0, 17.67])
+
+    @patch('nbb_api.parser.pd.read_html')
+    def test_fallback_para_read_html(self, mock_read_html):
+        # Testa se marcações fora do padrão (colspan) são repassadas ao pd.read_html
+        mock_read_html.return_value = [pd.DataFrame({'A': [1]})]
+        html = '<table><tr><th colspan="2">A</th></tr><tr><td>1</td><td>2</td></tr></table>'
+        with self.assertRaises(parser.UnsupportedMarkup):
+            parser.extract_table(html)
+        df = parser.read_table(html)
+        self.assertEqual(mock_read_html.call_count, 1)
+        self.assertEqual(df['A'].iloc[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
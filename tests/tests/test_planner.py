@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+from nbb_api import cache, nbb, planner
+
+
+def pagina(linhas):
+    corpo = ''.join(f'<tr><td>{i}</td><td>{jogador}</td><td>{equipe}</td><td>{jo}</td><td>{pts}</td></tr>'
+                    for i, (jogador, equipe, jo, pts) in enumerate(linhas, 1))
+    return f'<table><tr><th>Pos.</th><th>Jogador</th><th>Equipe</th><th>JO</th><th>Pts</th></tr>{corpo}</table>'
+
+
+# Como no site, as páginas vêm em ordem decrescente da estatística da categoria
+regular = pagina([('Jogador A #7', 'Franca', 30, 600), ('Jogador C #5', 'Minas', 14, 450),
+                  ('Jogador B #10', 'Franca', 28, 280)])
+playoffs = pagina([('Jogador A #7', 'Franca', 10, 250), ('Jogador C #5', 'Minas', 4, 50)])
+equipes = ('<table><tr><th>Pos.</th><th>Equipe</th><th>JO</th><th>Pts</th></tr>'
+           '<tr><td>1</td><td>Franca</td><td>30</td><td>29.3</td></tr>'
+           '<tr><td>2</td><td>Minas</td><td>30</td><td>15.0</td></tr></table>')
+
+
+class TestPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cache.configure(self.tmp.name)
+        self.addCleanup(cache.disable)
+        planner.enable()
+        self.addCleanup(planner.disable)
+        planner.reset_stats()
+        for fase, html in [('regular', regular), ('playoffs', playoffs)]:
+            url, _ = nbb._stats_request('2022-23', fase, 'pontos', 'sum', 'athletes')
+            cache.put(url, html, permanente=True)
+        patcher = patch('nbb_api.fetch._download', side_effect=AssertionError('acessou a rede'))
+        self.mock_download = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_media_a_partir_da_soma(self):
+        # Testa se a média sai da soma em cache, arredondada e na ordem do ranking da média
+        df = nbb.get_stats('2022-23', 'regular', 'pontos', 'avg')
+        self.assertEqual(df['Jogador'].tolist(), ['Jogador C', 'Jogador A', 'Jogador B'])
+        self.assertEqual(df['Pts'].tolist(), [32.1, 20.0, 10.0])
+        self.assertEqual(df['JO'].tolist(), [14, 30, 28])
+        self.assertEqual(planner.stats(), {'derived': 1, 'fetched': 0})
+
+    def test_total_encadeado(self):
+        # Testa se a média no total sai da soma da regular e dos playoffs
+        total = nbb.get_stats('2022-23', 'total', 'pontos', 'sum')
+        self.assertEqual(total['Pts'].tolist(), [850, 500, 280])
+        self.assertEqual(total['JO'].tolist(), [40, 18, 28])
+        self.assertEqual(total['Camisa'].tolist(), ['7', '5', '10'])
+
+        media = nbb.get_stats('2022-23', 'total', 'pontos', 'avg')
+        self.assertEqual(media['Pts'].tolist(), [27.8, 21.2, 10.0])
+        self.assertEqual(planner.stats()['fetched'], 0)
+
+    def test_jogos_da_equipe_vem_da_pagina(self):
+        # Testa se a tabela de equipes é baixada: os jogos da equipe não saem dos atletas
+        self.mock_download.side_effect = None
+        self.mock_download.return_value = equipes, len(equipes)
+        df = nbb.get_stats('2022-23', 'regular', 'pontos', 'avg', 'teams')
+        self.assertEqual(df['JO'].tolist(), [30, 30])
+        self.assertEqual(planner.stats(), {'derived': 0, 'fetched': 1})
+
+    def test_sem_fonte_vai_para_a_rede(self):
+        # Testa se consultas sem páginas em cache que as resolvam são baixadas normalmente
+        self.mock_download.side_effect = None
+        self.mock_download.return_value = regular, len(regular)
+        nbb.get_stats('2022-23', 'regular', 'pontos', 'avg', 'teams', sofrido=True)
+        nbb.get_stats('2022-23', 'regular', 'rebotes', 'avg')
+        self.assertEqual(self.mock_download.call_count, 2)
+        self.assertEqual(planner.stats(), {'derived': 0, 'fetched': 2})
+
+    def test_desativado(self):
+        # Testa se, com o planejador desativado, toda consulta vai para a rede
+        planner.disable()
+        with self.assertRaisesRegex(AssertionError, 'rede'):
+            nbb.get_stats('2022-23', 'regular', 'pontos', 'avg')
+
+
+if __name__ == '__main__':
+    unittest.main()
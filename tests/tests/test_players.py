@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import ldb, players
+
+
+def atletas(linhas):
+    return pd.DataFrame({'Jogador': [j for j, _, _ in linhas], 'Camisa': [c for _, c, _ in linhas],
+                         'Equipe': [e for _, _, e in linhas], 'Pts': range(len(linhas))})
+
+
+class TestPlayers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        players.configure(os.path.join(self.tmp.name, 'players.sqlite'))
+        self.addCleanup(players.disable)
+
+    def test_busca_por_prefixo_sem_acentos(self):
+        # Testa se a busca por prefixo ignora acentos e maiúsculas e agrupa as temporadas do jogador
+        players.add(atletas([('José Silva', '9', 'Sesi Franca'), ('Joao Souza', '4', 'Minas')]), 'nbb', '2022-23')
+        players.add(atletas([('Jose Silva', '9', 'Sesi Franca')]), 'nbb', '2023-24')
+        df = players.search('JOSÉ')
+        self.assertEqual(df['chave'].tolist(), ['jose silva'])
+        self.assertEqual(df['temporadas'].item(), 2)
+        self.assertEqual(players.search('jo')['chave'].tolist(), ['joao souza', 'jose silva'])
+        self.assertEqual(len(players.search('x')), 0)
+
+    def test_camisa_e_passagem_da_ldb_para_o_nbb(self):
+        # Testa se o histórico junta LDB e NBB e se a busca por camisa e equipe encontra o jogador
+        players.add(atletas([('Lucas Dias', '10', 'Franca')]), 'ldb', '2019', origem='stats:pontos')
+        players.add(atletas([('Outro', '1', 'Minas'), ('Lucas Dias', '9', 'Franca')]), 'nbb', '2021-22',
+                    origem='stats:pontos')
+        historico = players.history('lucas dias')
+        self.assertEqual(historico['liga'].tolist(), ['ldb', 'nbb'])
+        # O id vem direto da tabela de search(), como numpy.int64
+        jogador_id = players.search('lucas')['jogador_id'].iloc[0]
+        self.assertEqual(players.history(jogador_id)['liga'].tolist(), ['ldb', 'nbb'])
+        self.assertEqual(historico['origens'].iloc[1], [('stats:pontos', 1)])
+        self.assertEqual(players.jersey('FRANCA', 9)['Jogador'].tolist(), ['Lucas Dias'])
+
+    def test_homonimos_separados(self):
+        # Testa se jogadores com o mesmo nome, sem equipe ou camisa em comum, ficam com ids diferentes
+        players.add(atletas([('João Silva', '5', 'Franca'), ('Joao Silva', '12', 'Minas')]), 'nbb', '2022-23')
+        players.add(atletas([('Joao Silva', '12', 'Pinheiros')]), 'nbb', '2023-24')
+        players.add(atletas([('Joao Silva', '7', 'Bauru')]), 'nbb', '2023-24', origem='stats:rebotes')
+        df = players.search('joao silva')
+        self.assertEqual(df['temporadas'].tolist(), [1, 2, 1])
+        ids = df['jogador_id'].tolist()
+        self.assertEqual(players.history(ids[1])['Equipe'].tolist(), ['Minas', 'Pinheiros'])
+        self.assertEqual(players.history('joão silva')['jogador_id'].nunique(), 3)
+
+        # Indexar de novo a mesma consulta mantém os ids
+        players.add(atletas([('Joao Silva', '12', 'Pinheiros')]), 'nbb', '2023-24')
+        self.assertEqual(players.search('joao silva')['jogador_id'].tolist(), ids)
+
+    def test_atualizacao_incremental(self):
+        # Testa se indexar de novo a mesma consulta substitui as aparições em vez de duplicar
+        players.add(atletas([('Jogador A', '7', 'Franca')]), 'nbb', '2024-25', origem='stats:pontos')
+        players.add(atletas([('Jogador B', '8', 'Franca')]), 'nbb', '2024-25', origem='stats:pontos')
+        self.assertEqual(len(players.search('jogador')), 1)
+        self.assertEqual(len(players.indexed()), 1)
+
+    def test_indexa_o_que_get_stats_devolve(self):
+        # Testa se, com o índice configurado, as tabelas de atletas de get_stats são indexadas
+        with patch('nbb_api.fetch.get_html', return_value='<html></html>'), \
+                patch('nbb_api.ldb._stats_from_html', return_value=atletas([('Ana Maria', '5', 'Osasco')])
+                      .assign(Temporada='2023')):
+            ldb.get_stats('2023', 'regular', 'pontos')
+        self.assertEqual(players.indexed()['origem'].tolist(),
+                         ['stats:fase=regular&categ=pontos&tipo=avg&quem=athletes&sofrido=False'])
+        self.assertEqual(players.history('ana maria')['season'].tolist(), ['2023'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import nbb, profiles
+
+
+def pagina(cabecalho, linhas):
+    th = ''.join(f'<th>{c}</th>' for c in ['Pos.', 'Jogador', 'Equipe'] + cabecalho)
+    corpo = ''.join('<tr><td>1</td>' + ''.join(f'<td>{v}</td>' for v in linha) + '</tr>' for linha in linhas)
+    return f'<table><tr>{th}</tr>{corpo}</table>'
+
+
+paginas = {
+    'pontos': pagina(['JO', 'Min', 'Pts'], [('Jogador A #7', 'Franca', 20, 30.5, 18.2),
+                                            ('Jogador A #7', 'Minas', 10, 28.0, 12.0),
+                                            ('Jogador A #11', 'Pinheiros', 25, 20.0, 9.1)]),
+    'rebotes': pagina(['JO', 'Min', 'RO', 'RD', 'Pts'], [('Jogador A #11', 'Pinheiros', 25, 20.0, 2.0, 4.0, 9.1),
+                                                         ('Jogador B #4', 'Franca', 30, 15.0, 1.0, 3.0, 5.5)]),
+}
+
+
+def get_html(url, finished=False, force=False):
+    categ = url.split('/estatisticas/')[1].split('/')[0]
+    return paginas.get(categ, pagina(['JO'], []))
+
+
+class TestProfiles(unittest.TestCase):
+
+    @patch('nbb_api.fetch.get_html', side_effect=get_html)
+    def test_perfil_com_homonimos_e_trocas(self, mock_get_html):
+        # Testa se homônimos e jogadores trocados ficam em linhas separadas, com JO/Min uma vez só
+        df = nbb.get_player_profiles('2022-23', 'regular', max_workers=4)
+        self.assertEqual(mock_get_html.call_count, len(nbb.categs))
+        self.assertEqual(list(df.columns[:6]), profiles.CHAVES + profiles.COMPARTILHADAS)
+        self.assertEqual(list(zip(df['Jogador'], df['Camisa'], df['Equipe'])),
+                         [('Jogador A', '7', 'Franca'), ('Jogador A', '7', 'Minas'),
+                          ('Jogador A', '11', 'Pinheiros'), ('Jogador B', '4', 'Franca')])
+        self.assertEqual(df['JO'].tolist(), [20, 10, 25, 30])
+        self.assertEqual(df['RO'].iloc[2], 2.0)
+        self.assertTrue(pd.isna(df['RO'].iloc[0]))
+        self.assertEqual(df['Pts (rebotes)'].iloc[3], 5.5)
+        self.assertEqual(df['Temporada'].unique().tolist(), ['2022-23'])
+
+    def test_valida_antes(self):
+        # Testa se parâmetros inválidos levantam erro antes de qualquer download
+        with self.assertRaises(ValueError):
+            nbb.get_player_profiles('2022-23', 'fase_errada')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import asyncio
+import tempfile
+import unittest
+from nbb_api import aio, fetch, nbb, replay, transport
+
+tabela = '<table><tr><th>EQUIPES</th><th>P</th></tr><tr><td>01 Flamengo</td><td>32</td></tr><tr><td></td><td></td></tr></table>'
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.url, _ = nbb._classificacao_request('2022-23')
+        replay.save(self.tmp.name, self.url, tabela)
+
+    def test_reproduz_sem_rede(self):
+        # Testa se as funções síncronas e asyncio recebem as páginas do corpus
+        original = transport.get
+        with replay.replay(self.tmp.name) as corpus:
+            self.assertEqual(nbb.get_classificacao('2022-23')['EQUIPES'].tolist(), ['Flamengo'])
+            df = asyncio.run(aio.nbb.get_classificacao('2022-23'))
+            self.assertEqual(df['EQUIPES'].tolist(), ['Flamengo'])
+            self.assertEqual(corpus.pedidos, [self.url, self.url])
+        self.assertIs(transport.get, original)
+
+    def test_url_fora_do_corpus(self):
+        # Testa se uma página que não foi gravada vira erro de transporte
+        with replay.replay(self.tmp.name):
+            with self.assertRaises(transport.TransportError):
+                fetch.get_html('https://lnb.com.br/nbb/outra')
+
+
+if __name__ == '__main__':
+    unittest.main()
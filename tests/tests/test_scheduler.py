@@ -0,0 +1,128 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import fetch, nbb, scheduler
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+URL = 'https://lnb.com.br/nbb/tabela-de-jogos/'
+
+
+class Resposta:
+    text = '<html></html>'
+    content = b'<html></html>'
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(scheduler.configure, rate=None, burst=10, concurrency=None, path=None)
+
+    def em_paralelo(self, func, n):
+        threads = [threading.Thread(target=func) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+    def test_mesma_url_em_andamento(self):
+        # Testa se pedidos simultâneos da mesma URL dividem um só download
+        def lento(url):
+            time.sleep(0.2)
+            return Resposta()
+
+        resultados = []
+        with patch('nbb_api.transport.get', side_effect=lento) as mock_get:
+            self.em_paralelo(lambda: resultados.append(fetch.get_html(URL)), 4)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(resultados, ['<html></html>'] * 4)
+
+    @patch('nbb_api.fetch.get_html', return_value='<table></table>')
+    def test_mesma_chamada_get_em_andamento(self, mock_get_html):
+        # Testa se chamadas get_* idênticas ao mesmo tempo dividem o download e o parse, cada uma com sua cópia
+        def parse(html):
+            time.sleep(0.2)
+            return pd.DataFrame({'Jogador': ['Jogador A #7'], 'Pts': [10]})
+
+        resultados = []
+        with patch('nbb_api.fetch.parse_table', side_effect=parse) as mock_parse:
+            self.em_paralelo(lambda: resultados.append(nbb.get_stats('2022-23', 'regular', 'pontos')), 3)
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(len({id(df) for df in resultados}), 3)
+
+    def test_sem_limite_por_padrao(self):
+        # Testa se, sem configuração, os downloads não são limitados
+        self.assertIsNone(scheduler.rate)
+        self.assertIsNone(scheduler.concurrency)
+        inicio = time.monotonic()
+        for _ in range(50):
+            with scheduler.slot(URL):
+                pass
+        self.assertLess(time.monotonic() - inicio, 0.5)
+
+    def test_token_bucket(self):
+        # Testa se, gasta a rajada, as requisições seguem no ritmo configurado
+        scheduler.configure(rate=20, burst=1)
+        inicio = time.monotonic()
+        for _ in range(5):
+            with scheduler.slot(URL):
+                pass
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.18)
+
+    def test_limite_de_concorrencia(self):
+        # Testa se nunca há mais downloads simultâneos por host que o configurado
+        scheduler.configure(rate=None, concurrency=2)
+        ativos, maximo, lock = [0], [0], threading.Lock()
+
+        def baixar():
+            with scheduler.slot(URL):
+                with lock:
+                    ativos[0] += 1
+                    maximo[0] = max(maximo[0], ativos[0])
+                time.sleep(0.05)
+                with lock:
+                    ativos[0] -= 1
+
+        self.em_paralelo(baixar, 6)
+        self.assertEqual(maximo[0], 2)
+
+    @unittest.skipIf(fcntl is None, 'sem fcntl')
+    def test_coordenacao_entre_processos(self):
+        # Testa se uma vaga travada por outro processo (arquivo com flock) faz o download esperar
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        scheduler.configure(rate=None, concurrency=1, path=tmp.name)
+        with open(os.path.join(tmp.name, 'lnb.com.br.slot0'), 'w') as outro:
+            fcntl.flock(outro, fcntl.LOCK_EX)
+            entrou = threading.Event()
+
+            def baixar():
+                with scheduler.slot(URL):
+                    entrou.set()
+
+            t = threading.Thread(target=baixar)
+            t.start()
+            self.assertFalse(entrou.wait(0.2))
+        self.assertTrue(entrou.wait(2))
+        t.join()
+
+    @unittest.skipIf(fcntl is None, 'sem fcntl')
+    def test_balde_compartilhado(self):
+        # Testa se o balde em arquivo é o mesmo para todos (aqui, dois hosts recriados)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        scheduler.configure(rate=10, burst=1, path=tmp.name)
+        self.assertEqual(scheduler._host(URL).reservar(), 0.0)
+        scheduler.configure(path=tmp.name)  # esquece o estado em memória
+        self.assertGreater(scheduler._host(URL).reservar(), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import pandas as pd
+from nbb_api import ldb, liga_ouro, nbb, scores
+
+pagina_jogos = '''
+<html><body><table>
+  <tr><th>#</th><th>DATA</th><th>CASA</th><th></th><th></th><th></th><th></th><th></th>
+      <th>FASE</th><th>CAMPEONATO</th><th>RODADA</th><th>TRANSMISSÃO</th></tr>
+  <tr><td>1</td><td>01/10/2022<br>  19:00</td><td>x</td><td>Time A</td><td></td>
+      <td>105 X 99<br> <a href="/relatorio/1">VER RELATÓRIO</a></td><td></td><td>Time B</td>
+      <td>1ª</td><td>NBB</td><td>1</td><td>TV</td></tr>
+  <tr><td>2</td><td>02/10/2022  20:00</td><td>x</td><td>Time C</td><td></td>
+      <td>70 X 80</td><td></td><td>Time D</td><td>1ª</td><td>NBB</td><td>1</td><td>TV</td></tr>
+  <tr><td>3</td><td>03/10/2022  20:00</td><td>x</td><td>Time B</td><td></td>
+      <td></td><td></td><td>Time C</td><td>2ª</td><td>NBB</td><td>2</td><td>TV</td></tr>
+</table></body></html>
+'''
+
+
+class TestScores(unittest.TestCase):
+
+    def test_placar_com_tres_digitos_e_vencedor(self):
+        # Testa se placares de 3 dígitos viram inteiros e se jogos sem placar ficam sem vencedor
+        df = nbb._placares_from_html(pagina_jogos, '2022-23')
+        self.assertEqual(list(df.columns), scores.columns)
+        self.assertEqual(df['PLACAR CASA'].tolist()[:2], [105, 70])
+        self.assertEqual(df['PLACAR VISITANTE'].tolist()[:2], [99, 80])
+        self.assertEqual(str(df['PLACAR CASA'].dtype), 'Int64')
+        self.assertTrue(pd.isna(df['PLACAR CASA'].iloc[2]))
+        self.assertEqual(df['VENCEDOR'].tolist()[:2], ['Time A', 'Time D'])
+        self.assertTrue(pd.isna(df['VENCEDOR'].iloc[2]))
+        self.assertEqual(df['DATA'].iloc[0], pd.Timestamp('2022-10-01 19:00'))
+        self.assertEqual(df['RODADA'].iloc[2], '2ª')
+
+    def test_mesmo_resultado_nas_tres_ligas(self):
+        # Testa se NBB, LDB e Liga Ouro normalizam a mesma tabela de forma idêntica
+        esperado = nbb._placares_from_html(pagina_jogos, '2023')
+        pd.testing.assert_frame_equal(ldb._placares_from_html(pagina_jogos, '2023'), esperado)
+        pd.testing.assert_frame_equal(liga_ouro._placares_from_html(pagina_jogos, '2023'), esperado)
+
+    def test_temporada_sem_placares(self):
+        # Testa se uma tabela ainda sem nenhum placar devolve placares e vencedores ausentes
+        df = scores.normalize(pd.DataFrame({
+            'DATA': ['01/10/2022  19:00'], 'Unnamed: 3': ['Time A'], 'Unnamed: 5': [float('nan')],
+            'Unnamed: 7': ['Time B'], 'FASE': ['1ª'], 'CAMPEONATO': ['NBB'],
+        }), '2022-23')
+        self.assertTrue(df['PLACAR CASA'].isna().all())
+        self.assertTrue(df['VENCEDOR'].isna().all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import pandas as pd
+from nbb_api import standings
+
+placares = pd.DataFrame({
+    'DATA': pd.to_datetime(['2024-10-01 19:00', '2024-10-01 21:00', '2024-10-03 19:00', '2024-10-05 19:00']),
+    'EQUIPE CASA': ['Franca', 'Minas', 'Flamengo', 'Pinheiros'],
+    'PLACAR CASA': pd.array([80, 70, 90, None], dtype='Int64'),
+    'PLACAR VISITANTE': pd.array([75, 72, 85, None], dtype='Int64'),
+    'EQUIPE VISITANTE': ['Minas', 'Flamengo', 'Franca', 'Franca'],
+})
+
+
+class TestStandings(unittest.TestCase):
+
+    def test_classificacao_final(self):
+        # Testa se vitórias, derrotas, pontos, aproveitamento e ordem saem da tabela de jogos
+        df = standings.table(placares)
+        self.assertEqual(list(df.columns), standings.columns)
+        self.assertEqual(df['EQUIPES'].tolist(), ['Flamengo', 'Franca', 'Pinheiros', 'Minas'])
+        flamengo = df.iloc[0]
+        self.assertEqual((flamengo['J'], flamengo['V'], flamengo['D'], flamengo['PTS']), (2, 2, 0, 4))
+        self.assertEqual((flamengo['PRO'], flamengo['CON'], flamengo['SALDO']), (162, 155, 7))
+        self.assertEqual(df.loc[df['EQUIPES'] == 'Franca', '%V'].item(), 0.5)
+        # Jogo sem placar não conta, mas a equipe aparece
+        self.assertEqual(df.loc[df['EQUIPES'] == 'Pinheiros', 'J'].item(), 0)
+
+    def test_classificacao_por_data(self):
+        # Testa se o histórico numa passada só coincide com a classificação calculada até cada data
+        historico = standings.history(placares)
+        self.assertEqual(sorted(historico['DATA'].unique()), list(pd.to_datetime(['2024-10-01', '2024-10-03'])))
+        for data, parcial in historico.groupby('DATA'):
+            ate_a_data = placares.copy()
+            ate_a_data.loc[placares['DATA'] >= data + pd.Timedelta(days=1), ['PLACAR CASA', 'PLACAR VISITANTE']] = pd.NA
+            esperado = standings.table(ate_a_data)
+            pd.testing.assert_frame_equal(parcial.drop(columns='DATA').reset_index(drop=True), esperado)
+
+    def test_datas_pedidas(self):
+        # Testa se datas sem jogo usam o último dia anterior e datas antes da temporada ficam zeradas
+        df = standings.history(placares, ['2024-09-01', '2024-10-02'])
+        self.assertEqual(df.loc[df['DATA'] == '2024-09-01', 'J'].sum(), 0)
+        pd.testing.assert_frame_equal(standings.as_of(placares, '2024-10-02'),
+                                      df[df['DATA'] == '2024-10-02'].drop(columns='DATA').reset_index(drop=True))
+        self.assertEqual(standings.as_of(placares, '2024-10-02')['EQUIPES'].iloc[0], 'Franca')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from nbb_api import store
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        anterior = store.diretorio
+        store.configure(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, store.diretorio)
+        self.addCleanup(store.configure, anterior)
+
+    def test_temporadas_guardadas(self):
+        # Testa se seasons() lista só os arquivos .arrow da liga/dataset
+        pasta = os.path.join(store.diretorio, 'nbb', 'stats')
+        os.makedirs(pasta)
+        for nome in ['2022-23.arrow', '2021-22.arrow', 'lixo.tmp']:
+            open(os.path.join(pasta, nome), 'wb').close()
+        self.assertEqual(store.seasons('nbb', 'stats'), ['2021-22', '2022-23'])
+        self.assertEqual(store.seasons('ldb', 'stats'), [])
+
+    @unittest.skipIf(pyarrow is not None, 'pyarrow instalado')
+    def test_sem_pyarrow(self):
+        # Testa se, sem o pyarrow, o armazenamento explica como instalar
+        with self.assertRaisesRegex(ImportError, 'nbb_api\\[arrow\\]'):
+            store.load('nbb', 'stats', season='2022-23')
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow não instalado')
+    def test_salva_e_carrega_mapeado(self):
+        # Testa se save() divide por temporada e load() devolve colunas Arrow lidas do arquivo mapeado
+        df = pd.DataFrame({'Jogador': ['A', 'B', 'C'], 'Pts': [10.5, 3.0, 7.25],
+                           'Temporada': ['2021-22', '2022-23', '2022-23']})
+        store.save(df, 'nbb', 'stats')
+        self.assertEqual(store.seasons('nbb', 'stats'), ['2021-22', '2022-23'])
+
+        carregado = store.load('nbb', 'stats', season='2022-23')
+        self.assertEqual(carregado['Jogador'].tolist(), ['B', 'C'])
+        self.assertIsInstance(carregado['Pts'].dtype, pd.ArrowDtype)
+        tabela = store.load('nbb', 'stats', columns=['Pts'], output='arrow')
+        self.assertEqual(tabela.column_names, ['Pts'])
+        self.assertEqual(tabela.num_rows, 3)
+
+        with self.assertRaises(FileNotFoundError):
+            store.load('nbb', 'stats', season='2008-09')
+
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow não instalado')
+    def test_salva_mesclando_parametros(self):
+        # Testa se salvar uma categoria mantém as outras categorias da mesma temporada
+        pontos = pd.DataFrame({'Jogador': ['A', 'B'], 'Valor': [10.0, 3.0], 'Temporada': '2022-23', 'categ': 'pontos'})
+        tocos = pd.DataFrame({'Jogador': ['A'], 'Valor': [1.0], 'Temporada': '2022-23', 'categ': 'tocos'})
+        store.save(pontos, 'nbb', 'stats')
+        store.save(tocos, 'nbb', 'stats')
+        store.save(pontos.assign(Valor=[11.0, 4.0]), 'nbb', 'stats')
+
+        carregado = store.load('nbb', 'stats', season='2022-23')
+        self.assertEqual(sorted(zip(carregado['categ'], carregado['Valor'])),
+                         [('pontos', 4.0), ('pontos', 11.0), ('tocos', 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from nbb_api import scheduler, sync
+from nbb_api.__main__ import main
+from nbb_api.transport import TransportTimeout
+
+pagina_jogos = '''
+<html><body><table>
+  <tr><th>#</th><th>DATA</th><th>CASA</th><th></th><th></th><th></th><th></th><th></th><th>FASE</th><th>CAMPEONATO</th></tr>
+  <tr><td>1</td><td>01/10/2022  19:00</td><td>x</td><td>Time A</td><td></td><td>75 X 70</td><td></td><td>Time B</td>
+      <td>1ª</td><td>NBB</td></tr>
+</table></body></html>
+'''
+
+
+def gravar_pickle(df, caminho):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    df.to_pickle(caminho)
+
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        self.destino = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.destino)
+        # O formato do arquivo não importa aqui: o teste é do manifesto e da retomada
+        for alvo, kwargs in [('nbb_api.sync._gravar', {'side_effect': gravar_pickle}),
+                             ('nbb_api.frames._pyarrow', {})]:
+            patcher = patch(alvo, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_retoma_de_onde_parou(self):
+        # Testa se uma segunda execução só baixa o que falhou e a temporada em andamento
+        urls = []
+        falhar = [True]
+
+        def get_html(url, finished=False):
+            urls.append(url)
+            if falhar[0] and 'season%5B%5D=63' in url:
+                raise TransportTimeout('Tempo esgotado')
+            return pagina_jogos
+
+        temporadas = ['2021-22', '2022-23', '2024-25']
+        with patch('nbb_api.fetch.get_html', side_effect=get_html):
+            resumo = sync.sync(self.destino, leagues='nbb', datasets='placares', seasons=temporadas, verbose=False)
+            self.assertEqual(resumo, {'ok': 6, 'vazio': 0, 'falha': 3, 'pulado': 0})
+
+            falhar[0] = False
+            urls.clear()
+            resumo = sync.sync(self.destino, leagues='nbb', datasets='placares', seasons=temporadas, verbose=False)
+        # 2021-22 falhou antes, 2024-25 ainda está em andamento; 2022-23 fica de fora
+        self.assertEqual(resumo, {'ok': 6, 'vazio': 0, 'falha': 0, 'pulado': 3})
+        self.assertFalse(any('season%5B%5D=71' in url for url in urls))
+
+        manifesto = sync.read_manifest(self.destino)
+        registro = manifesto['nbb/placares/season=2022-23&fase=regular']
+        self.assertEqual(registro['status'], 'ok')
+        self.assertTrue(registro['arquivo'].startswith(os.path.join('league=nbb', 'dataset=placares', 'season=2022-23')))
+        df = pd.read_pickle(os.path.join(self.destino, registro['arquivo']))
+        self.assertEqual(df['fase'].iloc[0], 'regular')
+        self.assertEqual(df['TEMPORADA'].iloc[0], '2022-23')
+
+    def test_manifesto_com_linha_incompleta(self):
+        # Testa se uma linha cortada no fim do manifesto (execução interrompida) é ignorada
+        with open(os.path.join(self.destino, sync.MANIFESTO), 'w', encoding='utf-8') as f:
+            f.write('{"chave": "nbb/placares/season=2022-23&fase=regular", "status": "ok", "arquivo": "x"}\n{"chave": "nbb/pl')
+        self.assertEqual(list(sync.read_manifest(self.destino)), ['nbb/placares/season=2022-23&fase=regular'])
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_jogos)
+    def test_linha_de_comando(self, mock_get_html):
+        # Testa se `python -m nbb_api sync` repassa as opções e devolve 0 sem falhas
+        codigo = main(['sync', self.destino, '--leagues', 'liga_ouro', '--datasets', 'placares',
+                       '--seasons', '2019', '--workers', '2', '--rate', '1000'])
+        self.assertEqual(codigo, 0)
+        self.assertEqual(mock_get_html.call_count, 3)
+
+    def test_rate_vale_durante_a_sincronizacao(self):
+        # Testa se `rate` limita os downloads pelo agendador só enquanto a sincronização roda
+        taxas = []
+
+        def get_html(url, finished=False):
+            taxas.append(scheduler.rate)
+            return pagina_jogos
+
+        with patch('nbb_api.fetch.get_html', side_effect=get_html):
+            sync.sync(self.destino, leagues='liga_ouro', datasets='placares', seasons='2019', rate=20, verbose=False)
+        self.assertEqual(taxas, [20] * 3)
+        self.assertIsNone(scheduler.rate)
+
+    @patch('nbb_api.fetch.get_html', return_value=pagina_jogos)
+    def test_temporada_repetida(self, mock_get_html):
+        # Testa se uma temporada listada duas vezes na liga é baixada e registrada uma vez só
+        for dataset, (_, combinacoes) in sync._grades(sync.ligas['liga_ouro']).items():
+            self.assertEqual(len(combinacoes), len({tuple(c.items()) for c in combinacoes}), dataset)
+        sync.sync(self.destino, leagues='liga_ouro', datasets='placares', seasons='2025', verbose=False)
+        self.assertEqual(mock_get_html.call_count, 3)
+        with open(os.path.join(self.destino, sync.MANIFESTO), encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
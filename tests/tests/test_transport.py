@@ -0,0 +1,186 @@
+import gzip
+import threading
+import time
+import unittest
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from nbb_api import transport
+
+corpo = '<table><tr><th>Equipe</th></tr><tr><td>São Paulo</td></tr></table>'.encode('utf-8')
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    portas_cliente = []
+    falhas_restantes = 0
+    lentas_restantes = 0
+
+    def do_GET(self):
+        Handler.portas_cliente.append(self.client_address[1])
+        if self.path == '/instavel' and Handler.falhas_restantes > 0:
+            Handler.falhas_restantes -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/lenta':
+            time.sleep(1.0)
+        if self.path == '/cauda' and Handler.lentas_restantes > 0:
+            Handler.lentas_restantes -= 1
+            time.sleep(1.0)
+        if self.path == '/redireciona':
+            self.send_response(302)
+            self.send_header('Location', '/gzip')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/404':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/gzip':
+            dados, encoding = gzip.compress(corpo), 'gzip'
+        else:
+            dados, encoding = zlib.compress(corpo), 'deflate'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clientes que desistem no meio (timeout, cancelamento) são esperados aqui
+        pass
+
+
+class TestTransport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = Server(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        transport.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        transport.close()
+        Handler.portas_cliente.clear()
+        padrao = {k: getattr(transport, k) for k in ('read_timeout', 'deadline', 'retries', 'backoff',
+                                                      'hedge_percentile', 'hedge_max')}
+        self.addCleanup(transport.configure, **padrao)
+        transport.configure(backoff=0.01)
+
+    def test_gzip_e_deflate(self):
+        # Testa se as respostas comprimidas chegam descomprimidas e decodificadas
+        self.assertEqual(transport.get(self.base + '/gzip').text, corpo.decode('utf-8'))
+        self.assertEqual(transport.get(self.base + '/deflate').content, corpo)
+
+    def test_keep_alive(self):
+        # Testa se requisições sequenciais reaproveitam a mesma conexão
+        for _ in range(3):
+            transport.get(self.base + '/gzip')
+        self.assertEqual(len(set(Handler.portas_cliente)), 1)
+
+    def test_redirecionamento(self):
+        # Testa se redirecionamentos são seguidos
+        resposta = transport.get(self.base + '/redireciona')
+        self.assertTrue(resposta.url.endswith('/gzip'))
+        self.assertEqual(resposta.content, corpo)
+
+    def test_status_de_erro(self):
+        # Testa se respostas 4xx/5xx viram HTTPStatusError
+        with self.assertRaises(transport.HTTPStatusError) as ctx:
+            transport.get(self.base + '/404')
+        self.assertEqual(ctx.exception.status, 404)
+
+    def test_timeout_de_leitura(self):
+        # Testa se uma resposta lenta vira TransportTimeout em vez de bloquear
+        transport.configure(read_timeout=0.2, retries=0)
+        inicio = time.monotonic()
+        with self.assertRaises(transport.TransportTimeout):
+            transport.get(self.base + '/lenta')
+        self.assertLess(time.monotonic() - inicio, 0.9)
+
+    def test_prazo_total(self):
+        # Testa se uma única tentativa lenta não passa do prazo total
+        transport.configure(deadline=0.3)
+        inicio = time.monotonic()
+        with self.assertRaises(transport.TransportTimeout):
+            transport.get(self.base + '/lenta')
+        self.assertLess(time.monotonic() - inicio, 0.9)
+
+    def test_retry_em_erro_transitorio(self):
+        # Testa se respostas 503 são repetidas até dar certo
+        Handler.falhas_restantes = 2
+        transport.configure(retries=2)
+        self.assertEqual(transport.get(self.base + '/instavel').content, corpo)
+
+    def test_sem_retry_alem_do_limite(self):
+        # Testa se, esgotadas as tentativas, o erro HTTP é propagado
+        Handler.falhas_restantes = 5
+        transport.configure(retries=1)
+        with self.assertRaises(transport.HTTPStatusError):
+            transport.get(self.base + '/instavel')
+        Handler.falhas_restantes = 0
+
+    def test_hedge(self):
+        # Testa se uma segunda requisição é disparada quando a primeira passa do percentil
+        transport.configure(hedge_percentile=90)
+        for _ in range(transport.hedge_min_samples):
+            transport.get(self.base + '/cauda')
+        Handler.lentas_restantes = 1
+        inicio = time.monotonic()
+        self.assertEqual(transport.get(self.base + '/cauda').content, corpo)
+        self.assertLess(time.monotonic() - inicio, 0.9)
+
+    def test_limite_de_hedges(self):
+        # Testa se nenhuma requisição extra é disparada quando o limite de hedges está ocupado
+        transport.configure(hedge_percentile=90, hedge_max=0)
+        for _ in range(transport.hedge_min_samples):
+            transport.get(self.base + '/cauda')
+        Handler.lentas_restantes = 1
+        Handler.portas_cliente.clear()
+        inicio = time.monotonic()
+        self.assertEqual(transport.get(self.base + '/cauda').content, corpo)
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.9)
+        self.assertEqual(len(Handler.portas_cliente), 1)
+
+
+    def test_hedge_sem_fila(self):
+        # Testa se, com hedge ativo, muitas chamadas simultâneas não esperam numa fila de workers
+        def lenta(url, limite):
+            time.sleep(0.3)
+            return url
+
+        resultados = []
+        with patch('nbb_api.transport._hedge_delay', return_value=5.0), \
+                patch('nbb_api.transport._get_once', side_effect=lenta):
+            threads = [threading.Thread(target=lambda: resultados.append(transport._get_hedged('u', 0)))
+                       for _ in range(64)]
+            inicio = time.monotonic()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(len(resultados), 64)
+        self.assertLess(time.monotonic() - inicio, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()